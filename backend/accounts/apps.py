@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.contrib.auth.models import User
+        from django.core.signals import request_finished
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+        from .db import configure_sqlite, report_pool_stats
+        from .metrics import install_query_counter
+        from .middleware import invalidate_cached_user
+        from .slowlog import install_slow_query_log
+
+        connection_created.connect(configure_sqlite, dispatch_uid='accounts.configure_sqlite')
+        # Both insert their wrapper first; the slow query log must end up outermost to see the caller
+        connection_created.connect(install_query_counter, dispatch_uid='accounts.install_query_counter')
+        connection_created.connect(install_slow_query_log, dispatch_uid='accounts.install_slow_query_log')
+        request_finished.connect(report_pool_stats, dispatch_uid='accounts.report_pool_stats')
+        post_save.connect(invalidate_cached_user, sender=User, dispatch_uid='accounts.invalidate_user_save')
+        post_delete.connect(invalidate_cached_user, sender=User, dispatch_uid='accounts.invalidate_user_delete')
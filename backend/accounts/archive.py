@@ -0,0 +1,92 @@
+"""
+Task Archiving for TaskCLI
+==========================
+Moves old completed tasks from the hot `accounts_task` table into the
+cold `accounts_archivedtask` table. Run it with
+`python manage.py task_cli archive --older-than 90`.
+
+Rows are moved in small batches, each in its own short transaction, so
+the web app and CLI never wait long on a lock (important on SQLite, where
+a write transaction locks the whole database). Batches walk the primary
+key, so the whole run is one pass over the table. Each batch also logs a
+`deleted` TaskChange (data {"archived": true}) per task, so the change feed
+drops archived tasks from open dashboards and `taskcli watch`.
+
+Author: TaskCLI Team
+"""
+
+import time
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+
+from .changes import record_bulk
+from .models import ArchivedTask, Task
+
+ARCHIVE_FIELDS = ['id', 'user_id', 'name', 'project', 'priority', 'due_date', 'due_time',
+                  'completed', 'completed_at', 'is_recurring', 'series_id', 'version', 'created_at']
+
+
+def archive_completed(older_than_days, batch_size=500, pause=0.0, progress=None):
+    """
+    Move completed tasks due more than `older_than_days` ago to ArchivedTask.
+
+    Sleeps `pause` seconds between batches to give other writers a turn and
+    calls `progress(moved_so_far)` after each batch. Returns the number of
+    tasks moved.
+    """
+    cutoff = date.today() - timedelta(days=older_than_days)
+    last_id = 0
+    moved = 0
+
+    while True:
+        ids = list(
+            Task.objects.filter(id__gt=last_id, completed=True, due_date__lt=cutoff)
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return moved
+        last_id = ids[-1]
+
+        with transaction.atomic():
+            # Re-check inside the transaction: a task may have been reopened
+            rows = list(Task.objects.filter(id__in=ids, completed=True).values(*ARCHIVE_FIELDS))
+            ArchivedTask.objects.bulk_create([ArchivedTask(**row) for row in rows])
+            Task.objects.filter(id__in=[row['id'] for row in rows]).delete()
+            by_user = {}
+            for row in rows:
+                by_user.setdefault(row['user_id'], []).append(row['id'])
+            for user_id, task_ids in by_user.items():
+                record_bulk(user_id, task_ids, 'deleted', {"archived": True})
+
+        moved += len(rows)
+        if progress:
+            progress(moved)
+        if pause:
+            time.sleep(pause)
+
+
+def table_size(model):
+    """
+    Return (rows, bytes on disk including indexes) for a model's table.
+
+    Bytes is None when the database can't report it (e.g. SQLite built
+    without the dbstat virtual table).
+    """
+    rows = model.objects.count()
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+            return rows, cursor.fetchone()[0]
+        if connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = %s "
+                    "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                    [table, table],
+                )
+                return rows, cursor.fetchone()[0] or 0
+            except Exception:
+                return rows, None
+    return rows, None
@@ -0,0 +1,259 @@
+"""
+Batch Command Mode for TaskCLI
+==============================
+Runs many task commands in one process, one DB connection, instead of one
+`python manage.py task_cli ...` process per command. Input is one JSON
+object per line:
+
+    {"op": "add", "user": "me@example.com", "name": "Report", "priority": "High", "due_date": "2030-01-31"}
+    {"op": "complete", "id": 12}
+    {"op": "edit", "id": 12, "name": "Final report", "due_time": "09:00"}
+    {"op": "edit", "id": 12, "version": 3, "priority": "High"}
+    {"op": "pending", "id": 12}
+    {"op": "delete", "id": 12}
+    {"op": "list", "user": "me@example.com", "status": "pending", "limit": 50}
+
+Output is one JSON result per input line, in order, e.g.
+`{"line": 1, "op": "add", "ok": true, "ids": [101]}` or
+`{"line": 2, "op": "complete", "ok": false, "error": "Task 12 not found"}`.
+An optional "ref" field on a command is echoed back in its result. An
+edit with "version" fails if the task has changed since that version.
+
+Consecutive writes run in one transaction of up to `group_size` commands,
+each inside its own savepoint so one failure doesn't undo its neighbours.
+Results of a group are written after it commits, so `"ok": true` means
+the change is durable. A `list` first commits the pending group, so it
+sees the writes before it.
+
+Author: TaskCLI Team
+"""
+
+import json
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from .changes import record_change, record_created
+from .concurrency import EDIT_FIELDS, VersionConflict, bump, completion, update_task
+from .models import Task
+from .series import new_series_id
+
+RECURRENCES = {
+    'none': (1, 1),
+    'daily_7': (7, 1),
+    'daily_30': (30, 1),
+    'weekly_4': (4, 7),
+}
+LIST_FIELDS = ('id', 'name', 'project', 'priority', 'due_date', 'due_time', 'completed', 'is_recurring')
+
+
+class CommandError(Exception):
+    """A batch command that can't be carried out; reported in its result line."""
+
+
+class BatchRunner:
+    """Executes parsed batch commands; caches user lookups for the whole batch."""
+
+    def __init__(self):
+        self._users = {}
+
+    def user(self, username):
+        if not username:
+            raise CommandError("'user' is required")
+        if username not in self._users:
+            self._users[username] = User.objects.filter(username=username).first()
+        if self._users[username] is None:
+            raise CommandError(f"User '{username}' not found")
+        return self._users[username]
+
+    @staticmethod
+    def task(cmd):
+        try:
+            return Task.objects.get(id=cmd['id'])
+        except KeyError:
+            raise CommandError("'id' is required")
+        except (Task.DoesNotExist, ValueError, TypeError):
+            raise CommandError(f"Task {cmd.get('id')} not found")
+
+    def run(self, cmd):
+        handler = getattr(self, f"op_{cmd.get('op')}", None)
+        if handler is None:
+            raise CommandError(f"Unknown op {cmd.get('op')!r}")
+        return handler(cmd)
+
+    def op_add(self, cmd):
+        user = self.user(cmd.get('user'))
+        if not cmd.get('name'):
+            raise CommandError("'name' is required")
+        recurrence = cmd.get('recurrence', 'none')
+        if recurrence not in RECURRENCES:
+            raise CommandError(f"Unknown recurrence {recurrence!r}")
+        try:
+            start = date.fromisoformat(cmd['due_date']) if cmd.get('due_date') else date.today()
+        except ValueError:
+            raise CommandError("Invalid date format. Use YYYY-MM-DD.")
+        try:
+            due_time = Task._meta.get_field('due_time').to_python(cmd.get('due_time', '12:00'))
+        except ValidationError:
+            raise CommandError("Invalid time format. Use HH:MM.")
+        count, step = RECURRENCES[recurrence]
+        series_id = new_series_id(recurrence)
+        created = Task.objects.bulk_create([
+            Task(
+                user=user,
+                name=cmd['name'],
+                project=cmd.get('project', 'General'),
+                priority=cmd.get('priority', 'Medium'),
+                due_date=start + timedelta(days=i * step),
+                due_time=due_time,
+                completed=False,
+                is_recurring=recurrence != 'none',
+                series_id=series_id,
+            )
+            for i in range(count)
+        ])
+        record_created(created)
+        return {"ids": [t.id for t in created]}
+
+    def _set_completed(self, cmd, completed):
+        task = self.task(cmd)
+        Task.objects.filter(id=task.id).update(**completion(completed), version=bump())
+        record_change(task.user_id, task.id, 'updated', {"completed": completed})
+        return {"id": task.id}
+
+    def op_complete(self, cmd):
+        return self._set_completed(cmd, True)
+
+    def op_pending(self, cmd):
+        return self._set_completed(cmd, False)
+
+    def op_edit(self, cmd):
+        task = self.task(cmd)
+        changed = {f: cmd[f] for f in EDIT_FIELDS if cmd.get(f)}
+        if not changed:
+            raise CommandError(f"Nothing to change; give any of {', '.join(EDIT_FIELDS)}")
+        for field, value in changed.items():
+            try:
+                changed[field] = Task._meta.get_field(field).to_python(value)
+            except ValidationError as e:
+                raise CommandError(f"Invalid {field}: {'; '.join(e.messages)}")
+        try:
+            version = update_task(task.id, changed, version=cmd.get('version'))
+        except VersionConflict as e:
+            raise CommandError(f"{e}; not changed")
+        return {"id": task.id, "version": version}
+
+    def op_delete(self, cmd):
+        task = self.task(cmd)
+        record_change(task.user_id, task.id, 'deleted')
+        task.delete()
+        return {"id": cmd['id']}
+
+    def op_list(self, cmd):
+        tasks = Task.objects.filter(user=self.user(cmd.get('user')))
+        if cmd.get('status') == 'pending':
+            tasks = tasks.filter(completed=False)
+        elif cmd.get('status') == 'completed':
+            tasks = tasks.filter(completed=True)
+        if cmd.get('priority'):
+            tasks = tasks.filter(priority=cmd['priority'])
+        if cmd.get('project'):
+            tasks = tasks.filter(project__icontains=cmd['project'])
+        if cmd.get('limit'):
+            try:
+                limit = int(cmd['limit'])
+            except (TypeError, ValueError):
+                limit = -1
+            if limit < 0:
+                raise CommandError("'limit' must be a non-negative integer")
+            tasks = tasks[:limit]
+        rows = []
+        for row in tasks.values_list(*LIST_FIELDS):
+            task = dict(zip(LIST_FIELDS, row))
+            task['due_date'], task['due_time'] = str(task['due_date']), str(task['due_time'])
+            rows.append(task)
+        return {"tasks": rows}
+
+
+def _parse(line):
+    try:
+        cmd = json.loads(line)
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+    if not isinstance(cmd, dict):
+        return None, "Each line must be a JSON object"
+    return cmd, None
+
+
+def _result(lineno, cmd, error=None, data=None):
+    result = {"line": lineno, "op": cmd.get('op') if cmd else None, "ok": error is None}
+    if cmd and 'ref' in cmd:
+        result['ref'] = cmd['ref']
+    if error is not None:
+        result['error'] = error
+    if data:
+        result.update(data)
+    return result
+
+
+def run_batch(lines, write, group_size=500):
+    """
+    Execute NDJSON commands from `lines`, calling `write(text)` with NDJSON results.
+
+    Returns stats: commands, ok, errors, transactions, seconds.
+    """
+    runner = BatchRunner()
+    stats = {"commands": 0, "ok": 0, "errors": 0, "transactions": 0}
+    group = []  # (lineno, cmd, parse error)
+    start = time.perf_counter()
+
+    def emit(results):
+        for r in results:
+            stats['ok' if r['ok'] else 'errors'] += 1
+        write(''.join(json.dumps(r) + '\n' for r in results))
+
+    def execute(lineno, cmd, error):
+        if error is not None:
+            return _result(lineno, cmd, error)
+        try:
+            with transaction.atomic():
+                return _result(lineno, cmd, data=runner.run(cmd))
+        except CommandError as e:
+            return _result(lineno, cmd, str(e))
+        except ValidationError as e:  # a value no op checked; the savepoint undid only this command
+            return _result(lineno, cmd, '; '.join(e.messages))
+        except (ValueError, TypeError, DatabaseError) as e:
+            return _result(lineno, cmd, f"{type(e).__name__}: {e}")
+
+    def flush():
+        if not group:
+            return
+        try:
+            with transaction.atomic():
+                results = [execute(*item) for item in group]
+            stats['transactions'] += 1
+        except DatabaseError as e:
+            results = [_result(lineno, cmd, f"Transaction failed: {e}") for lineno, cmd, _ in group]
+        group.clear()
+        emit(results)
+
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        stats['commands'] += 1
+        cmd, error = _parse(line)
+        if cmd is not None and cmd.get('op') == 'list':
+            flush()
+            emit([execute(lineno, cmd, None)])
+            continue
+        group.append((lineno, cmd, error))
+        if len(group) >= group_size:
+            flush()
+    flush()
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
@@ -0,0 +1,59 @@
+"""
+Task Change Log for TaskCLI
+===========================
+Helpers that append TaskChange rows for every task mutation. Call them
+inside the same `transaction.atomic()` block as the mutation so the log
+never disagrees with the task table.
+
+The change feed (`api_task_changes` in views.py) streams these rows.
+
+Author: TaskCLI Team
+"""
+
+from .models import TaskChange
+
+
+def task_payload(task):
+    """Serialize a task the same way the JSON API does."""
+    return {
+        "id": task.id,
+        "name": task.name,
+        "project": task.project,
+        "priority": task.priority,
+        "due_date": str(task.due_date),
+        "due_time": str(task.due_time),
+        "completed": task.completed,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+        "is_recurring": task.is_recurring,
+        "series_id": str(task.series_id) if task.series_id else None,
+        "version": task.version,
+    }
+
+
+def record_change(user_id, task_id, action, data=None):
+    """Append one change row for a task."""
+    TaskChange.objects.create(user_id=user_id, task_id=task_id, action=action, data=data or {})
+
+
+def record_bulk(user_id, task_ids, action, data=None):
+    """Append the same change for many tasks in one INSERT."""
+    TaskChange.objects.bulk_create([
+        TaskChange(user_id=user_id, task_id=task_id, action=action, data=data or {})
+        for task_id in task_ids
+    ])
+
+
+def record_created(tasks):
+    """Append `created` rows for newly created tasks in one INSERT."""
+    TaskChange.objects.bulk_create([
+        TaskChange(user_id=task.user_id, task_id=task.id, action='created', data=task_payload(task))
+        for task in tasks
+    ])
+
+
+def record_updates(user_id, changes):
+    """Append `updated` rows with per-task data, given (task_id, data) pairs, in one INSERT."""
+    TaskChange.objects.bulk_create([
+        TaskChange(user_id=user_id, task_id=task_id, action='updated', data=data)
+        for task_id, data in changes
+    ])
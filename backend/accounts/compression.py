@@ -0,0 +1,136 @@
+"""
+Response Compression for TaskCLI
+================================
+CompressionMiddleware compresses dynamic responses (the dashboard HTML,
+API JSON) with brotli or gzip, whichever the client prefers in
+Accept-Encoding. WhiteNoise already serves pre-compressed static files, so
+those are left alone.
+
+A response is compressed only if:
+
+- compression is enabled (COMPRESSION_ENABLED) and the client accepts br or gzip
+- it is not streaming (the SSE change feed must flush event by event) and
+  has no Content-Encoding yet
+- its Content-Type is in COMPRESSION_TYPES
+- the body is at least COMPRESSION_MIN_BYTES, and compressing makes it smaller
+
+Brotli needs the optional `brotli` (or `brotlicffi`) package; without it
+only gzip is offered. A strong ETag is made weak (W/"..."): the compressed
+body is a different byte sequence, but If-None-Match still matches because
+it uses weak comparison. Against BREACH, gzip output gets Django's random
+header padding and brotli output a random-length metadata block; CSRF
+tokens are also masked per response by Django.
+
+Author: TaskCLI Team
+"""
+
+import re
+import secrets
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+_STRONG_ETAG = re.compile(r'^"')
+
+
+def accepted_encodings(header):
+    """{'br': 1.0, 'gzip': 0.8, ...} from an Accept-Encoding header; q=0 entries dropped."""
+    accepted = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        match = re.search(r'q=([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                continue
+        if name and q > 0:
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """'br', 'gzip' or None for an Accept-Encoding header (ties go to br)."""
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get('*', 0)
+    candidates = [('br', accepted.get('br', wildcard))] if brotli else []
+    candidates.append(('gzip', accepted.get('gzip', wildcard)))
+    encoding, q = max(candidates, key=lambda c: c[1])
+    return encoding if q > 0 else None
+
+
+def _brotli_padding(max_random_bytes):
+    """
+    A brotli metadata meta-block of 1 to `max_random_bytes` (<= 256) bytes,
+    which decoders skip. Header bits, LSB first: ISLAST=0, MNIBBLES=11
+    (metadata), reserved 0, MSKIPBYTES=1, MSKIPLEN-1 in 8 bits.
+    """
+    length = secrets.randbelow(max_random_bytes) + 1
+    return (0b010110 | (length - 1) << 6).to_bytes(2, 'little') + b'\0' * length
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        # Like gzip below, pad by a random length against BREACH. A flush
+        # byte-aligns the stream after its header, where a metadata block
+        # can be spliced in before the compressed body.
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        header = compressor.process(b'') + compressor.flush()
+        return header + _brotli_padding(100) + compressor.process(content) + compressor.finish()
+    return compress_string(content, max_random_bytes=100)
+
+
+class CompressionMiddleware:
+    """Compress eligible responses with brotli or gzip (async-capable)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if not settings.COMPRESSION_ENABLED or response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in settings.COMPRESSION_TYPES:
+            return response
+
+        # The body depends on Accept-Encoding whenever it could be compressed
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.COMPRESSION_MIN_BYTES:
+            return response
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        if response.has_header('ETag'):
+            response['ETag'] = _STRONG_ETAG.sub('W/"', response['ETag'])
+        return response
@@ -0,0 +1,80 @@
+"""
+Optimistic Concurrency for TaskCLI
+==================================
+Task.version starts at 1 and every write bumps it inside the same UPDATE
+(`version = version + 1`). An edit that sends back the version it read
+runs as `UPDATE ... WHERE id = ? AND version = ?`. If another writer got
+there first, no row matches, and the caller answers 409 Conflict with the
+current task so the client can merge and retry. Edits without a version are
+still applied, field by field, so they never overwrite fields they didn't
+touch. No row locks and no SELECT FOR UPDATE.
+
+Every UPDATE that changes `completed` also sets `completed_at` through
+completion(), so all completion paths agree on it.
+
+Author: TaskCLI Team
+"""
+
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .changes import record_change
+from .models import Task
+
+EDIT_FIELDS = ('name', 'project', 'priority', 'due_date', 'due_time')
+
+
+class VersionConflict(Exception):
+    """The task changed since the client read it; `task` is its current state."""
+
+    def __init__(self, task):
+        super().__init__(f"Task {task.id} was changed by someone else (now version {task.version})")
+        self.task = task
+
+
+def bump():
+    """Expression for `version` in an UPDATE that changes a task."""
+    return F('version') + 1
+
+
+def completion(completed):
+    """UPDATE values that mark tasks done (keeping an earlier completion time) or pending."""
+    if completed:
+        return {'completed': True, 'completed_at': Coalesce('completed_at', Value(timezone.now()))}
+    return {'completed': False, 'completed_at': None}
+
+
+def _json_value(value):
+    return value if value is None or isinstance(value, (bool, int, str)) else str(value)
+
+
+def update_task(task_id, changes, version=None, user=None):
+    """
+    Apply {field: value} to a task with one UPDATE and log the change.
+
+    With `version`, only if the task is still at that version; raises
+    VersionConflict otherwise. `user` limits the update to that user's
+    task. Raises Task.DoesNotExist, and ValidationError for bad values.
+    Returns the new version.
+    """
+    tasks = Task.objects.filter(id=task_id)
+    if user is not None:
+        tasks = tasks.filter(user=user)
+    cleaned = {field: Task._meta.get_field(field).to_python(value) for field, value in changes.items()}
+    updates = {**cleaned, **completion(cleaned['completed'])} if 'completed' in cleaned else cleaned
+
+    with transaction.atomic():
+        target = tasks if version is None else tasks.filter(version=version)
+        if not target.update(**updates, version=bump()):
+            current = tasks.first()
+            if current is None:
+                raise Task.DoesNotExist(f"Task {task_id} not found")
+            raise VersionConflict(current)
+        user_id, new_version, completed_at = tasks.values_list('user_id', 'version', 'completed_at').get()
+        data = {field: _json_value(value) for field, value in cleaned.items()}
+        if 'completed' in cleaned:
+            data['completed_at'] = completed_at.isoformat() if completed_at else None
+        record_change(user_id, task_id, 'updated', {**data, "version": new_version})
+    return new_version
@@ -0,0 +1,100 @@
+"""
+Database Connection Tuning for TaskCLI
+======================================
+The web app and the `task_cli` management command share one SQLite file.
+With SQLite's default rollback journal a CLI write blocks every web reader,
+so this module applies a production pragma profile to each new connection.
+
+The profile is opt-in (SQLITE_TUNING in settings.py) and is a no-op for
+PostgreSQL and other backends.
+
+For PostgreSQL deployments using Django's native psycopg pool
+(DATABASE_POOL in settings.py), it also reports pool checkout and wait
+statistics to the log.
+
+Author: TaskCLI Team
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Monotonic timestamp of the last `PRAGMA optimize` run in this process
+_last_optimize = None
+
+# Monotonic timestamp of the last pool statistics report in this process
+_last_pool_report = None
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    `connection_created` handler that applies SQLITE_PRAGMAS.
+
+    Pragmas are applied in settings order (journal_mode first, so WAL is
+    active before the rest take effect). `PRAGMA optimize` runs on the
+    first connection of the process and then at most once every
+    SQLITE_OPTIMIZE_INTERVAL seconds; persistent connections are recycled
+    by CONN_MAX_AGE, so long-running workers keep re-optimizing.
+    """
+    global _last_optimize
+
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_TUNING', False):
+        return
+
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+        now = time.monotonic()
+        interval = getattr(settings, 'SQLITE_OPTIMIZE_INTERVAL', 3600)
+        if _last_optimize is None or now - _last_optimize >= interval:
+            cursor.execute("PRAGMA optimize")
+            _last_optimize = now
+
+
+def pool_stats():
+    """
+    Return psycopg pool statistics for every pooled database alias.
+
+    Keys of interest: `requests_num` (checkouts), `requests_wait_ms`
+    (total time spent waiting for a connection), `requests_waiting`,
+    `pool_size` and `pool_available`. Counters are cumulative per process.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is not None:
+            stats[alias] = pool.get_stats()
+    return stats
+
+
+def report_pool_stats(sender, **kwargs):
+    """
+    `request_finished` handler that logs pool statistics.
+
+    Logs at most once every DATABASE_POOL_STATS_INTERVAL seconds per
+    process; set the interval to 0 to disable reporting.
+    """
+    global _last_pool_report
+
+    interval = getattr(settings, 'DATABASE_POOL_STATS_INTERVAL', 0)
+    if not getattr(settings, 'DATABASE_POOL', False) or interval <= 0:
+        return
+
+    now = time.monotonic()
+    if _last_pool_report is not None and now - _last_pool_report < interval:
+        return
+    _last_pool_report = now
+
+    for alias, stats in pool_stats().items():
+        checkouts = stats.get('requests_num', 0)
+        wait_ms = stats.get('requests_wait_ms', 0)
+        logger.info(
+            "db pool %s: checkouts=%d wait_ms=%d avg_wait_ms=%.2f waiting=%d size=%d available=%d",
+            alias, checkouts, wait_ms, wait_ms / checkouts if checkouts else 0.0,
+            stats.get('requests_waiting', 0), stats.get('pool_size', 0), stats.get('pool_available', 0),
+        )
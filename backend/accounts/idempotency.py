@@ -0,0 +1,116 @@
+"""
+Idempotency Keys for TaskCLI
+============================
+Lets API clients retry a mutation safely. A client sends the same
+`Idempotency-Key` header on every attempt of one logical operation; the
+first attempt runs the view and its response is stored, later attempts get
+the stored response replayed (with an `Idempotent-Replayed: true` header).
+
+- The stored response is written in the same transaction as the view's
+  mutation, so a task is never created without its response being saved.
+- While the first attempt is still running, repeats get 409 + Retry-After.
+- Reusing a key with a different request body gets 422.
+- 5xx responses and exceptions are not stored; the client may retry.
+
+Author: TaskCLI Team
+"""
+
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+
+_last_purge = 0.0
+
+
+def purge_expired():
+    """Delete keys older than IDEMPOTENCY_TTL_SECONDS; runs at most once per interval per process."""
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge < settings.IDEMPOTENCY_PURGE_INTERVAL:
+        return
+    _last_purge = now
+    cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+
+
+def _reserve(key, path, request_hash):
+    """
+    Insert a placeholder row for the key.
+
+    Returns (True, None) if this request now owns the key, otherwise
+    (False, existing row or None). An expired row, or a placeholder left by
+    a request that died before committing, is taken over.
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(key=key, path=path, request_hash=request_hash)
+        return True, None
+    except IntegrityError:
+        pass
+
+    expired = now - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    abandoned = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+    taken_over = IdempotencyKey.objects.filter(
+        Q(created_at__lt=expired) | Q(status_code__isnull=True, created_at__lt=abandoned),
+        key=key, path=path,
+    ).update(request_hash=request_hash, status_code=None, response_body='', created_at=now)
+    if taken_over:
+        return True, None
+    return False, IdempotencyKey.objects.filter(key=key, path=path).first()
+
+
+def _replay(record, request_hash):
+    """Response for a repeated key."""
+    if record is None or record.status_code is None:
+        response = JsonResponse({"success": False, "error": "A request with this Idempotency-Key is in progress"},
+                                status=409)
+        response['Retry-After'] = '1'
+        return response
+    if record.request_hash != request_hash:
+        return JsonResponse({"success": False, "error": "Idempotency-Key was used with a different request"},
+                            status=422)
+    response = HttpResponse(record.response_body, status=record.status_code, content_type='application/json')
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_func):
+    """Store and replay POST responses keyed by the Idempotency-Key header."""
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        key = request.META.get(HEADER, '').strip()
+        if request.method != 'POST' or not key:
+            return view_func(request, *args, **kwargs)
+        if len(key) > 255:
+            return JsonResponse({"success": False, "error": "Idempotency-Key too long"}, status=400)
+
+        purge_expired()
+        request_hash = hashlib.sha256(request.body).hexdigest()
+        owned, existing = _reserve(key, request.path, request_hash)
+        if not owned:
+            return _replay(existing, request_hash)
+
+        try:
+            with transaction.atomic():
+                response = view_func(request, *args, **kwargs)
+                if response.status_code < 500:
+                    IdempotencyKey.objects.filter(key=key, path=request.path).update(
+                        status_code=response.status_code, response_body=response.content.decode(),
+                    )
+        finally:
+            # Release the key if nothing was stored so the client can retry
+            IdempotencyKey.objects.filter(key=key, path=request.path, status_code__isnull=True).delete()
+        return response
+    return _wrapped
@@ -0,0 +1,198 @@
+"""
+Background Jobs for TaskCLI
+===========================
+A small DB-backed job queue with no external broker. Views enqueue work
+that is too large to finish inside a request (JOB_INLINE_LIMIT) and
+`python manage.py task_cli worker` runs it.
+
+Claiming uses SELECT ... FOR UPDATE SKIP LOCKED where the database supports
+it (PostgreSQL), so concurrent workers never block on or double-run a job.
+SQLite has no row locks; there a worker claims a job with a conditional
+UPDATE (status still 'queued'), which only one worker can win.
+
+Handlers are plain functions registered with @handler('kind'); they take
+the Job and return a JSON-serializable result.
+
+Author: TaskCLI Team
+"""
+
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .changes import record_bulk, record_created
+from .concurrency import bump, completion
+from .models import Job, Task
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def handler(kind):
+    """Register a function as the handler for jobs of `kind`."""
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind, user=None, **payload):
+    """Queue a job and return it."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return Job.objects.create(kind=kind, user=user, payload=payload)
+
+
+def job_payload(job):
+    """Serialize a job for the status endpoint."""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+# =============================================================================
+# CLAIMING AND RUNNING
+# =============================================================================
+
+def _claimable(now):
+    """Queued jobs, plus running jobs whose worker died (lock older than JOB_TIMEOUT_SECONDS)."""
+    stale = now - timedelta(seconds=settings.JOB_TIMEOUT_SECONDS)
+    return Job.objects.filter(Q(status='queued') | Q(status='running', locked_at__lt=stale)).order_by('id')
+
+
+def claim(worker_id):
+    """Claim the oldest available job for `worker_id`; return it or None."""
+    now = timezone.now()
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = _claimable(now).select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status, job.locked_by, job.locked_at = 'running', worker_id, now
+            job.attempts += 1
+            job.save(update_fields=['status', 'locked_by', 'locked_at', 'attempts'])
+            return job
+
+    # SQLite fallback: the conditional UPDATE is the lock
+    for job in _claimable(now)[:10]:
+        won = Job.objects.filter(id=job.id, status=job.status, locked_at=job.locked_at).update(
+            status='running', locked_by=worker_id, locked_at=now, attempts=job.attempts + 1,
+        )
+        if won:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome."""
+    try:
+        result = HANDLERS[job.kind](job)
+    except Exception as e:
+        logger.exception("Job %s failed (attempt %d)", job, job.attempts)
+        retry = job.attempts < settings.JOB_MAX_ATTEMPTS
+        Job.objects.filter(id=job.id, locked_by=job.locked_by).update(
+            status='queued' if retry else 'failed', error=str(e), locked_at=None,
+            finished_at=None if retry else timezone.now(),
+        )
+        return False
+    Job.objects.filter(id=job.id, locked_by=job.locked_by).update(
+        status='done', result=result, error='', finished_at=timezone.now(),
+    )
+    return True
+
+
+def work(worker_id, stop, once=False):
+    """Claim and run jobs until `stop` is set (or, with `once`, the queue is empty)."""
+    processed = 0
+    while not stop.is_set():
+        close_old_connections()
+        job = claim(worker_id)
+        if job is None:
+            if once:
+                break
+            stop.wait(settings.JOB_POLL_SECONDS)
+            continue
+        run_job(job)
+        processed += 1
+    connection.close()
+    return processed
+
+
+def run_workers(concurrency=2, once=False, stop=None):
+    """Run `concurrency` worker threads; returns the number of jobs processed."""
+    stop = stop or threading.Event()
+    base = f"{socket.gethostname()}:{os.getpid()}"
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='taskcli-worker') as pool:
+        futures = [pool.submit(work, f"{base}:{i}", stop, once) for i in range(concurrency)]
+        try:
+            return sum(f.result() for f in futures)
+        except KeyboardInterrupt:
+            stop.set()
+            raise
+
+
+# =============================================================================
+# HANDLERS
+# =============================================================================
+
+@handler('create_tasks')
+def create_tasks(job):
+    """Create one task per date in the payload (recurrence expansion)."""
+    data = job.payload
+    with transaction.atomic():
+        created = Task.objects.bulk_create([
+            Task(
+                user=job.user,
+                name=data['name'],
+                project=data['project'],
+                priority=data['priority'],
+                due_date=date.fromisoformat(d),
+                due_time=data['due_time'],
+                completed=False,
+                is_recurring=data['is_recurring'],
+                series_id=data.get('series_id'),
+            )
+            for d in data['dates']
+        ])
+        record_created(created)
+    return {"created": len(created), "task_ids": [t.id for t in created]}
+
+
+def apply_bulk_action(user, action, task_ids):
+    """Complete, reopen or delete the user's tasks among `task_ids`; return the affected IDs."""
+    with transaction.atomic():
+        tasks = Task.objects.filter(user=user, id__in=task_ids)
+        ids = list(tasks.values_list('id', flat=True))
+        if action == 'delete':
+            tasks.delete()
+            record_bulk(user.id, ids, 'deleted')
+        else:
+            completed = action == 'complete'
+            tasks.update(**completion(completed), version=bump())
+            record_bulk(user.id, ids, 'updated', {"completed": completed})
+    return ids
+
+
+@handler('bulk_tasks')
+def bulk_tasks(job):
+    """Background version of apply_bulk_action for large selections."""
+    ids = apply_bulk_action(job.user, job.payload['action'], job.payload['task_ids'])
+    return {"action": job.payload['action'], "affected": len(ids), "task_ids": ids}
@@ -11,10 +11,20 @@ Interactive Mode (Recommended for beginners):
     
 Direct Commands:
     python manage.py task_cli list --status pending
+    python manage.py task_cli list --format ndjson --limit 100 > tasks.ndjson
     python manage.py task_cli add "Task Name" --user email@example.com --priority High
     python manage.py task_cli complete 123
     python manage.py task_cli edit 123 --name "New Name"
+    python manage.py task_cli edit 123 --priority High --if-version 4
     python manage.py task_cli delete 123
+    python manage.py task_cli series shift 123 --days 7
+    python manage.py task_cli archive --older-than 90
+    python manage.py task_cli report --user email@example.com --weeks 12
+    python manage.py task_cli batch < commands.ndjson > results.ndjson
+    python manage.py task_cli worker --concurrency 4
+    python manage.py task_cli seed --users 1000 --tasks-per-user 10000
+    python manage.py task_cli --profile list --user email@example.com
+    python manage.py task_cli scheduler --sink webhook --url http://localhost:9000/hook
 
 FEATURES:
 ---------
@@ -27,11 +37,20 @@ FEATURES:
 Author: TaskCLI Team
 """
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from accounts.models import Task
+from django.db import transaction
+from accounts.models import ArchivedTask, Task
+from accounts.changes import record_change, record_created
+from accounts.concurrency import EDIT_FIELDS, VersionConflict, update_task
+from accounts.series import SERIES_FIELDS, delete_series, new_series_id, update_series
 from datetime import datetime, timedelta
+from itertools import chain, islice
+import csv
+import io
+import json
 import os
 import getpass
 
@@ -53,6 +72,7 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--interactive', '-i', action='store_true', help='Launch interactive mode')
+        parser.add_argument('--profile', action='store_true', help='Profile the command and print a report with SQL timings')
         subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
         # List command
@@ -62,6 +82,10 @@ class Command(BaseCommand):
         list_parser.add_argument('--project', type=str, help='Filter by project name')
         list_parser.add_argument('--status', type=str, choices=['pending', 'completed', 'all'], default='all', help='Filter by status')
         list_parser.add_argument('--recurring', action='store_true', help='Show only recurring tasks')
+        list_parser.add_argument('--include-archived', action='store_true', help='Also show archived tasks')
+        list_parser.add_argument('--format', type=str, choices=['table', 'json', 'ndjson', 'csv'], default='table', help='Output format (only table uses colors)')
+        list_parser.add_argument('--limit', type=int, help='Show at most N tasks')
+        list_parser.add_argument('--offset', type=int, default=0, help='Skip the first N tasks')
 
         # Add command
         add_parser = subparsers.add_parser('add', help='Add a new task')
@@ -89,12 +113,91 @@ class Command(BaseCommand):
         edit_parser.add_argument('--priority', type=str, choices=['High', 'Medium', 'Low'], help='New priority')
         edit_parser.add_argument('--due_date', type=str, help='New due date (YYYY-MM-DD)')
         edit_parser.add_argument('--due_time', type=str, help='New due time (HH:MM)')
+        edit_parser.add_argument('--if-version', type=int, dest='if_version',
+                                 help='Only edit if the task is still at this version')
 
         # Delete command
         delete_parser = subparsers.add_parser('delete', help='Delete a task')
         delete_parser.add_argument('task_id', type=int, help='Task ID')
 
+        # Series command
+        series_parser = subparsers.add_parser('series', help='Edit, shift or delete every task of a recurring series')
+        series_parser.add_argument('action', choices=['edit', 'shift', 'delete'], help='What to do with the series')
+        series_parser.add_argument('task_id', type=int, help='ID of any task in the series')
+        series_parser.add_argument('--name', type=str, help='New task name')
+        series_parser.add_argument('--project', type=str, help='New project name')
+        series_parser.add_argument('--priority', type=str, choices=['High', 'Medium', 'Low'], help='New priority')
+        series_parser.add_argument('--due_time', type=str, help='New due time (HH:MM)')
+        series_parser.add_argument('--days', type=int, default=0, help='Move every due date by N days (may be negative)')
+
+        # Batch command
+        batch_parser = subparsers.add_parser('batch', help='Run NDJSON commands from a file or stdin in one process')
+        batch_parser.add_argument('--file', type=str, default='-', help="NDJSON command file ('-' for stdin)")
+        batch_parser.add_argument('--group-size', type=int, default=500, help='Max consecutive writes per transaction')
+
+        # Archive command
+        archive_parser = subparsers.add_parser('archive', help='Move old completed tasks to the archive table')
+        archive_parser.add_argument('--older-than', type=int, required=True, help='Archive completed tasks due more than N days ago')
+        archive_parser.add_argument('--batch-size', type=int, default=500, help='Tasks moved per transaction')
+        archive_parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+
+        # Worker command
+        worker_parser = subparsers.add_parser('worker', help='Run queued background jobs')
+        worker_parser.add_argument('--concurrency', type=int, default=2, help='Worker threads')
+        worker_parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+
+        # Profiling token command
+        token_parser = subparsers.add_parser('profile-token', help='Issue a signed token for profiling web requests')
+        token_parser.add_argument('--user', type=str, required=True, help='Staff username (email)')
+
+        # Slow-query report command
+        slow_parser = subparsers.add_parser('slow-queries', help='Summarize the slow-query table')
+        slow_parser.add_argument('--limit', type=int, default=20, help='Number of query shapes to show')
+        slow_parser.add_argument('--plans', action='store_true', help='Show the latest EXPLAIN plan of each')
+
+        # Report command
+        report_parser = subparsers.add_parser('report', help='Weekly completion rate, on-time vs. late and per-project throughput')
+        report_parser.add_argument('--user', type=str, required=True, help='User email')
+        report_parser.add_argument('--weeks', type=int, default=12, help='Weeks covered, ending with the current one')
+        report_parser.add_argument('--format', type=str, choices=['table', 'json'], default='table', help='Output format')
+        report_parser.add_argument('--engine', type=str, choices=['numpy', 'python'], help='Counting engine (default: numpy if installed)')
+
+        # Seed command
+        seed_parser = subparsers.add_parser('seed', help='Generate synthetic users and tasks for scale testing')
+        seed_parser.add_argument('--users', type=int, default=10, help='Number of users to create')
+        seed_parser.add_argument('--tasks-per-user', type=int, default=100, help='Tasks per user')
+        seed_parser.add_argument('--random-seed', type=int, default=42, help='Random seed; same seed, same data')
+        seed_parser.add_argument('--prefix', type=str, default='seed', help='Username prefix (<prefix>-N@example.com)')
+        seed_parser.add_argument('--priorities', type=str, default='High=2,Medium=5,Low=3', help='Priority weights')
+        seed_parser.add_argument('--projects', type=str, default='Work=5,Personal=3,Study=2,Health=1,Home=2', help='Project weights')
+        seed_parser.add_argument('--completed', type=float, default=0.4, help='Fraction of tasks marked completed')
+        seed_parser.add_argument('--recurring', type=float, default=0.1, help='Fraction of task series that recur')
+        seed_parser.add_argument('--days-back', type=int, default=365, help='Earliest due date, days before today')
+        seed_parser.add_argument('--days-ahead', type=int, default=90, help='Latest due date, days after today')
+        seed_parser.add_argument('--batch-size', type=int, default=50000, help='Rows written per transaction')
+        seed_parser.add_argument('--method', type=str, choices=['auto', 'copy', 'executemany', 'bulk'], default='auto',
+                                 help='Write path (auto: COPY on PostgreSQL, executemany on SQLite)')
+
+        # Scheduler command
+        scheduler_parser = subparsers.add_parser('scheduler', help='Fire reminders when tasks fall due')
+        scheduler_parser.add_argument('--sink', type=str, help="Reminder sink: log, file, webhook or a dotted class path")
+        scheduler_parser.add_argument('--file', type=str, help='Output file for the file sink')
+        scheduler_parser.add_argument('--url', type=str, help='Webhook URL for the webhook sink')
+        scheduler_parser.add_argument('--once', action='store_true', help='Fire reminders due now and exit')
+
     def handle(self, *args, **options):
+        if options.get('profile'):
+            from accounts.profiling import Profile
+
+            with Profile() as profile:
+                self.run_command(options)
+            self.stderr.write(profile.report())
+            name = profile.save(f"task_cli-{options.get('command') or 'interactive'}")
+            self.stderr.write(f"Profile saved to {settings.PROFILING_DIR}/{name}.*")
+        else:
+            self.run_command(options)
+
+    def run_command(self, options):
         if options.get('interactive') or options.get('command') is None:
             self.interactive_mode()
         else:
@@ -111,6 +214,24 @@ class Command(BaseCommand):
                 self.edit_task(options)
             elif command == 'delete':
                 self.delete_task(options['task_id'])
+            elif command == 'series':
+                self.series_action(options)
+            elif command == 'batch':
+                self.run_batch(options)
+            elif command == 'archive':
+                self.archive_tasks(options)
+            elif command == 'worker':
+                self.run_worker(options)
+            elif command == 'scheduler':
+                self.run_scheduler(options)
+            elif command == 'seed':
+                self.seed_data(options)
+            elif command == 'slow-queries':
+                self.slow_queries(options)
+            elif command == 'report':
+                self.productivity_report(options)
+            elif command == 'profile-token':
+                self.profile_token(options)
 
     def clear_screen(self):
         os.system('clear' if os.name != 'nt' else 'cls')
@@ -421,7 +542,7 @@ class Command(BaseCommand):
         self.stdout.write(f"  Due Date: {task.due_date}")
         self.stdout.write(f"  Due Time: {task.due_time}\n")
         
-        options = {'task_id': int(task_id)}
+        options = {'task_id': int(task_id), 'if_version': task.version}  # don't overwrite edits made meanwhile
         
         new_name = self.get_input("New name: ")
         if new_name:
@@ -492,9 +613,13 @@ class Command(BaseCommand):
         self.list_tasks(options)
 
     # Original command methods (updated with colors)
+    LIST_FIELDS = ('id', 'name', 'project', 'priority', 'due_date', 'due_time', 'completed', 'is_recurring')
+    LIST_FLUSH_BYTES = 64 * 1024
+
     def list_tasks(self, options):
         tasks = Task.objects.all()
-        
+        user = None
+
         if options.get('user'):
             try:
                 user = User.objects.get(username=options['user'])
@@ -502,37 +627,121 @@ class Command(BaseCommand):
             except User.DoesNotExist:
                 self.stdout.write(f"{Colors.RED}❌ User '{options['user']}' not found.{Colors.END}")
                 return
-        
-        if options.get('priority'):
-            tasks = tasks.filter(priority=options['priority'])
-        if options.get('project'):
-            tasks = tasks.filter(project__icontains=options['project'])
+
+        def apply_filters(qs):
+            if options.get('priority'):
+                qs = qs.filter(priority=options['priority'])
+            if options.get('project'):
+                qs = qs.filter(project__icontains=options['project'])
+            if options.get('recurring'):
+                qs = qs.filter(is_recurring=True)
+            return qs
+
+        tasks = apply_filters(tasks)
         if options.get('status') == 'pending':
             tasks = tasks.filter(completed=False)
         elif options.get('status') == 'completed':
             tasks = tasks.filter(completed=True)
-        if options.get('recurring'):
-            tasks = tasks.filter(is_recurring=True)
-        
-        if not tasks:
+
+        offset, limit = options.get('offset') or 0, options.get('limit')
+        stop = offset + limit if limit is not None else None
+        # Stream rows (values_list + iterator) instead of loading model instances
+        sources = [tasks.values_list(*self.LIST_FIELDS)]
+        if options.get('include_archived') and options.get('status') != 'pending':
+            archived = ArchivedTask.objects.filter(user=user) if user else ArchivedTask.objects.all()
+            sources.append(apply_filters(archived).values_list(*self.LIST_FIELDS))
+        if len(sources) == 1:
+            rows = ((row, False) for row in sources[0][offset:stop].iterator(chunk_size=2000))
+        else:
+            rows = islice(chain(*(((row, bool(i)) for row in qs.iterator(chunk_size=2000))
+                                  for i, qs in enumerate(sources))), offset, stop)
+
+        fmt = options.get('format') or 'table'
+        writer = {'table': self._list_table, 'json': self._list_json,
+                  'ndjson': self._list_ndjson, 'csv': self._list_csv}[fmt]
+        writer(rows)
+
+    def _list_payload(self, row, archived):
+        """Same shape as the JSON API (accounts.changes.task_payload)."""
+        task = dict(zip(self.LIST_FIELDS, row))
+        task['due_date'], task['due_time'] = str(task['due_date']), str(task['due_time'])
+        if archived:
+            task['archived'] = True
+        return task
+
+    def _buffered(self, chunks):
+        """Write string chunks to stdout in LIST_FLUSH_BYTES blocks."""
+        buf, size = [], 0
+        for chunk in chunks:
+            buf.append(chunk)
+            size += len(chunk)
+            if size >= self.LIST_FLUSH_BYTES:
+                self.stdout.write(''.join(buf), ending='')
+                self.stdout.flush()
+                buf, size = [], 0
+        if buf:
+            self.stdout.write(''.join(buf), ending='')
+        self.stdout.flush()
+
+    def _list_table(self, rows):
+        totals = {'all': 0, 'completed': 0}
+
+        def lines():
+            for (task_id, name, project, priority, due_date, due_time, completed, is_recurring), archived in rows:
+                if not totals['all']:
+                    yield (f"\n{Colors.BOLD}{'ID':<5} {'Name':<22} {'Project':<12} {'Priority':<8} {'Due':<18} {'Status':<8} {'Rec'}{Colors.END}\n"
+                           f"{Colors.BLUE}{'─' * 85}{Colors.END}\n")
+                totals['all'] += 1
+                totals['completed'] += completed
+                status_icon = f"{Colors.GREEN}✅" if completed else f"{Colors.YELLOW}⏳"
+                priority_color = Colors.RED if priority == 'High' else (Colors.YELLOW if priority == 'Medium' else Colors.GREEN)
+                recurring_icon = "🔄" if is_recurring else "  "
+                if archived:
+                    recurring_icon += " 📦"
+
+                name = name[:19] + "..." if len(name) > 22 else name
+                project = project[:9] + "..." if len(project) > 12 else project
+                due = f"{due_date} {str(due_time)[:5]}"
+
+                yield f"{task_id:<5} {name:<22} {project:<12} {priority_color}{priority:<8}{Colors.END} {due:<18} {status_icon}{Colors.END}  {recurring_icon}\n"
+
+        self._buffered(lines())
+        if not totals['all']:
             self.stdout.write(f"{Colors.YELLOW}⚠️ No tasks found.{Colors.END}")
             return
-
-        self.stdout.write(f"\n{Colors.BOLD}{'ID':<5} {'Name':<22} {'Project':<12} {'Priority':<8} {'Due':<18} {'Status':<8} {'Rec'}{Colors.END}")
-        self.stdout.write(f"{Colors.BLUE}{'─' * 85}{Colors.END}")
-        
-        for task in tasks:
-            status_icon = f"{Colors.GREEN}✅" if task.completed else f"{Colors.YELLOW}⏳"
-            priority_color = Colors.RED if task.priority == 'High' else (Colors.YELLOW if task.priority == 'Medium' else Colors.GREEN)
-            recurring_icon = "🔄" if task.is_recurring else "  "
-            
-            name = task.name[:19] + "..." if len(task.name) > 22 else task.name
-            project = task.project[:9] + "..." if len(task.project) > 12 else task.project
-            due = f"{task.due_date} {str(task.due_time)[:5]}"
-            
-            self.stdout.write(f"{task.id:<5} {name:<22} {project:<12} {priority_color}{task.priority:<8}{Colors.END} {due:<18} {status_icon}{Colors.END}  {recurring_icon}")
-        
-        self.stdout.write(f"\n{Colors.CYAN}Total: {tasks.count()} task(s){Colors.END}")
+        self.stdout.write(f"\n{Colors.CYAN}Total: {totals['all']} task(s) "
+                          f"({totals['completed']} completed, {totals['all'] - totals['completed']} pending){Colors.END}")
+
+    def _list_json(self, rows):
+        def chunks():
+            total = completed = 0
+            yield '{"tasks": ['
+            for row, archived in rows:
+                yield (', ' if total else '') + json.dumps(self._list_payload(row, archived))
+                total += 1
+                completed += row[6]
+            yield f'], "total": {total}, "completed": {completed}, "pending": {total - completed}}}\n'
+
+        self._buffered(chunks())
+
+    def _list_ndjson(self, rows):
+        self._buffered(json.dumps(self._list_payload(row, archived)) + '\n' for row, archived in rows)
+
+    def _list_csv(self, rows):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+
+        def chunks():
+            writer.writerow(self.LIST_FIELDS + ('archived',))
+            for row, archived in rows:
+                writer.writerow(row + (archived,))
+                if buf.tell() >= self.LIST_FLUSH_BYTES:
+                    yield buf.getvalue()
+                    buf.seek(0)
+                    buf.truncate()
+            yield buf.getvalue()
+
+        self._buffered(chunks())
 
     def add_task(self, options):
         try:
@@ -562,20 +771,25 @@ class Command(BaseCommand):
                 dates_to_create.append(start_date)
 
             is_recurring_flag = recurrence != 'none'
-            created_ids = []
-
-            for d in dates_to_create:
-                task = Task.objects.create(
-                    user=user,
-                    name=options['name'],
-                    project=options['project'],
-                    priority=options['priority'],
-                    due_date=d,
-                    due_time=due_time,
-                    completed=False,
-                    is_recurring=is_recurring_flag
-                )
-                created_ids.append(task.id)
+            series_id = new_series_id(recurrence)
+
+            with transaction.atomic():
+                created = [
+                    Task.objects.create(
+                        user=user,
+                        name=options['name'],
+                        project=options['project'],
+                        priority=options['priority'],
+                        due_date=d,
+                        due_time=due_time,
+                        completed=False,
+                        is_recurring=is_recurring_flag,
+                        series_id=series_id
+                    )
+                    for d in dates_to_create
+                ]
+                record_created(created)
+            created_ids = [task.id for task in created]
 
             if len(created_ids) == 1:
                 self.stdout.write(f"{Colors.GREEN}✅ Task '{options['name']}' created with ID {created_ids[0]}{Colors.END}")
@@ -588,8 +802,7 @@ class Command(BaseCommand):
     def complete_task(self, task_id):
         try:
             task = Task.objects.get(id=task_id)
-            task.completed = True
-            task.save()
+            update_task(task.id, {"completed": True})
             self.stdout.write(f"{Colors.GREEN}✅ Task {task_id} ('{task.name}') marked as complete!{Colors.END}")
         except Task.DoesNotExist:
             self.stdout.write(f"{Colors.RED}❌ Task with ID {task_id} not found.{Colors.END}")
@@ -597,29 +810,20 @@ class Command(BaseCommand):
     def pending_task(self, task_id):
         try:
             task = Task.objects.get(id=task_id)
-            task.completed = False
-            task.save()
+            update_task(task.id, {"completed": False})
             self.stdout.write(f"{Colors.YELLOW}⏳ Task {task_id} ('{task.name}') marked as pending.{Colors.END}")
         except Task.DoesNotExist:
             self.stdout.write(f"{Colors.RED}❌ Task with ID {task_id} not found.{Colors.END}")
 
     def edit_task(self, options):
         try:
-            task = Task.objects.get(id=options['task_id'])
-            
-            if options.get('name'):
-                task.name = options['name']
-            if options.get('project'):
-                task.project = options['project']
-            if options.get('priority'):
-                task.priority = options['priority']
-            if options.get('due_date'):
-                task.due_date = options['due_date']
-            if options.get('due_time'):
-                task.due_time = options['due_time']
-            
-            task.save()
-            self.stdout.write(f"{Colors.GREEN}✅ Task {options['task_id']} updated successfully!{Colors.END}")
+            changed = {f: options[f] for f in EDIT_FIELDS if options.get(f)}
+            version = update_task(options['task_id'], changed, version=options.get('if_version'))
+            self.stdout.write(f"{Colors.GREEN}✅ Task {options['task_id']} updated successfully! (version {version}){Colors.END}")
+        except VersionConflict as e:
+            self.stdout.write(f"{Colors.RED}❌ {e}; nothing was changed.{Colors.END}")
+            self.stdout.write(f"   Now: {e.task.name} | {e.task.project} | {e.task.priority} | "
+                              f"{e.task.due_date} {e.task.due_time:%H:%M}")
         except Task.DoesNotExist:
             self.stdout.write(f"{Colors.RED}❌ Task with ID {options['task_id']} not found.{Colors.END}")
         except Exception as e:
@@ -629,7 +833,183 @@ class Command(BaseCommand):
         try:
             task = Task.objects.get(id=task_id)
             task_name = task.name
-            task.delete()
+            with transaction.atomic():
+                record_change(task.user_id, task.id, 'deleted')
+                task.delete()
             self.stdout.write(f"{Colors.GREEN}✅ Task {task_id} ('{task_name}') deleted.{Colors.END}")
         except Task.DoesNotExist:
-            self.stdout.write(f"{Colors.RED}❌ Task with ID {task_id} not found.{Colors.END}")
\ No newline at end of file
+            self.stdout.write(f"{Colors.RED}❌ Task with ID {task_id} not found.{Colors.END}")
+
+    def series_action(self, options):
+        task_id = options['task_id']
+        try:
+            if options['action'] == 'delete':
+                ids = delete_series(task_id)
+                self.stdout.write(f"{Colors.GREEN}✅ Deleted {len(ids)} tasks in the series of task {task_id}.{Colors.END}")
+                return
+            if options['action'] == 'shift':
+                if not options['days']:
+                    self.stdout.write(f"{Colors.RED}❌ Give --days to shift the series by.{Colors.END}")
+                    return
+                changes = {}
+            else:
+                changes = {f: options[f] for f in SERIES_FIELDS if options.get(f)}
+            ids = update_series(task_id, changes, options['days'])
+            self.stdout.write(f"{Colors.GREEN}✅ Updated {len(ids)} tasks in the series of task {task_id}.{Colors.END}")
+        except Task.DoesNotExist:
+            self.stdout.write(f"{Colors.RED}❌ Task with ID {task_id} not found.{Colors.END}")
+        except ValueError as e:
+            self.stdout.write(f"{Colors.RED}❌ {e}{Colors.END}")
+
+    def run_batch(self, options):
+        import sys
+        from accounts.batch import run_batch
+
+        source = sys.stdin if options['file'] == '-' else open(options['file'])
+        try:
+            stats = run_batch(source, lambda text: self.stdout.write(text, ending=''),
+                              group_size=options['group_size'])
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        rate = stats['commands'] / stats['seconds'] if stats['seconds'] else 0
+        self.stderr.write(f"{stats['commands']} command(s): {stats['ok']} ok, {stats['errors']} failed, "
+                          f"{stats['transactions']} transaction(s) in {stats['seconds']:.2f}s ({rate:,.0f}/s)")
+
+    def archive_tasks(self, options):
+        from accounts.archive import archive_completed, table_size
+
+        def report(label):
+            for model in (Task, ArchivedTask):
+                rows, size = table_size(model)
+                size = f"{size / 1024 / 1024:.1f} MB" if size is not None else "size n/a"
+                self.stdout.write(f"  {label:<7} {model._meta.db_table:<22} {rows:>10} rows  {size}")
+
+        report('before')
+        moved = archive_completed(
+            options['older_than'], batch_size=options['batch_size'], pause=options['pause'],
+            progress=lambda n: self.stdout.write(f"{Colors.BLUE}  ... {n} task(s) archived{Colors.END}"),
+        )
+        report('after')
+        self.stdout.write(f"{Colors.GREEN}✅ Archived {moved} completed task(s) due more than {options['older_than']} days ago.{Colors.END}")
+
+    def run_worker(self, options):
+        from accounts.jobs import run_workers
+
+        if not options.get('once'):
+            self.stdout.write(f"{Colors.CYAN}⚙️  Job worker running with {options['concurrency']} thread(s) (Ctrl+C to stop){Colors.END}")
+        try:
+            processed = run_workers(options['concurrency'], once=options.get('once'))
+        except KeyboardInterrupt:
+            self.stdout.write(f"\n{Colors.YELLOW}👋 Worker stopped.{Colors.END}")
+            return
+        self.stdout.write(f"{Colors.GREEN}✅ Processed {processed} job(s).{Colors.END}")
+
+    def seed_data(self, options):
+        from accounts.seed import seed
+
+        total = options['users'] * options['tasks_per_user']
+        self.stdout.write(f"{Colors.CYAN}🌱 Seeding {options['users']} user(s) x {options['tasks_per_user']} task(s){Colors.END}")
+        try:
+            stats = seed(
+                users=options['users'], tasks_per_user=options['tasks_per_user'],
+                random_seed=options['random_seed'], prefix=options['prefix'],
+                priorities=options['priorities'], projects=options['projects'],
+                completed=options['completed'], recurring=options['recurring'],
+                days_back=options['days_back'], days_ahead=options['days_ahead'],
+                batch_size=options['batch_size'], method=options['method'],
+                progress=lambda n: self.stdout.write(f"{Colors.BLUE}  ... {n}/{total} tasks{Colors.END}"),
+            )
+        except ValueError as e:
+            self.stdout.write(f"{Colors.RED}❌ {e}{Colors.END}")
+            return
+        self.stdout.write(f"  users: {stats['users']} in {stats['user_seconds']:.2f}s")
+        self.stdout.write(f"  tasks: {stats['tasks']} in {stats['task_seconds']:.2f}s via {stats['method']} "
+                          f"({stats['rows_per_second']:,.0f} rows/s)")
+        self.stdout.write(f"{Colors.GREEN}✅ Seeded {stats['users']} user(s) and {stats['tasks']} task(s).{Colors.END}")
+
+    def slow_queries(self, options):
+        from django.db.models import Avg, Count, Max
+        from accounts.models import SlowQuery
+
+        shapes = (SlowQuery.objects.values('sql_hash')
+                  .annotate(count=Count('id'), avg_ms=Avg('duration_ms'), max_ms=Max('duration_ms'), last_id=Max('id'))
+                  .order_by('-max_ms')[:options['limit']])
+        if not shapes:
+            self.stdout.write(f"{Colors.YELLOW}⚠️ No slow queries recorded (set DJANGO_SLOW_QUERY_SINK=table).{Colors.END}")
+            return
+
+        latest = SlowQuery.objects.in_bulk([s['last_id'] for s in shapes])
+        for shape in shapes:
+            query = latest[shape['last_id']]
+            self.stdout.write(f"\n{Colors.BOLD}{shape['count']}x  avg {shape['avg_ms']:.1f} ms  max {shape['max_ms']:.1f} ms{Colors.END}  {Colors.CYAN}{query.call_site}{Colors.END}")
+            self.stdout.write(f"  {query.sql}")
+            if options.get('plans') and query.plan:
+                self.stdout.write(f"{Colors.BLUE}  {query.plan}{Colors.END}")
+
+    def productivity_report(self, options):
+        from accounts.analytics import report
+
+        if not 1 <= options['weeks'] <= settings.ANALYTICS_MAX_WEEKS:
+            self.stdout.write(f"{Colors.RED}❌ --weeks must be 1 to {settings.ANALYTICS_MAX_WEEKS}.{Colors.END}")
+            return
+        try:
+            user = User.objects.get(username=options['user'])
+            data = report(user, options['weeks'], engine=options.get('engine'))
+        except User.DoesNotExist:
+            self.stdout.write(f"{Colors.RED}❌ User '{options['user']}' not found.{Colors.END}")
+            return
+        except ValueError as e:
+            self.stdout.write(f"{Colors.RED}❌ {e}.{Colors.END}")
+            return
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(data))
+            return
+
+        pct = lambda rate: f"{rate:.0%}" if rate is not None else "-"
+        self.stdout.write(f"\n{Colors.CYAN}{Colors.BOLD}📈 {user.username}: tasks due {data['from']} to {data['to']}{Colors.END}")
+        self.stdout.write(f"\n{Colors.BOLD}{'Week of':<12} {'Due':>6} {'Done':>6} {'Rate':>6}{Colors.END}")
+        for week in data['weeks']:
+            bar = '█' * round((week['rate'] or 0) * 20)
+            self.stdout.write(f"{week['week']:<12} {week['due']:>6} {week['completed']:>6} {pct(week['rate']):>6} {Colors.GREEN}{bar}{Colors.END}")
+
+        timeliness = data['timeliness']
+        self.stdout.write(f"\n{Colors.BOLD}On time:{Colors.END} {timeliness['on_time']}   {Colors.BOLD}Late:{Colors.END} {timeliness['late']}"
+                          f"   {Colors.BOLD}Unknown:{Colors.END} {timeliness['unknown']}   {Colors.RED}Overdue (open): {timeliness['overdue']}{Colors.END}")
+        self.stdout.write("Days late: " + ", ".join(f"{label}: {n}" for label, n in timeliness['late_days'].items()))
+
+        self.stdout.write(f"\n{Colors.BOLD}{'Project':<20} {'Due':>6} {'Done':>6} {'Rate':>6} {'Per week':>9}{Colors.END}")
+        for project in data['projects']:
+            self.stdout.write(f"{project['project'][:20]:<20} {project['due']:>6} {project['completed']:>6} "
+                              f"{pct(project['rate']):>6} {project['per_week']:>9.1f}")
+
+    def profile_token(self, options):
+        from accounts.profiling import make_token
+
+        try:
+            user = User.objects.get(username=options['user'], is_staff=True)
+        except User.DoesNotExist:
+            self.stdout.write(f"{Colors.RED}❌ Staff user '{options['user']}' not found.{Colors.END}")
+            return
+        self.stdout.write(make_token(user))
+
+    def run_scheduler(self, options):
+        from accounts.reminders import ReminderScheduler, get_sink
+
+        sink_options = {}
+        if options.get('file'):
+            sink_options['path'] = options['file']
+        if options.get('url'):
+            sink_options['url'] = options['url']
+        scheduler = ReminderScheduler(get_sink(options.get('sink'), **sink_options))
+
+        if options.get('once'):
+            sent = scheduler.run(once=True)
+            self.stdout.write(f"{Colors.GREEN}✅ Sent {sent} reminder(s).{Colors.END}")
+            return
+
+        self.stdout.write(f"{Colors.CYAN}⏰ Reminder scheduler running as {scheduler.holder} (Ctrl+C to stop){Colors.END}")
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            self.stdout.write(f"\n{Colors.YELLOW}👋 Scheduler stopped.{Colors.END}")
@@ -0,0 +1,276 @@
+"""
+Request Metrics for TaskCLI
+===========================
+MetricsMiddleware records, per URL name from accounts/urls.py:
+
+- request count by method and status
+- latency histogram
+- response size histogram
+- DB queries per request (histogram) and total DB time
+
+`/metrics` serves them in the Prometheus text format. It needs a staff
+session or `Authorization: Bearer $DJANGO_METRICS_TOKEN`.
+
+Each gunicorn worker keeps its own counters. When METRICS_DIR is set, a
+background thread in every process writes a snapshot to
+`<METRICS_DIR>/<pid>.json` every METRICS_FLUSH_SECONDS while it has new
+samples, and `/metrics` sums all snapshots, so a scrape that lands on any worker
+sees the whole server. Without METRICS_DIR only the serving process is
+reported (fine for runserver or a single worker).
+
+Author: TaskCLI Team
+"""
+
+import atexit
+import hmac
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'taskcli_http_requests_total': ('counter', 'HTTP requests by route, method and status.', None),
+    'taskcli_http_request_duration_seconds': ('histogram', 'Time to produce a response.', LATENCY_BUCKETS),
+    'taskcli_http_response_size_bytes': ('histogram', 'Response body size (streaming responses excluded).', SIZE_BUCKETS),
+    'taskcli_db_queries_per_request': ('histogram', 'Database queries run per request.', QUERY_BUCKETS),
+    'taskcli_db_query_duration_seconds_total': ('counter', 'Time spent in database queries.', None),
+}
+
+# [queries, seconds] of the request being handled; a context variable so the
+# count follows an async request into the threads running its sync code
+_request_db = ContextVar('taskcli_request_db', default=None)
+
+_lock = threading.Lock()
+_samples = {}  # (metric, labels) -> value (counter) or [bucket counts..., sum, count] (histogram)
+_dirty = False
+_flusher_pid = None
+
+
+def observe(metric, labels, value):
+    """Add `value` to a counter, or record it in a histogram."""
+    kind, _, buckets = METRICS[metric]
+    global _dirty
+    key = (metric, tuple(sorted(labels.items())))
+    with _lock:
+        _dirty = True
+        if kind == 'counter':
+            _samples[key] = _samples.get(key, 0) + value
+        else:
+            sample = _samples.get(key)
+            if sample is None:
+                sample = _samples[key] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    sample[i] += 1
+                    break
+            sample[-2] += value
+            sample[-1] += 1
+
+
+# =============================================================================
+# MULTIPROCESS SNAPSHOTS
+# =============================================================================
+
+def _snapshot_path(pid):
+    return os.path.join(settings.METRICS_DIR, f"{pid}.json")
+
+
+def flush():
+    """Write this process's samples to METRICS_DIR if they changed since the last write."""
+    global _dirty
+    if not settings.METRICS_DIR:
+        return
+    with _lock:
+        if not _dirty:
+            return
+        _dirty = False
+        data = [[metric, list(labels), value] for (metric, labels), value in _samples.items()]
+    path = _snapshot_path(os.getpid())
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _flush_forever():
+    while True:
+        time.sleep(settings.METRICS_FLUSH_SECONDS)
+        flush()
+
+
+def start_flusher():
+    """Start the snapshot thread once per process (gunicorn forks after import)."""
+    global _flusher_pid
+    if not settings.METRICS_DIR or _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_forever, name='taskcli-metrics-flush', daemon=True).start()
+
+
+atexit.register(flush)
+
+
+def collect():
+    """Samples for all processes: live values for this one, snapshots for the others."""
+    with _lock:
+        merged = {key: list(value) if isinstance(value, list) else value for key, value in _samples.items()}
+    if not settings.METRICS_DIR or not os.path.isdir(settings.METRICS_DIR):
+        return merged
+
+    own = f"{os.getpid()}.json"
+    for name in os.listdir(settings.METRICS_DIR):
+        if not name.endswith('.json') or name == own:
+            continue
+        try:
+            with open(os.path.join(settings.METRICS_DIR, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for metric, labels, value in data:
+            key = (metric, tuple(tuple(pair) for pair in labels))
+            if key not in merged:
+                merged[key] = value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(merged[key], value)]
+            else:
+                merged[key] += value
+    return merged
+
+
+# =============================================================================
+# EXPOSITION
+# =============================================================================
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def render_text(samples):
+    """Render samples in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for (name, labels), value in sorted(samples.items()):
+            if name != metric:
+                continue
+            if kind == 'counter':
+                lines.append(f"{metric}{_labels(labels)} {value:g}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(labels, [('le', f'{bound:g}')])} {cumulative}")
+            lines.append(f"{metric}_bucket{_labels(labels, [('le', '+Inf')])} {value[-1]}")
+            lines.append(f"{metric}_sum{_labels(labels)} {value[-2]:g}")
+            lines.append(f"{metric}_count{_labels(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """Serve all metrics to a staff user or a client holding METRICS_TOKEN."""
+    token = settings.METRICS_TOKEN
+    auth = request.META.get('HTTP_AUTHORIZATION', '')
+    authorized = bool(token) and hmac.compare_digest(auth, f"Bearer {token}")
+    if not authorized and not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponse("Forbidden\n", status=403, content_type='text/plain')
+    return HttpResponse(render_text(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# =============================================================================
+# MIDDLEWARE
+# =============================================================================
+
+def count_queries(execute, sql, params, many, context):
+    """Execute wrapper adding each query to the current request's count."""
+    db = _request_db.get()
+    if db is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        db[0] += 1
+        db[1] += time.perf_counter() - start
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """`connection_created` handler: add count_queries once per connection."""
+    if settings.METRICS_ENABLED and count_queries not in connection.execute_wrappers:
+        # Insert first: scoped execute_wrapper() contexts (profiling) pop the last entry
+        connection.execute_wrappers.insert(0, count_queries)
+
+
+class MetricsMiddleware:
+    """
+    Time each request and count its DB queries across all connections.
+
+    Async-capable, so under ASGI requests (and the SSE change feed) are not
+    adapted to sync and back at this layer.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        start_flusher()
+        db = [0, 0.0]  # queries, seconds
+        token = _request_db.set(db)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_db.reset(token)
+        self.record(request, response, time.perf_counter() - start, db)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        start_flusher()
+        db = [0, 0.0]
+        token = _request_db.set(db)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_db.reset(token)
+        self.record(request, response, time.perf_counter() - start, db)
+        return response
+
+    @staticmethod
+    def record(request, response, elapsed, db):
+        match = getattr(request, 'resolver_match', None)
+        route = {'route': (match.url_name or match.view_name) if match else 'unmatched'}
+        observe('taskcli_http_requests_total',
+                {**route, 'method': request.method, 'status': str(response.status_code)}, 1)
+        observe('taskcli_http_request_duration_seconds', route, elapsed)
+        observe('taskcli_db_queries_per_request', route, db[0])
+        observe('taskcli_db_query_duration_seconds_total', route, db[1])
+        if not response.streaming:
+            observe('taskcli_http_response_size_bytes', route, len(response.content))
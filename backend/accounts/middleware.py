@@ -0,0 +1,116 @@
+"""
+Middleware for TaskCLI Web Application
+======================================
+Request-level helpers shared by all web views.
+
+CachedAuthenticationMiddleware is a drop-in replacement for Django's
+AuthenticationMiddleware that serves the logged-in User from the cache,
+so a warm authenticated request does not query `auth_user`. It only caches
+when USER_CACHE_TIMEOUT is set, which by default requires a shared cache
+backend; otherwise it behaves exactly like auth.get_user().
+
+AsyncWhiteNoiseMiddleware lets WhiteNoise (sync-only as of 6.x) sit in an
+async middleware chain, so under ASGI only static file requests leave the
+event loop.
+
+Author: TaskCLI Team
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+def user_cache_key(user_id):
+    """Cache key holding the User object for `user_id`."""
+    return f"taskcli:user:{user_id}"
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    """`post_save`/`post_delete` handler: drop the cached copy of a User."""
+    cache.delete(user_cache_key(instance.pk))
+
+
+def _session_matches(request, user):
+    """Check the cached user against the session like auth.get_user() does."""
+    backend_path = request.session.get(BACKEND_SESSION_KEY)
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if backend_path not in settings.AUTHENTICATION_BACKENDS or not session_hash:
+        return False
+    if not constant_time_compare(session_hash, user.get_session_auth_hash()):
+        return False
+    user.backend = backend_path
+    return True
+
+
+def get_cached_user(request):
+    """
+    Return the request's user, loading it from the cache when possible.
+
+    The cached User is only trusted if the session's auth hash still
+    matches it; otherwise (and on a cache miss) Django's full
+    auth.get_user() runs and the result is cached for USER_CACHE_TIMEOUT.
+    A password or profile change saves the User, which invalidates the
+    cache entry (see invalidate_cached_user).
+    """
+    if hasattr(request, '_cached_user'):
+        return request._cached_user
+    if settings.USER_CACHE_TIMEOUT <= 0:
+        request._cached_user = auth.get_user(request)
+        return request._cached_user
+
+    user_id = request.session.get(SESSION_KEY)
+    user = None
+    if user_id is not None:
+        key = user_cache_key(user_id)
+        cached = cache.get(key)
+        if cached is not None and _session_matches(request, cached):
+            user = cached
+
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(user_cache_key(user.pk), user, settings.USER_CACHE_TIMEOUT)
+
+    request._cached_user = user
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that resolves request.user via get_cached_user()."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoiseMiddleware that also runs in async mode; files are served from a thread."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)  # DEBUG: looks at the disk
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_task_is_recurring'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['due_date', 'due_time'], 'verbose_name': 'Task', 'verbose_name_plural': 'Tasks'},
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='completed',
+            field=models.BooleanField(default=False, help_text='Is task completed?'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateField(help_text='Task due date'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='due_time',
+            field=models.TimeField(help_text='Task due time'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='is_recurring',
+            field=models.BooleanField(default=False, help_text='Is this a recurring task?'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='name',
+            field=models.CharField(help_text='Task title', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=models.CharField(choices=[('High', 'High'), ('Medium', 'Medium'), ('Low', 'Low')], default='Medium', help_text='Task priority level', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='project',
+            field=models.CharField(help_text='Project/category name', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='user',
+            field=models.ForeignKey(help_text='The user who owns this task', on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='TaskChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField(help_text='ID of the changed task')),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10)),
+                ('data', models.JSONField(blank=True, default=dict, help_text='Changed fields')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(help_text='The user who owns the changed task', on_delete=django.db.models.deletion.CASCADE, related_name='task_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['user', 'id'], name='accounts_ta_user_id_d027cc_idx')],
+            },
+        ),
+    ]
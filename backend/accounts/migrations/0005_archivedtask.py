@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_scheduler'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(help_text='Original Task ID', primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('project', models.CharField(max_length=255)),
+                ('priority', models.CharField(choices=[('High', 'High'), ('Medium', 'Medium'), ('Low', 'Low')], default='Medium', max_length=10)),
+                ('due_date', models.DateField()),
+                ('due_time', models.TimeField()),
+                ('completed', models.BooleanField(default=True)),
+                ('is_recurring', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(help_text='The user who owns this task', on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Task',
+                'verbose_name_plural': 'Archived Tasks',
+                'ordering': ['due_date', 'due_time'],
+                'indexes': [models.Index(fields=['user', 'due_date'], name='accounts_ar_user_id_1be094_idx')],
+            },
+        ),
+    ]
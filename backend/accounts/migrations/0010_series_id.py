@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_task_user_due_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtask',
+            name='series_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='series_id',
+            field=models.UUIDField(blank=True, help_text='Shared by the tasks of one recurrence', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('series_id__isnull', False)), fields=['series_id'], name='task_series_idx'),
+        ),
+    ]
@@ -26,7 +26,10 @@ class Task(models.Model):
         due_date (date): When the task is due
         due_time (time): Specific time the task is due
         completed (bool): Whether the task is marked as done
+        completed_at (datetime): When it was first marked done (None while pending)
         is_recurring (bool): If task was created as part of a recurring set
+        series_id (UUID): Shared by all tasks of one recurring set (None for single tasks)
+        version (int): Incremented by every write; edits can require a version (accounts/concurrency.py)
         created_at (datetime): Timestamp of task creation (auto-set)
     """
     
@@ -62,7 +65,10 @@ class Task(models.Model):
     
     # Status flags
     completed = models.BooleanField(default=False, help_text="Is task completed?")
+    completed_at = models.DateTimeField(null=True, blank=True, help_text="When the task was completed")
     is_recurring = models.BooleanField(default=False, help_text="Is this a recurring task?")
+    series_id = models.UUIDField(null=True, blank=True, help_text="Shared by the tasks of one recurrence")
+    version = models.PositiveIntegerField(default=1, help_text="Bumped by every write (optimistic concurrency)")
     
     # Timestamp (auto-set on creation)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -72,6 +78,18 @@ class Task(models.Model):
         ordering = ['due_date', 'due_time']  # Default ordering by due date/time
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
+        indexes = [
+            # Reminder scheduler: range scan over upcoming pending deadlines
+            models.Index(
+                fields=['due_date', 'due_time'],
+                condition=models.Q(completed=False),
+                name='task_pending_due_idx',
+            ),
+            # Calendar view: one user's tasks between two dates, in due order
+            models.Index(fields=['user', 'due_date', 'due_time'], name='task_user_due_idx'),
+            # Series operations (accounts/series.py): all tasks of one recurrence
+            models.Index(fields=['series_id'], condition=models.Q(series_id__isnull=False), name='task_series_idx'),
+        ]
 
     def __str__(self):
         """String representation for admin and debugging."""
@@ -82,3 +100,243 @@ class Task(models.Model):
         """Check if task is past its due date."""
         from datetime import date
         return not self.completed and self.due_date < date.today()
+
+
+class ArchivedTask(models.Model):
+    """
+    ArchivedTask Model - Cold storage for old completed tasks.
+
+    `task_cli archive --older-than N` moves completed tasks due more than N
+    days ago out of `accounts_task` in small batches (see accounts/archive.py),
+    keeping the hot table and its indexes sized to pending and recent work.
+    Rows keep their original ID so API clients' references stay valid.
+
+    Attributes:
+        Same as Task, plus:
+        archived_at (datetime): When the task was moved to the archive
+    """
+
+    id = models.BigIntegerField(primary_key=True, help_text="Original Task ID")
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_tasks',
+        help_text="The user who owns this task"
+    )
+    name = models.CharField(max_length=255)
+    project = models.CharField(max_length=255)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES, default='Medium')
+    due_date = models.DateField()
+    due_time = models.TimeField()
+    completed = models.BooleanField(default=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    is_recurring = models.BooleanField(default=False)
+    series_id = models.UUIDField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta options for ArchivedTask model."""
+        ordering = ['due_date', 'due_time']
+        verbose_name = 'Archived Task'
+        verbose_name_plural = 'Archived Tasks'
+        indexes = [models.Index(fields=['user', 'due_date'])]  # include_archived listings
+
+    def __str__(self):
+        """String representation for admin and debugging."""
+        return f"{self.name} ({self.user.username}, archived)"
+
+
+class TaskChange(models.Model):
+    """
+    TaskChange Model - Append-only log of task mutations.
+
+    A row is written in the same transaction as every task create, update
+    and delete (see accounts/changes.py). The change feed streams these rows
+    to the dashboard and CLI clients; the row ID doubles as the SSE event ID
+    so clients can resume with Last-Event-ID.
+
+    Attributes:
+        user (ForeignKey): Owner of the changed task
+        task_id (int): ID of the changed task (kept after the task is deleted)
+        action (str): created, updated or deleted
+        data (dict): Changed fields (full task for created, empty for deleted)
+        created_at (datetime): When the change was recorded
+    """
+
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='task_changes',
+        help_text="The user who owns the changed task"
+    )
+    task_id = models.BigIntegerField(help_text="ID of the changed task")
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    data = models.JSONField(default=dict, blank=True, help_text="Changed fields")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta options for TaskChange model."""
+        ordering = ['id']
+        indexes = [models.Index(fields=['user', 'id'])]  # Feed query: user's changes after an ID
+
+    def __str__(self):
+        """String representation for admin and debugging."""
+        return f"{self.action} task {self.task_id}"
+
+
+class SchedulerLease(models.Model):
+    """
+    SchedulerLease Model - Leader lease and progress for the reminder scheduler.
+
+    Only the replica holding an unexpired lease fires reminders, so running
+    `task_cli scheduler` on several hosts never double-fires.
+
+    Attributes:
+        name (str): Scheduler name (one lease per scheduler)
+        holder (str): Identifier of the current leader process
+        expires_at (datetime): Lease expiry; another process may take over after it
+        cursor (datetime): Reminders due at or before this instant have been fired
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    holder = models.CharField(max_length=255, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    cursor = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        """String representation for admin and debugging."""
+        return f"{self.name} ({self.holder or 'free'})"
+
+
+class Job(models.Model):
+    """
+    Job Model - A unit of background work for `task_cli worker`.
+
+    Slow operations (large recurrence expansions, bulk updates) are queued
+    here instead of running inside the request; workers claim queued rows
+    with SELECT ... FOR UPDATE SKIP LOCKED on PostgreSQL and a conditional
+    UPDATE on SQLite (see accounts/jobs.py).
+
+    Attributes:
+        kind (str): Registered handler name, e.g. 'create_tasks'
+        user (ForeignKey): User the job acts for (status is only shown to them)
+        payload (dict): Handler arguments
+        status (str): queued, running, done or failed
+        result (dict): Handler return value once done
+        error (str): Last error message
+        attempts (int): Number of times a worker has started the job
+        locked_by (str): Worker running the job
+        locked_at (datetime): When the current attempt started
+        created_at / finished_at (datetime): Lifecycle timestamps
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='jobs',
+        help_text="The user this job acts for"
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """Meta options for Job model."""
+        ordering = ['id']
+        indexes = [models.Index(fields=['status', 'id'])]  # Claim query: oldest queued job
+
+    def __str__(self):
+        """String representation for admin and debugging."""
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    IdempotencyKey Model - Stored first response for an Idempotency-Key header.
+
+    Mutation APIs decorated with @idempotent (accounts/idempotency.py) save
+    their response here in the same transaction as the mutation, so a client
+    that retries after a timeout gets the original response instead of a
+    duplicate task. Rows expire after IDEMPOTENCY_TTL_SECONDS.
+
+    Attributes:
+        key (str): Client-supplied Idempotency-Key header
+        path (str): Request path the key was used on
+        request_hash (str): SHA-256 of the request body (detects key reuse)
+        status_code (int): Stored response status; null while the first request runs
+        response_body (str): Stored response body
+        created_at (datetime): When the key was first seen
+    """
+
+    key = models.CharField(max_length=255)
+    path = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # TTL purge
+
+    class Meta:
+        """Meta options for IdempotencyKey model."""
+        constraints = [models.UniqueConstraint(fields=['path', 'key'], name='idempotency_path_key_uniq')]
+
+    def __str__(self):
+        """String representation for admin and debugging."""
+        return f"{self.key} ({self.path})"
+
+
+class SlowQuery(models.Model):
+    """
+    SlowQuery Model - A database query that exceeded SLOW_QUERY_MS.
+
+    Written by the slow-query log (accounts/slowlog.py) when SLOW_QUERY_SINK
+    is 'table'; `task_cli slow-queries` groups rows by normalized SQL.
+
+    Attributes:
+        duration_ms (float): Query execution time
+        sql (str): Normalized SQL (literals replaced with ?)
+        sql_hash (str): SHA-1 of the normalized SQL, for grouping
+        call_site (str): Innermost accounts/ frame that ran the query
+        database (str): Database alias
+        plan (str): EXPLAIN output, if SLOW_QUERY_EXPLAIN is on
+        created_at (datetime): When the query ran
+    """
+
+    duration_ms = models.FloatField()
+    sql = models.TextField()
+    sql_hash = models.CharField(max_length=40, db_index=True)
+    call_site = models.CharField(max_length=255)
+    database = models.CharField(max_length=50, default='default')
+    plan = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta options for SlowQuery model."""
+        ordering = ['-created_at']
+
+    def __str__(self):
+        """String representation for admin and debugging."""
+        return f"{self.duration_ms:.1f} ms at {self.call_site}"
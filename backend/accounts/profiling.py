@@ -0,0 +1,198 @@
+"""
+On-Demand Profiling for TaskCLI
+===============================
+Profiles a single web request or `task_cli` command and reports where the
+time went: Python call stacks plus every SQL statement with its duration.
+
+Web requests (needs DJANGO_PROFILING=true; otherwise the middleware removes
+itself at startup and costs nothing):
+
+    python manage.py task_cli profile-token --user admin@example.com
+    curl -b sessionid=... "https://myapp.com/dashboard/?profile=<token>"
+    curl -b sessionid=... -H "X-TaskCLI-Profile: <token>" ".../api/tasks/?email=..."
+
+The token is signed with SECRET_KEY, expires after PROFILING_TOKEN_MAX_AGE
+and only works for the staff user it was issued to. The profile is saved
+to PROFILING_DIR and its name returned in the `X-Profile` header; add
+`&profile_output=text` to get the report instead of the page.
+
+CLI commands:
+
+    python manage.py task_cli --profile list --user someone@example.com
+
+Uses pyinstrument (sampling, low overhead) when it is installed and
+PROFILER is 'auto', otherwise cProfile.
+
+Author: TaskCLI Team
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+
+SALT = 'taskcli.profiling'
+HEADER = 'HTTP_X_TASKCLI_PROFILE'
+
+
+def make_token(user):
+    """Signed profiling token for a staff user."""
+    return signing.dumps({'user': user.pk}, salt=SALT)
+
+
+def token_user_id(token):
+    """User ID a valid, unexpired token was issued to, or None."""
+    try:
+        return signing.loads(token, salt=SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE)['user']
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+
+
+def _sampling_profiler():
+    """pyinstrument Profiler class if it should be used, else None."""
+    if settings.PROFILER != 'auto':
+        return None
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return None
+    return Profiler
+
+
+class Profile:
+    """
+    Context manager that profiles its body and records SQL timings.
+
+    After exit, `report()` returns a text report and `save(label)` writes
+    it (plus a .prof file for cProfile) to PROFILING_DIR.
+    """
+
+    def __init__(self):
+        self.queries = []  # (seconds, sql)
+        self.elapsed = 0.0
+        sampler = _sampling_profiler()
+        self.sampler = sampler() if sampler else None
+        self.cprofile = None if self.sampler else cProfile.Profile()
+        self._stack = ExitStack()
+
+    def _record_sql(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - start, sql))
+
+    def __enter__(self):
+        for conn in connections.all():
+            self._stack.enter_context(conn.execute_wrapper(self._record_sql))
+        self._start = time.perf_counter()
+        if self.sampler:
+            self.sampler.start()
+        else:
+            self.cprofile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.sampler:
+            self.sampler.stop()
+        else:
+            self.cprofile.disable()
+        self.elapsed = time.perf_counter() - self._start
+        self._stack.close()
+        return False
+
+    def report(self, limit=30):
+        """Text report: summary, top functions by cumulative time, SQL statements."""
+        db_time = sum(seconds for seconds, _ in self.queries)
+        out = io.StringIO()
+        out.write(f"Total {self.elapsed * 1000:.1f} ms, {len(self.queries)} queries, "
+                  f"{db_time * 1000:.1f} ms in SQL\n\n")
+        if self.sampler:
+            out.write(self.sampler.output_text(unicode=True))
+        else:
+            pstats.Stats(self.cprofile, stream=out).sort_stats('cumulative').print_stats(limit)
+        out.write("\nSQL (slowest first):\n")
+        for seconds, sql in sorted(self.queries, reverse=True):
+            out.write(f"{seconds * 1000:9.2f} ms  {sql}\n")
+        return out.getvalue()
+
+    def save(self, label):
+        """Write the report (and .prof data) to PROFILING_DIR; returns the base file name."""
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', label)}"
+        base = os.path.join(settings.PROFILING_DIR, name)
+        with open(f"{base}.txt", 'w') as f:
+            f.write(self.report())
+        with open(f"{base}.sql.json", 'w') as f:
+            json.dump([{"ms": round(seconds * 1000, 3), "sql": sql} for seconds, sql in self.queries], f, indent=1)
+        if self.cprofile:
+            self.cprofile.dump_stats(f"{base}.prof")  # open with snakeviz or pstats
+        return name
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests carrying a valid staff profiling token.
+
+    Async-capable: under ASGI, requests without a token pass straight
+    through. A profiled request runs the rest of the chain from a worker
+    thread through async_to_sync, which makes the sync views and queries
+    below it run in that thread, where the profiler is recording.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = request.GET.get('profile') or request.META.get(HEADER)
+        if not token:
+            return self.get_response(request)
+        return self.profile(request, token, self.get_response)
+
+    async def __acall__(self, request):
+        token = request.GET.get('profile') or request.META.get(HEADER)
+        if not token:
+            return await self.get_response(request)
+        return await sync_to_async(self.profile)(request, token, async_to_sync(self.get_response))
+
+    def profile(self, request, token, get_response):
+        """Handle the request with `get_response`, profiled if `token` is allowed."""
+        if not self._allowed(request, token):
+            return get_response(request)
+
+        with Profile() as profile:
+            response = get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        name = profile.save((match.url_name if match else None) or request.path)
+        if request.GET.get('profile_output') == 'text':
+            response = HttpResponse(profile.report(), content_type='text/plain; charset=utf-8')
+        response['X-Profile'] = name
+        response['Server-Timing'] = (f"total;dur={profile.elapsed * 1000:.1f}, "
+                                     f"db;dur={sum(s for s, _ in profile.queries) * 1000:.1f}")
+        return response
+
+    @staticmethod
+    def _allowed(request, token):
+        user = request.user
+        return user.is_authenticated and user.is_staff and token_user_id(token) == user.pk
@@ -0,0 +1,247 @@
+"""
+Due-Time Reminder Scheduler for TaskCLI
+=======================================
+Fires a reminder when a pending task reaches its due date and time.
+Run it with `python manage.py task_cli scheduler`.
+
+The scheduler keeps a min-heap of upcoming distinct due instants, loaded in
+batches from the `task_pending_due_idx` range index, and sleeps until the
+earliest one. At each instant it re-reads the tasks due then (so completed
+or rescheduled tasks are skipped) and hands them to a sink.
+
+Several replicas can run the scheduler: a SchedulerLease row acts as the
+leader lock, taken and renewed with a conditional UPDATE, so only one of
+them fires reminders. The lease also records the last fired instant so a
+new leader resumes where the old one stopped.
+
+Author: TaskCLI Team
+"""
+
+import heapq
+import json
+import logging
+import os
+import socket
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import SchedulerLease, Task
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+
+def reminder_payload(task, due):
+    """JSON-serializable reminder for a task."""
+    return {
+        "task_id": task.id,
+        "user": task.user.username,
+        "name": task.name,
+        "project": task.project,
+        "priority": task.priority,
+        "due": due.isoformat(),
+    }
+
+
+class LogSink:
+    """Write reminders to the `accounts.reminders` logger."""
+
+    def send(self, payload):
+        logger.info("Reminder: task %s '%s' for %s is due at %s",
+                    payload["task_id"], payload["name"], payload["user"], payload["due"])
+
+
+class FileSink:
+    """Append reminders to a local file, one JSON object per line."""
+
+    def __init__(self, path=None):
+        self.path = path or settings.REMINDER_FILE
+
+    def send(self, payload):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload) + "\n")
+
+
+class WebhookSink:
+    """POST each reminder as JSON to a webhook URL. Failures are logged, not raised."""
+
+    def __init__(self, url=None, timeout=5):
+        self.url = url or settings.REMINDER_WEBHOOK_URL
+        self.timeout = timeout
+
+    def send(self, payload):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except (urllib.error.URLError, OSError) as e:
+            logger.warning("Reminder webhook failed for task %s: %s", payload["task_id"], e)
+
+
+SINKS = {
+    'log': LogSink,
+    'file': FileSink,
+    'webhook': WebhookSink,
+}
+
+
+def get_sink(name=None, **options):
+    """Build a sink by short name ('log', 'file', 'webhook') or dotted class path."""
+    name = name or settings.REMINDER_SINK
+    sink_class = SINKS[name] if name in SINKS else import_string(name)
+    return sink_class(**options)
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+def _due_at(due_date, due_time):
+    """Combine a task's due date and time into an aware datetime."""
+    return timezone.make_aware(datetime.combine(due_date, due_time))
+
+
+class ReminderScheduler:
+    """
+    Heap-driven reminder loop guarded by a SchedulerLease.
+
+    `clock` and `sleep` are injectable so tests and benchmarks can drive
+    the loop without waiting in real time.
+    """
+
+    def __init__(self, sink, name='default', clock=timezone.now, sleep=time.sleep):
+        self.sink = sink
+        self.name = name
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self.clock = clock
+        self.sleep = sleep
+
+        self.lookahead = timedelta(minutes=settings.REMINDER_LOOKAHEAD_MINUTES)
+        self.batch_size = settings.REMINDER_BATCH_SIZE
+        self.refresh_seconds = settings.REMINDER_REFRESH_SECONDS
+        self.lease_seconds = settings.REMINDER_LEASE_SECONDS
+
+        self.cursor = None         # Reminders due at or before this have fired
+        self.heap = []             # Upcoming distinct due instants
+        self.loaded_until = None   # Heap covers (cursor, loaded_until]
+        self.next_refresh = None
+
+    def acquire_lease(self, now):
+        """Take or renew the leader lease; return True if this process leads."""
+        lease, _ = SchedulerLease.objects.get_or_create(name=self.name)
+        won = SchedulerLease.objects.filter(
+            Q(holder=self.holder) | Q(expires_at__isnull=True) | Q(expires_at__lt=now),
+            name=self.name,
+        ).update(holder=self.holder, expires_at=now + timedelta(seconds=self.lease_seconds))
+        if not won:
+            self.cursor = None  # Re-read progress if we become leader later
+            return False
+        if self.cursor is None:
+            self.cursor = lease.cursor or now
+            self.next_refresh = None
+        return True
+
+    def release_lease(self):
+        """Give up leadership so another replica can take over immediately."""
+        SchedulerLease.objects.filter(name=self.name, holder=self.holder).update(holder='', expires_at=None)
+
+    def load(self, now):
+        """Rebuild the heap with the next batch of due instants after the cursor."""
+        horizon = timezone.localtime(now + self.lookahead)
+        cursor = timezone.localtime(self.cursor)
+        instants = list(
+            Task.objects
+            .filter(completed=False, due_date__gte=cursor.date(), due_date__lte=horizon.date())
+            .exclude(due_date=cursor.date(), due_time__lte=cursor.time())
+            .exclude(due_date=horizon.date(), due_time__gt=horizon.time())
+            .order_by('due_date', 'due_time')
+            .values_list('due_date', 'due_time')
+            .distinct()[:self.batch_size]
+        )
+        self.heap = [due for due in (_due_at(d, t) for d, t in instants) if due <= horizon]
+        heapq.heapify(self.heap)
+        # A full batch may stop short of the horizon; reload when it runs out
+        self.loaded_until = max(self.heap) if len(instants) == self.batch_size else horizon
+        self.next_refresh = now + timedelta(seconds=self.refresh_seconds)
+
+    def renew_lease(self, **fields):
+        """
+        Extend the lease (saving `fields` with it) if this process still holds
+        it. Otherwise drop the heap and cursor, and return False.
+        """
+        expires_at = self.clock() + timedelta(seconds=self.lease_seconds)
+        held = SchedulerLease.objects.filter(name=self.name, holder=self.holder).update(
+            expires_at=expires_at, **fields)
+        if not held:
+            logger.warning("Scheduler lease '%s' lost by %s; stopping", self.name, self.holder)
+            self.heap = []
+            self.cursor = None
+        return bool(held)
+
+    def fire_due(self, now):
+        """
+        Fire every reminder due at or before `now`; return how many were sent.
+
+        Sinks can be slow (a webhook may take seconds per reminder), so the
+        lease is renewed before each instant and the cursor is only saved
+        while it is still held: once another replica has taken over, this
+        one stops instead of firing the same reminders again.
+        """
+        sent = 0
+        while self.heap and self.heap[0] <= now:
+            if not self.renew_lease():
+                break
+            due = heapq.heappop(self.heap)
+            local = timezone.localtime(due)
+            tasks = (Task.objects.filter(completed=False, due_date=local.date(), due_time=local.time())
+                     .select_related('user').iterator())
+            for task in tasks:
+                self.sink.send(reminder_payload(task, due))
+                sent += 1
+            if not self.renew_lease(cursor=due):
+                break
+            self.cursor = due
+        return sent
+
+    def tick(self):
+        """
+        Run one scheduler iteration.
+
+        Returns (reminders sent, seconds to sleep before the next tick).
+        """
+        now = self.clock()
+        if not self.acquire_lease(now):
+            return 0, self.lease_seconds / 2
+
+        if self.next_refresh is None or now >= self.next_refresh or (not self.heap and now >= self.loaded_until):
+            self.load(now)
+        sent = self.fire_due(now)
+
+        wake = min(self.heap[0] if self.heap else self.loaded_until, self.next_refresh)
+        wait = min((wake - now).total_seconds(), self.lease_seconds / 2)
+        return sent, max(wait, 0)
+
+    def run(self, once=False):
+        """Loop forever (or once), sleeping until the next due instant."""
+        try:
+            while True:
+                sent, wait = self.tick()
+                if once:
+                    return sent
+                self.sleep(wait)
+        finally:
+            self.release_lease()
@@ -0,0 +1,83 @@
+"""
+Database Routing for TaskCLI
+============================
+Sends task reads from read-only views (dashboard, task list API) to an
+optional read replica configured with DATABASE_REPLICA_URL.
+
+Only Task reads are routed. Sessions and users always come from the
+primary, so logins and password changes are never served stale. After a
+write the client gets a short-lived cookie that pins its next reads to the
+primary, so the redirect after add/edit shows the change immediately.
+
+Author: TaskCLI Team
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Alias of the replica in settings.DATABASES
+REPLICA_ALIAS = 'replica'
+
+# Cookie that pins a client to the primary right after it writes
+PIN_COOKIE = 'taskcli_primary'
+
+# Set while a @use_replica view is running
+_use_replica = ContextVar('taskcli_use_replica', default=False)
+
+
+def replica_configured():
+    """Return True if a replica database is configured."""
+    return REPLICA_ALIAS in connections.settings
+
+
+class ReplicaRouter:
+    """
+    Route Task reads to the replica inside @use_replica views.
+
+    Everything else (all writes, auth, sessions) goes to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and model._meta.app_label == 'accounts' and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+
+def use_replica(view_func):
+    """Serve the view's task reads from the replica unless the client is pinned."""
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if request.COOKIES.get(PIN_COOKIE):
+            return view_func(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return _wrapped
+
+
+def pin_primary(view_func):
+    """Pin the client to the primary for REPLICA_PIN_SECONDS after a write."""
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+    return _wrapped
@@ -0,0 +1,217 @@
+"""
+Synthetic Data Generator for TaskCLI
+====================================
+Fills the database with N users x M tasks for scale testing. Run it with
+`python manage.py task_cli seed --users 1000 --tasks-per-user 10000`.
+
+Output is fully determined by the random seed and options, so two runs
+produce identical data. Rows are written in large batches, each in one
+transaction, by the fastest path the database offers:
+
+- PostgreSQL: COPY ... FROM STDIN
+- SQLite:     executemany() of a prepared INSERT
+- otherwise:  Task.objects.bulk_create()
+
+(`method='bulk'` forces bulk_create everywhere, for comparison.) Seeded
+tasks are not written to the TaskChange log.
+
+Author: TaskCLI Team
+"""
+
+import random
+import time
+import uuid
+from bisect import bisect
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Task
+from .slowlog import paused as slow_query_log_paused
+
+TASK_COLUMNS = ['user_id', 'name', 'project', 'priority', 'due_date', 'due_time',
+                'completed', 'completed_at', 'is_recurring', 'series_id', 'version', 'created_at']
+
+VERBS = ['Write', 'Review', 'Fix', 'Plan', 'Call', 'Email', 'Update', 'Prepare', 'Clean', 'Read']
+NOUNS = ['report', 'slides', 'budget', 'meeting notes', 'invoice', 'design', 'tests', 'backlog',
+         'kitchen', 'chapter']
+RECURRENCE = [(7, 1), (30, 1), (4, 7)]  # (occurrences, days apart): daily_7, daily_30, weekly_4
+LATENESS = [-3, -1, -1, 0, 0, 0, 0, 1, 2, 3, 7, 14]  # days from due date to completion (never after today)
+
+
+def parse_weights(spec):
+    """'High=2,Medium=5,Low=3' -> (['High', 'Medium', 'Low'], [2.0, 5.0, 3.0])."""
+    names, weights = [], []
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        names.append(name.strip())
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+class _Choice:
+    """Weighted choice with precomputed cumulative weights (faster than rng.choices per row)."""
+
+    def __init__(self, rng, names, weights):
+        self.rng = rng
+        self.names = names
+        self.cumulative = list(accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def __call__(self):
+        return self.names[bisect(self.cumulative, self.rng.random() * self.total)]
+
+
+def generate_rows(user_ids, tasks_per_user, rng, priorities, projects, completed, recurring,
+                  days_back, days_ahead, adapt=lambda v: v):
+    """
+    Yield one tuple per task, in TASK_COLUMNS order.
+
+    `adapt` converts date, time and datetime values once per distinct value
+    (e.g. to the strings SQLite stores), not once per row, and each series
+    UUID once per series. Series IDs derive from the user ID and run number,
+    so they don't consume the random stream. Completed tasks get a
+    completed_at a few days around their due date.
+    """
+    pick_priority = _Choice(rng, *priorities)
+    pick_project = _Choice(rng, *projects)
+    today = date.today()
+    dates = [adapt(today + timedelta(days=d)) for d in range(-days_back, days_ahead + 60 * 7)]
+    times = [adapt(dt_time(h, m)) for h in range(24) for m in (0, 15, 30, 45)]
+    created_at = adapt(timezone.now())
+    span = days_back + days_ahead
+    finished = {}  # (due date index, days late) -> completed_at
+
+    def done(index):
+        """(completed, completed_at) for the task due on dates[index]."""
+        if rng.random() >= completed:
+            return False, None
+        key = (index, rng.choice(LATENESS))
+        if key not in finished:
+            day = min(today + timedelta(days=sum(key) - days_back), today)
+            finished[key] = adapt(datetime.combine(day, dt_time(17), tzinfo=dt_timezone.utc))
+        return True, finished[key]
+
+    for user_id in user_ids:
+        remaining = tasks_per_user
+        n = 0
+        while remaining > 0:
+            n += 1
+            name = f"{rng.choice(VERBS)} {rng.choice(NOUNS)} #{n}"
+            project, priority = pick_project(), pick_priority()
+            start = rng.randint(0, span)
+            due_time = times[rng.randrange(len(times))]
+            if rng.random() < recurring:
+                count, step = rng.choice(RECURRENCE)
+                count = min(count, remaining)
+                series_id = adapt(uuid.UUID(int=user_id << 64 | n))
+                for i in range(count):
+                    yield (user_id, name, project, priority, dates[start + i * step], due_time,
+                           *done(start + i * step), True, series_id, 1, created_at)
+            else:
+                count = 1
+                yield (user_id, name, project, priority, dates[start], due_time,
+                       *done(start), False, None, 1, created_at)
+            remaining -= count
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_copy(batch):
+    table = Task._meta.db_table
+    sql = f"COPY {table} ({', '.join(TASK_COLUMNS)}) FROM STDIN"
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy'):  # psycopg 3
+            with raw.copy(sql) as copy:
+                for row in batch:
+                    copy.write_row(row)
+        else:  # psycopg2
+            import io
+            buf = io.StringIO()
+            for row in batch:
+                buf.write('\t'.join('t' if v is True else 'f' if v is False else '\\N' if v is None else str(v)
+                                     for v in row) + '\n')
+            buf.seek(0)
+            raw.copy_expert(sql, buf)
+
+
+def _write_executemany(batch):
+    table = Task._meta.db_table
+    placeholders = ', '.join(['%s'] * len(TASK_COLUMNS))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(TASK_COLUMNS)}) VALUES ({placeholders})", batch)
+
+
+def _write_bulk(batch):
+    Task.objects.bulk_create([Task(**dict(zip(TASK_COLUMNS, row))) for row in batch], batch_size=len(batch))
+
+
+def seed(users=10, tasks_per_user=100, random_seed=42, prefix='seed',
+         priorities='High=2,Medium=5,Low=3', projects='Work=5,Personal=3,Study=2,Health=1,Home=2',
+         completed=0.4, recurring=0.1, days_back=365, days_ahead=90,
+         password='password123', batch_size=50000, method='auto', progress=None):
+    """
+    Create `users` users with `tasks_per_user` tasks each.
+
+    Returns a dict with counts, seconds and rows/sec per stage. Calls
+    `progress(tasks_written)` after every batch.
+    """
+    if method == 'auto':
+        method = {'postgresql': 'copy', 'sqlite': 'executemany'}.get(connection.vendor, 'bulk')
+    write = {'copy': _write_copy, 'executemany': _write_executemany, 'bulk': _write_bulk}[method]
+
+    rng = random.Random(random_seed)
+    usernames = [f"{prefix}-{i}@example.com" for i in range(users)]
+    if User.objects.filter(username__in=usernames[:1]).exists():
+        raise ValueError(f"Users with prefix '{prefix}' already exist; pick another --prefix")
+
+    stats = {'method': method}
+    start = time.perf_counter()
+    hashed = make_password(password)  # hash once; every seeded user shares the password
+    with transaction.atomic():
+        User.objects.bulk_create(
+            [User(username=u, email=u, first_name=f"Seed {i}", password=hashed) for i, u in enumerate(usernames)],
+            batch_size=5000,
+        )
+    user_ids = list(User.objects.filter(username__in=usernames).order_by('id').values_list('id', flat=True))
+    stats['users'] = len(user_ids)
+    stats['user_seconds'] = time.perf_counter() - start
+
+    adapt = lambda v: v
+    if method == 'executemany':
+        ops = connection.ops
+        series_field = Task._meta.get_field('series_id')
+        adapt = lambda v: (ops.adapt_datetimefield_value(v) if isinstance(v, datetime)
+                           else ops.adapt_datefield_value(v) if isinstance(v, date)
+                           else series_field.get_db_prep_value(v, connection) if isinstance(v, uuid.UUID)
+                           else ops.adapt_timefield_value(v))
+    rows = generate_rows(user_ids, tasks_per_user, rng, parse_weights(priorities), parse_weights(projects),
+                         completed, recurring, days_back, days_ahead, adapt)
+
+    start = time.perf_counter()
+    written = 0
+    with slow_query_log_paused():
+        for batch in _batches(rows, batch_size):
+            with transaction.atomic():
+                write(batch)
+            written += len(batch)
+            if progress:
+                progress(written)
+    stats['tasks'] = written
+    stats['task_seconds'] = time.perf_counter() - start
+    stats['rows_per_second'] = written / stats['task_seconds'] if stats['task_seconds'] else 0
+    return stats
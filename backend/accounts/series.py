@@ -0,0 +1,93 @@
+"""
+Recurring Series Operations for TaskCLI
+=======================================
+Every task created by one recurrence (daily_7, daily_30, weekly_4) shares a
+`series_id`. The helpers here rename, reschedule or delete a whole series
+with one UPDATE or DELETE statement, where editing it task by task took one
+statement per occurrence. The TaskChange rows are written in one INSERT,
+in the same transaction.
+
+A series is addressed through any of its tasks. Tasks created before
+series_id existed have none and are edited one at a time as before.
+
+Used by the web views, the JSON API and `task_cli series`.
+
+Author: TaskCLI Team
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+
+from .changes import record_bulk, record_updates
+from .concurrency import bump
+from .models import Task
+
+SERIES_FIELDS = ('name', 'project', 'priority', 'due_time')
+
+
+def new_series_id(recurrence):
+    """series_id for the tasks of a new recurrence, None for a single task."""
+    return uuid.uuid4() if recurrence != 'none' else None
+
+
+def series_of(task_id, user=None):
+    """(queryset of the series' tasks, owner ID) for task `task_id`; `user=None` skips the ownership check."""
+    tasks = Task.objects.filter(id=task_id)
+    if user is not None:
+        tasks = tasks.filter(user=user)
+    series_id, user_id = tasks.values_list('series_id', 'user_id').get()  # Task.DoesNotExist
+    if series_id is None:
+        raise ValueError(f"Task {task_id} is not part of a recurring series")
+    return Task.objects.filter(series_id=series_id), user_id
+
+
+def clean_changes(changes):
+    """Validate and convert {field: value} for the series' editable fields."""
+    cleaned = {}
+    for field, value in changes.items():
+        if field not in SERIES_FIELDS:
+            raise ValueError(f"Can't change {field} on a whole series; use one of {', '.join(SERIES_FIELDS)}")
+        try:
+            cleaned[field] = Task._meta.get_field(field).to_python(value)
+        except ValidationError as e:
+            raise ValueError(f"Invalid {field}: {'; '.join(e.messages)}")
+    return cleaned
+
+
+def update_series(task_id, changes=None, shift_days=0, user=None):
+    """
+    Apply field `changes` and move every due date by `shift_days` (may be
+    negative) for the whole series of `task_id`, in one UPDATE. Returns the
+    IDs of the series' tasks.
+    """
+    changes = clean_changes(changes or {})
+    if not changes and not shift_days:
+        raise ValueError(f"Nothing to change; give any of {', '.join(SERIES_FIELDS)} or a shift")
+    data = {field: str(value) for field, value in changes.items()}
+    if shift_days:
+        changes['due_date'] = F('due_date') + timedelta(days=shift_days)
+
+    with transaction.atomic():
+        tasks, user_id = series_of(task_id, user)
+        tasks.update(**changes, version=bump())
+        if shift_days:
+            rows = list(tasks.values_list('id', 'due_date'))  # each task has its own new date
+            record_updates(user_id, [(pk, {**data, "due_date": str(due)}) for pk, due in rows])
+            return [pk for pk, _ in rows]
+        ids = list(tasks.values_list('id', flat=True))
+        record_bulk(user_id, ids, 'updated', data)
+    return ids
+
+
+def delete_series(task_id, user=None):
+    """Delete every task in the series of `task_id` with one DELETE; returns their IDs."""
+    with transaction.atomic():
+        tasks, user_id = series_of(task_id, user)
+        ids = list(tasks.values_list('id', flat=True))
+        tasks.delete()
+        record_bulk(user_id, ids, 'deleted')
+    return ids
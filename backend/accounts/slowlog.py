@@ -0,0 +1,140 @@
+"""
+Slow-Query Log for TaskCLI
+==========================
+An execute wrapper, installed on every database connection, that times
+each query and records the ones slower than SLOW_QUERY_MS with:
+
+- normalized SQL (literals and IN-lists collapsed, so repeats group together)
+- call site: the innermost accounts/ frame, e.g. `views.py:131 dashboard_page`
+  or `task_cli.py:560 list_tasks`
+- duration, and optionally the query plan (SQLite `EXPLAIN QUERY PLAN`,
+  PostgreSQL `EXPLAIN (FORMAT JSON)`) when SLOW_QUERY_EXPLAIN is on
+
+Records go to the `accounts.slowlog` logger (a rotating file when
+SLOW_QUERY_LOG_FILE is set) and/or the SlowQuery table (SLOW_QUERY_SINK),
+which `task_cli slow-queries` summarizes.
+
+Author: TaskCLI Team
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+_state = threading.local()  # .busy: recording in progress, don't time our own queries
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Replace literals with ? and collapse IN lists so equivalent queries compare equal."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def call_site():
+    """Innermost stack frame in the accounts app, excluding this module."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and filename != __file__:
+            return f"{os.path.relpath(filename, APP_DIR)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+def explain(connection, sql, params):
+    """Return the query plan as text, or '' if it can't be produced."""
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return ''
+    if connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    elif connection.vendor == 'postgresql':
+        prefix = 'EXPLAIN (FORMAT JSON) '
+    else:
+        return ''
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    if connection.vendor == 'postgresql':
+        return json.dumps(rows[0][0])
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def record(connection, sql, params, seconds, site, many=False):
+    """Log and/or store one slow query."""
+    normalized = normalize_sql(sql)
+    plan = explain(connection, sql, params) if settings.SLOW_QUERY_EXPLAIN and not many else ''
+    logger.warning("Slow query %.1f ms at %s [%s]: %s%s", seconds * 1000, site, connection.alias,
+                   normalized, f"\n{plan}" if plan else '')
+    if settings.SLOW_QUERY_SINK == 'table':
+        from .models import SlowQuery
+        SlowQuery.objects.create(
+            duration_ms=seconds * 1000,
+            sql=normalized,
+            sql_hash=hashlib.sha1(normalized.encode()).hexdigest(),
+            call_site=site[:255],
+            database=connection.alias,
+            plan=plan,
+        )
+
+
+def slow_query_wrapper(connection):
+    """Build the execute wrapper for one connection."""
+    def wrapper(execute, sql, params, many, context):
+        if getattr(_state, 'busy', False):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        seconds = time.perf_counter() - start
+        if seconds * 1000 >= settings.SLOW_QUERY_MS:
+            _state.busy = True
+            try:
+                record(connection, sql, params, seconds, call_site(), many)
+            except Exception:
+                logger.exception("Could not record slow query")
+            finally:
+                _state.busy = False
+        return result
+    wrapper.slow_query_log = True
+    return wrapper
+
+
+@contextmanager
+def paused():
+    """Don't time queries in this thread (e.g. bulk loads that are slow by design)."""
+    previous = getattr(_state, 'busy', False)
+    _state.busy = True
+    try:
+        yield
+    finally:
+        _state.busy = previous
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    """`connection_created` handler: add the wrapper once per connection."""
+    if not settings.SLOW_QUERY_MS:
+        return
+    if not any(getattr(w, 'slow_query_log', False) for w in connection.execute_wrappers):
+        # Insert first: scoped execute_wrapper() contexts (profiling) pop the last entry
+        connection.execute_wrappers.insert(0, slow_query_wrapper(connection))
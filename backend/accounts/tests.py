@@ -1,7 +1,34 @@
-from django.test import TestCase, Client
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.base import BaseHandler
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, TransactionTestCase, Client, AsyncClient, RequestFactory, override_settings
 from django.contrib.auth.models import User
-from .models import Task
-from datetime import date, timedelta
+from .models import ArchivedTask, IdempotencyKey, Job, SlowQuery, Task, TaskChange, SchedulerLease
+from .slowlog import normalize_sql
+from .throttle import take_token
+from .ical import feed_token
+from .middleware import user_cache_key
+from . import analytics
+from . import compression
+from . import jobs
+from . import metrics
+from .profiling import make_token
+from .reminders import ReminderScheduler
+from .routers import REPLICA_ALIAS, PIN_COOKIE
+from . import db as accounts_db
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
 class TaskRecurrenceTests(TestCase):
     def setUp(self):
@@ -42,3 +69,1072 @@ class TaskRecurrenceTests(TestCase):
         dates = sorted([t.due_date for t in tasks])
         expected_dates = [date(2023, 10, 1) + timedelta(weeks=i) for i in range(4)]
         self.assertEqual(dates, expected_dates)
+
+
+class SQLiteTuningTests(TestCase):
+    def _pragma(self, conn, name):
+        with conn.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    @override_settings(SQLITE_TUNING=True)
+    def test_pragmas_applied_on_new_connection(self):
+        conn = connections.create_connection('default')
+        try:
+            self.assertEqual(self._pragma(conn, 'busy_timeout'), settings.SQLITE_PRAGMAS['busy_timeout'])
+            self.assertEqual(self._pragma(conn, 'synchronous'), 1)  # NORMAL
+            self.assertEqual(self._pragma(conn, 'temp_store'), 2)  # MEMORY
+        finally:
+            conn.close()
+
+    @override_settings(SQLITE_TUNING=False)
+    def test_pragmas_untouched_when_disabled(self):
+        conn = connections.create_connection('default')
+        try:
+            self.assertEqual(self._pragma(conn, 'synchronous'), 2)  # FULL
+            self.assertEqual(self._pragma(conn, 'temp_store'), 0)
+        finally:
+            conn.close()
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """Uses a separate SQLite file as a (never-synced) stand-in replica."""
+    databases = '__all__'  # resolved after setUpClass registers the replica
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmpdir = tempfile.TemporaryDirectory()
+        replica = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(cls._tmpdir.name, 'replica.sqlite3'),
+        }
+        configured = connections.configure_settings({'default': {}, REPLICA_ALIAS: replica})
+        connections.settings[REPLICA_ALIAS] = configured[REPLICA_ALIAS]
+        call_command('migrate', database=REPLICA_ALIAS, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        del connections.settings[REPLICA_ALIAS]
+        cls._tmpdir.cleanup()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        User.objects.using(REPLICA_ALIAS).create(id=self.user.id, username='testuser')
+        Task.objects.using(REPLICA_ALIAS).create(
+            user_id=self.user.id, name='Replica Task', project='Test',
+            due_date='2023-10-01', due_time='10:00'
+        )
+        self.client = Client()
+        self.client.login(username='testuser', password='password')
+
+    def test_dashboard_reads_from_replica(self):
+        response = self.client.get('/dashboard/')
+        self.assertContains(response, 'Replica Task')
+
+    def test_api_tasks_reads_from_replica(self):
+        response = self.client.get('/api/tasks/', {'email': 'testuser'})
+        self.assertEqual([t['name'] for t in response.json()['tasks']], ['Replica Task'])
+
+    def test_redirect_after_write_reads_from_primary(self):
+        response = self.client.post('/add-task/', {
+            'name': 'Fresh Task',
+            'project': 'Test',
+            'priority': 'High',
+            'due_date': '2023-10-01',
+            'due_time': '10:00',
+        }, follow=True)
+        self.assertIn(PIN_COOKIE, self.client.cookies)
+        self.assertContains(response, 'Fresh Task')
+        self.assertNotContains(response, 'Replica Task')
+        self.assertFalse(Task.objects.using(REPLICA_ALIAS).filter(name='Fresh Task').exists())
+
+
+class PoolStatsTests(TestCase):
+    def test_no_pools_on_sqlite(self):
+        self.assertEqual(accounts_db.pool_stats(), {})
+
+    @override_settings(DATABASE_POOL=True, DATABASE_POOL_STATS_INTERVAL=60)
+    def test_report_logs_checkouts_and_wait_time(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            'requests_num': 40, 'requests_wait_ms': 100, 'requests_waiting': 0,
+            'pool_size': 4, 'pool_available': 3,
+        }
+        with mock.patch.object(connections['default'], 'pool', pool, create=True), \
+                mock.patch.object(accounts_db, '_last_pool_report', None):
+            with self.assertLogs('accounts.db', 'INFO') as logs:
+                accounts_db.report_pool_stats(sender=None)
+        self.assertIn('checkouts=40 wait_ms=100 avg_wait_ms=2.50', logs.output[0])
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db', USER_CACHE_TIMEOUT=300)
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='password')
+        Task.objects.create(user=self.user, name='Task', project='Test', due_date='2023-10-01', due_time='10:00')
+        self.client = Client()
+        self.client.login(username='testuser', password='password')
+
+    def test_warm_dashboard_only_queries_tasks(self):
+        self.client.get('/dashboard/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/dashboard/')
+        self.assertContains(response, 'Task')
+
+    def test_password_change_invalidates_cached_user(self):
+        self.client.get('/dashboard/')
+        self.user.set_password('new-password')
+        self.user.save()
+        response = self.client.get('/dashboard/')
+        self.assertRedirects(response, '/?next=/dashboard/', fetch_redirect_response=False)
+
+    def test_profile_change_is_visible(self):
+        self.client.get('/dashboard/')
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        self.assertContains(self.client.get('/dashboard/'), 'Hi Renamed')
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db', USER_CACHE_TIMEOUT=0)
+    def test_no_user_cache_without_shared_cache(self):
+        self.client.login(username='testuser', password='password')
+        self.client.get('/dashboard/')
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertFalse(settings.CACHE_IS_SHARED)  # the test settings use LocMemCache
+
+
+@override_settings(LOGIN_THROTTLE_ENABLED=True, LOGIN_THROTTLE_RATES={'ip': (100, 60), 'account': (3, 60)})
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='victim@example.com', password='password')
+
+    def _api_login(self, password):
+        return self.client.post('/api/login/', json.dumps({'email': 'victim@example.com', 'password': password}),
+                                content_type='application/json')
+
+    def test_account_bucket_returns_429_before_authenticate(self):
+        for _ in range(3):
+            self.assertEqual(self._api_login('wrong').status_code, 401)
+        with mock.patch('accounts.views.authenticate') as authenticate:
+            response = self._api_login('password')
+        authenticate.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_concurrent_attempts_cannot_overdraw_bucket(self):
+        class SlowCache:
+            """The test cache, yielding to other threads after every call."""
+            def __getattr__(self, name):
+                method = getattr(cache, name)
+
+                def slow(*args, **kwargs):
+                    result = method(*args, **kwargs)
+                    time.sleep(0.01)
+                    return result
+                return slow
+
+        barrier = threading.Barrier(20)
+        results = []
+
+        def attempt():
+            barrier.wait()
+            results.append(take_token('taskcli:throttle:test', 5, 60))
+
+        threads = [threading.Thread(target=attempt) for _ in range(20)]
+        with mock.patch('accounts.throttle.cache', SlowCache()):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results.count(0), 5)
+
+    @override_settings(LOGIN_THROTTLE_RATES={'ip': (2, 60), 'account': (100, 60)})
+    def test_ip_bucket_covers_web_login_form(self):
+        for _ in range(2):
+            self.client.post('/login/', {'email': 'victim@example.com', 'password': 'wrong'})
+        response = self.client.post('/login/', {'email': 'someone@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertContains(response, 'Too many attempts', status_code=429)
+
+
+class AjaxTaskActionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.task = Task.objects.create(user=self.user, name='Task', project='Test', priority='High',
+                                        due_date='2023-10-01', due_time='10:00')
+        self.client = Client()
+        self.client.login(username='testuser', password='password')
+
+    def test_complete_returns_row_and_counts(self):
+        response = self.client.post(f'/ajax/tasks/{self.task.id}/complete/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['task'], {'id': self.task.id, 'completed': True, 'version': 2})
+        self.assertEqual(response.json()['counts'], {'total': 1, 'completed': 1, 'high': 1})
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.completed)
+
+    def test_delete_returns_counts(self):
+        response = self.client.post(f'/ajax/tasks/{self.task.id}/delete/')
+        self.assertEqual(response.json()['counts'], {'total': 0, 'completed': 0, 'high': 0})
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+
+    def test_requires_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.login(username='testuser', password='password')
+        response = client.post(f'/ajax/tasks/{self.task.id}/complete/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_other_users_task_not_found(self):
+        other = User.objects.create_user(username='other', password='password')
+        client = Client()
+        client.force_login(other)
+        response = client.post(f'/ajax/tasks/{self.task.id}/pending/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client = Client()
+        self.client.login(username='testuser', password='password')
+
+    def test_mutations_are_logged(self):
+        self.client.post('/add-task/', {
+            'name': 'Daily Task', 'project': 'Test', 'priority': 'High',
+            'due_date': '2023-10-01', 'due_time': '10:00', 'recurrence': 'daily_7'
+        })
+        task = Task.objects.filter(user=self.user).first()
+        self.client.post(f'/ajax/tasks/{task.id}/complete/')
+        call_command('task_cli', 'delete', str(task.id), stdout=StringIO())
+
+        actions = list(TaskChange.objects.filter(user=self.user).values_list('action', 'task_id'))
+        self.assertEqual([a for a, _ in actions], ['created'] * 7 + ['updated', 'deleted'])
+        self.assertEqual(actions[-1], ('deleted', task.id))
+
+    @override_settings(CHANGE_FEED_POLL_SECONDS=0.01)
+    async def test_stream_resumes_after_last_event_id(self):
+        first = await TaskChange.objects.acreate(user=self.user, task_id=1, action='created')
+        second = await TaskChange.objects.acreate(user=self.user, task_id=2, action='deleted')
+
+        response = await AsyncClient().get('/api/tasks/changes/', {'email': 'testuser'},
+                                           headers={'Last-Event-ID': str(first.id)})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''
+        async for chunk in response.streaming_content:
+            body += chunk
+            if b'event: task' in body and body.endswith(b'\n\n'):
+                break
+        self.assertNotIn(f'id: {first.id}\n'.encode(), body)
+        self.assertIn(f'id: {second.id}\nevent: task\n'.encode(), body)
+        self.assertIn(b'"action": "deleted"', body)
+
+
+class ListSink:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, payload):
+        self.sent.append(payload)
+
+
+class ReminderSchedulerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.now = datetime(2030, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+        Task.objects.create(user=self.user, name='Past', due_date=date(2030, 1, 1), due_time='11:00')
+        Task.objects.create(user=self.user, name='Due', due_date=date(2030, 1, 1), due_time='12:05')
+        Task.objects.create(user=self.user, name='Done', due_date=date(2030, 1, 1), due_time='12:05', completed=True)
+        Task.objects.create(user=self.user, name='Later', due_date=date(2030, 1, 2), due_time='09:00')
+
+    def scheduler(self, sink):
+        return ReminderScheduler(sink, clock=lambda: self.now)
+
+    def test_fires_pending_tasks_once_at_due_time(self):
+        sink = ListSink()
+        scheduler = self.scheduler(sink)
+        sent, wait = scheduler.tick()
+        self.assertEqual((sent, wait), (0, settings.REMINDER_REFRESH_SECONDS))
+
+        self.now += timedelta(minutes=5)
+        scheduler.tick()
+        scheduler.tick()
+        self.assertEqual([p['name'] for p in sink.sent], ['Due'])
+        self.assertEqual(SchedulerLease.objects.get(name='default').cursor, self.now)
+
+    def test_new_leader_resumes_from_cursor(self):
+        first = self.scheduler(ListSink())
+        first.tick()
+        self.now += timedelta(minutes=5)
+        first.run(once=True)
+
+        sink = ListSink()
+        second = self.scheduler(sink)
+        second.holder = 'other:1'
+        self.now += timedelta(minutes=1)
+        second.run(once=True)
+        self.assertEqual(sink.sent, [])
+
+    def test_second_holder_cannot_take_live_lease(self):
+        leader = self.scheduler(ListSink())
+        leader.tick()
+        standby = self.scheduler(ListSink())
+        standby.holder = 'other:1'
+        self.assertFalse(standby.acquire_lease(self.now))
+        self.assertTrue(standby.acquire_lease(self.now + timedelta(seconds=settings.REMINDER_LEASE_SECONDS + 1)))
+
+    def test_stops_when_lease_is_taken_mid_batch(self):
+        class StealingSink(ListSink):
+            def send(sink, payload):
+                super().send(payload)
+                SchedulerLease.objects.filter(name='default').update(holder='other:1')
+
+        sink = StealingSink()
+        scheduler = self.scheduler(sink)
+        scheduler.tick()
+        self.now += timedelta(days=1)
+        sent, _ = scheduler.tick()
+        self.assertEqual((sent, [p['name'] for p in sink.sent]), (1, ['Due']))
+        self.assertEqual((scheduler.heap, scheduler.cursor), ([], None))
+        self.assertEqual(SchedulerLease.objects.get(name='default').cursor, None)
+
+    def test_task_cli_scheduler_writes_file_sink(self):
+        path = os.path.join(tempfile.mkdtemp(), 'reminders.jsonl')
+        Task.objects.filter(name='Due').update(due_date=date(2000, 1, 1))
+        SchedulerLease.objects.create(name='default', cursor=datetime(1999, 1, 1, tzinfo=dt_timezone.utc))
+        call_command('task_cli', 'scheduler', '--sink', 'file', '--file', path, '--once', stdout=StringIO())
+        with open(path) as f:
+            names = [json.loads(line)['name'] for line in f]
+        self.assertEqual(names, ['Due'])
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        old = date.today() - timedelta(days=100)
+        self.old_done = [Task.objects.create(user=self.user, name=f'Old {i}', project='P', due_date=old,
+                                             due_time='10:00', completed=True) for i in range(5)]
+        Task.objects.create(user=self.user, name='Old pending', project='P', due_date=old, due_time='10:00')
+        Task.objects.create(user=self.user, name='Recent done', project='P', due_date=date.today(),
+                            due_time='10:00', completed=True)
+
+    def test_archive_moves_old_completed_tasks_in_batches(self):
+        out = StringIO()
+        call_command('task_cli', 'archive', '--older-than', '30', '--batch-size', '2', stdout=out)
+        self.assertEqual(sorted(ArchivedTask.objects.values_list('id', flat=True)),
+                         [t.id for t in self.old_done])
+        self.assertEqual(set(Task.objects.values_list('name', flat=True)), {'Old pending', 'Recent done'})
+        self.assertIn('Archived 5 completed task(s)', out.getvalue())
+        self.assertEqual(out.getvalue().count('task(s) archived'), 3)
+        changes = TaskChange.objects.filter(action='deleted')
+        self.assertEqual(sorted(changes.values_list('task_id', flat=True)), [t.id for t in self.old_done])
+        self.assertEqual({c.user_id for c in changes}, {self.user.id})
+        self.assertEqual([c.data for c in changes], [{'archived': True}] * 5)
+
+    def test_api_tasks_include_archived(self):
+        call_command('task_cli', 'archive', '--older-than', '30', stdout=StringIO())
+        response = self.client.get('/api/tasks/', {'email': 'testuser'})
+        self.assertEqual(len(response.json()['tasks']), 2)
+
+        tasks = self.client.get('/api/tasks/', {'email': 'testuser', 'include_archived': '1'}).json()['tasks']
+        self.assertEqual(len(tasks), 7)
+        self.assertEqual(sum(t['archived'] for t in tasks), 5)
+
+
+@override_settings(JOB_INLINE_LIMIT=10)
+class JobQueueTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client = Client()
+        self.client.login(username='testuser', password='password')
+
+    def test_large_recurrence_is_handed_to_worker(self):
+        self.client.post('/add-task/', {
+            'name': 'Daily Task', 'project': 'Test', 'priority': 'High',
+            'due_date': '2023-10-01', 'due_time': '10:00', 'recurrence': 'daily_30'
+        })
+        job = Job.objects.get()
+        self.assertEqual((job.kind, job.status), ('create_tasks', 'queued'))
+        self.assertEqual(Task.objects.count(), 0)
+
+        self.assertEqual(jobs.run_workers(concurrency=1, once=True), 1)
+        self.assertEqual(Task.objects.filter(user=self.user, is_recurring=True).count(), 30)
+        status = self.client.get(f'/api/jobs/{job.id}/').json()['job']
+        self.assertEqual((status['status'], status['result']['created']), ('done', 30))
+
+    def test_bulk_api_inline_and_queued(self):
+        tasks = Task.objects.bulk_create([
+            Task(user=self.user, name=f'T{i}', project='P', due_date='2030-01-01', due_time='10:00')
+            for i in range(12)
+        ])
+        ids = [t.id for t in tasks]
+        response = self.client.post('/api/tasks/bulk/', {'email': 'testuser', 'action': 'complete',
+                                    'task_ids': ids[:2]}, content_type='application/json')
+        self.assertEqual(response.json()['affected'], 2)
+
+        response = self.client.post('/api/tasks/bulk/', {'email': 'testuser', 'action': 'delete',
+                                    'task_ids': ids}, content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        jobs.run_workers(concurrency=1, once=True)
+        self.assertEqual(Task.objects.count(), 0)
+        self.assertEqual(TaskChange.objects.filter(action='deleted').count(), 12)
+
+    def test_claim_is_exclusive_and_failures_retry(self):
+        first = jobs.enqueue('bulk_tasks', user=self.user, action='complete', task_ids=[])
+        second = jobs.enqueue('bulk_tasks', user=self.user, action='bogus', task_ids='x')
+        self.assertEqual(jobs.claim('a').id, first.id)
+        claimed = jobs.claim('b')
+        self.assertEqual(claimed.id, second.id)
+        self.assertIsNone(jobs.claim('c'))
+
+        for attempt in range(settings.JOB_MAX_ATTEMPTS):
+            self.assertFalse(jobs.run_job(claimed))
+            claimed = jobs.claim('b')
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.attempts), ('failed', settings.JOB_MAX_ATTEMPTS))
+        self.assertIsNone(claimed)
+
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.body = {'email': 'testuser', 'name': 'Once', 'project': 'P',
+                     'due_date': '2030-01-01', 'due_time': '10:00'}
+
+    def post(self, url, body, key):
+        return self.client.post(url, body, content_type='application/json', headers={'Idempotency-Key': key})
+
+    def test_retry_replays_first_response(self):
+        first = self.post('/api/tasks/add/', self.body, 'key-1')
+        second = self.post('/api/tasks/add/', self.body, 'key-1')
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(TaskChange.objects.count(), 1)
+
+    def test_key_reuse_with_other_body_is_rejected(self):
+        self.post('/api/tasks/add/', self.body, 'key-1')
+        response = self.post('/api/tasks/add/', {**self.body, 'name': 'Other'}, 'key-1')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_in_progress_key_gets_409(self):
+        task = Task.objects.create(user=self.user, name='T', project='P', due_date='2030-01-01', due_time='10:00')
+        url = f'/api/tasks/{task.id}/complete/'
+        IdempotencyKey.objects.create(key='key-1', path=url, request_hash='x')
+        response = self.post(url, {}, 'key-1')
+        self.assertEqual((response.status_code, response['Retry-After']), (409, '1'))
+        task.refresh_from_db()
+        self.assertFalse(task.completed)
+
+    def test_requests_without_key_are_not_stored(self):
+        self.client.post('/api/tasks/add/', self.body, content_type='application/json')
+        self.client.post('/api/tasks/add/', self.body, content_type='application/json')
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
+@override_settings(METRICS_TOKEN='secret')
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+
+    def scrape(self):
+        return self.client.get('/metrics', headers={'Authorization': 'Bearer secret'}).content.decode()
+
+    def test_metrics_requires_token_or_staff(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', headers={'Authorization': 'Bearer nope'}).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_records_route_latency_queries_and_size(self):
+        self.client.get('/dashboard/')
+        body = self.scrape()
+        self.assertIn('taskcli_http_requests_total{method="GET",route="dashboard",status="200"}', body)
+        self.assertIn('taskcli_http_request_duration_seconds_bucket{route="dashboard",le="+Inf"}', body)
+        self.assertIn('taskcli_db_queries_per_request_count{route="dashboard"}', body)
+        self.assertIn('taskcli_http_response_size_bytes_sum{route="dashboard"}', body)
+
+    def test_sums_snapshots_from_other_workers(self):
+        directory = tempfile.mkdtemp()
+        key = ['taskcli_http_requests_total', [['method', 'GET'], ['route', 'other_worker'], ['status', '200']], 3]
+        for pid in (1, 2):
+            with open(os.path.join(directory, f'{pid}.json'), 'w') as f:
+                json.dump([key], f)
+        with override_settings(METRICS_DIR=directory):
+            body = self.scrape()
+            metrics.flush()
+            self.assertIn(f'{os.getpid()}.json', os.listdir(directory))
+        self.assertIn('taskcli_http_requests_total{method="GET",route="other_worker",status="200"} 6', body)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='admin', password='password', is_staff=True)
+        self.dir = tempfile.mkdtemp()
+
+    def test_disabled_middleware_ignores_token(self):
+        self.client.login(username='admin', password='password')
+        response = self.client.get('/dashboard/', {'profile': make_token(self.staff)})
+        self.assertNotIn('X-Profile', response)
+
+    def test_staff_token_profiles_request(self):
+        with self.settings(PROFILING_ENABLED=True, PROFILING_DIR=self.dir):
+            client = Client()
+            client.login(username='admin', password='password')
+            response = client.get('/dashboard/', {'profile': make_token(self.staff), 'profile_output': 'text'})
+            self.assertIn('SQL (slowest first)', response.content.decode())
+            self.assertIn('accounts_task', response.content.decode())
+            self.assertTrue(os.path.exists(os.path.join(self.dir, response['X-Profile'] + '.prof')))
+
+            other = User.objects.create_user(username='other', password='password', is_staff=True)
+            self.assertNotIn('X-Profile', client.get('/dashboard/', {'profile': make_token(other)}))
+            self.assertNotIn('X-Profile', client.get('/dashboard/', {'profile': 'forged'}))
+
+    def test_task_cli_profile_flag(self):
+        err = StringIO()
+        with self.settings(PROFILING_DIR=self.dir):
+            call_command('task_cli', '--profile', 'list', stdout=StringIO(), stderr=err)
+        self.assertIn('queries', err.getvalue())
+        self.assertTrue(any(name.endswith('task_cli-list.txt') for name in os.listdir(self.dir)))
+
+
+class AsyncMiddlewareTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='admin', password='password', is_staff=True)
+
+    def test_middleware_chain_is_not_adapted_under_asgi(self):
+        with self.settings(DEBUG=True, PROFILING_ENABLED=True), mock.patch('django.core.handlers.base.logger') as logger:
+            BaseHandler().load_middleware(is_async=True)
+        self.assertEqual([c.args for c in logger.debug.call_args_list if 'adapted' in c.args[0]], [])
+
+    async def test_metrics_count_queries_of_async_request(self):
+        key = ('taskcli_db_queries_per_request', (('route', 'dashboard'),))
+        before = metrics._samples.get(key, [0, 0])[-2]
+        client = AsyncClient()
+        await client.aforce_login(self.staff)
+        response = await client.get('/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(metrics._samples[key][-2] - before, 0)
+
+    async def test_profiles_async_request(self):
+        client = AsyncClient()
+        await client.aforce_login(self.staff)
+        with self.settings(PROFILING_ENABLED=True, PROFILING_DIR=tempfile.mkdtemp()):
+            response = await client.get('/dashboard/', {'profile': make_token(self.staff), 'profile_output': 'text'},
+                                        headers={'Accept-Encoding': 'gzip'})
+        self.assertIn('X-Profile', response)
+        self.assertIn('accounts_task', gzip.decompress(response.content).decode())
+
+    async def test_serves_static_files(self):
+        response = await AsyncClient().get('/static/style.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'{', b''.join(response.streaming_content))
+
+
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql('SELECT  "a" FROM t WHERE id IN (%s, %s, %s) AND name = \'x\' LIMIT 21'),
+            'SELECT "a" FROM t WHERE id IN (...) AND name = ? LIMIT ?',
+        )
+
+    def test_records_call_site_and_plan(self):
+        with self.settings(SLOW_QUERY_MS=0.000001, SLOW_QUERY_SINK='table', SLOW_QUERY_EXPLAIN=True), \
+                self.assertLogs('accounts.slowlog', 'WARNING'):
+            self.client.get('/dashboard/')
+        query = SlowQuery.objects.filter(sql__contains='"accounts_task"').first()
+        self.assertIn('views.py', query.call_site)
+        self.assertIn('dashboard_page', query.call_site)
+        self.assertTrue(query.plan)
+
+        out = StringIO()
+        call_command('task_cli', 'slow-queries', stdout=out)
+        self.assertIn('dashboard_page', out.getvalue())
+
+
+class SeedTests(TestCase):
+    def _tasks(self, prefix):
+        return list(Task.objects.filter(user__username__startswith=f'{prefix}-')
+                    .order_by('id').values_list('name', 'project', 'priority', 'due_date', 'due_time',
+                                                'completed', 'is_recurring'))
+
+    def test_seed_creates_counts_and_is_deterministic(self):
+        out = StringIO()
+        call_command('task_cli', 'seed', '--users', '3', '--tasks-per-user', '40', '--prefix', 'a',
+                     '--batch-size', '50', stdout=out)
+        self.assertEqual(User.objects.filter(username__startswith='a-').count(), 3)
+        self.assertEqual(Task.objects.filter(user__username='a-2@example.com').count(), 40)
+        self.assertIn('Seeded 3 user(s) and 120 task(s)', out.getvalue())
+        self.assertFalse(TaskChange.objects.exists())
+
+        # Same seed through the ORM write path gives the same rows
+        call_command('task_cli', 'seed', '--users', '3', '--tasks-per-user', '40', '--prefix', 'b',
+                     '--method', 'bulk', stdout=StringIO())
+        self.assertEqual(self._tasks('a'), self._tasks('b'))
+        self.assertTrue(any(t[6] for t in self._tasks('a')))
+
+    def test_existing_prefix_is_rejected(self):
+        call_command('task_cli', 'seed', '--users', '1', '--tasks-per-user', '1', stdout=StringIO())
+        out = StringIO()
+        call_command('task_cli', 'seed', '--users', '1', '--tasks-per-user', '1', stdout=out)
+        self.assertIn('already exist', out.getvalue())
+        self.assertEqual(Task.objects.count(), 1)
+
+
+class ListFormatTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        for i in range(5):
+            Task.objects.create(user=self.user, name=f'Task {i}', project='P', due_date=date(2030, 1, 1 + i),
+                                due_time='10:00', completed=i < 2)
+
+    def _list(self, *args):
+        out = StringIO()
+        call_command('task_cli', 'list', '--user', 'testuser', *args, stdout=out)
+        return out.getvalue()
+
+    def test_json_has_totals_and_payload_shape(self):
+        data = json.loads(self._list('--format', 'json'))
+        self.assertEqual(data['total'], 5)
+        self.assertEqual(data['completed'], 2)
+        self.assertEqual(data['tasks'][0]['due_date'], '2030-01-01')
+        self.assertEqual(set(data['tasks'][0]), {'id', 'name', 'project', 'priority', 'due_date', 'due_time',
+                                                 'completed', 'is_recurring'})
+
+    def test_ndjson_limit_offset(self):
+        lines = self._list('--format', 'ndjson', '--limit', '2', '--offset', '1').splitlines()
+        self.assertEqual([json.loads(line)['name'] for line in lines], ['Task 1', 'Task 2'])
+        self.assertNotIn('\033[', self._list('--format', 'ndjson'))
+
+    def test_csv_and_table(self):
+        rows = self._list('--format', 'csv').splitlines()
+        self.assertEqual(rows[0], 'id,name,project,priority,due_date,due_time,completed,is_recurring,archived')
+        self.assertEqual(len(rows), 6)
+        self.assertIn('Total: 5 task(s) (2 completed, 3 pending)', self._list())
+        self.assertIn('No tasks found', self._list('--offset', '10'))
+
+
+class BatchModeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+
+    def _batch(self, commands, *args):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as f:
+            f.write('\n'.join(c if isinstance(c, str) else json.dumps(c) for c in commands))
+        self.addCleanup(os.remove, f.name)
+        out, err = StringIO(), StringIO()
+        call_command('task_cli', 'batch', '--file', f.name, *args, stdout=out, stderr=err)
+        return [json.loads(line) for line in out.getvalue().splitlines()], err.getvalue()
+
+    def test_runs_commands_in_order_with_grouped_transactions(self):
+        results, err = self._batch([
+            {'op': 'add', 'user': 'testuser', 'name': 'A', 'due_date': '2030-01-01', 'ref': 'a'},
+            {'op': 'add', 'user': 'testuser', 'name': 'B', 'recurrence': 'daily_7'},
+            {'op': 'complete', 'id': 999999},
+            'not json',
+            {'op': 'list', 'user': 'testuser', 'status': 'pending', 'limit': 3},
+        ])
+        self.assertEqual([r['ok'] for r in results], [True, True, False, False, True])
+        self.assertEqual(results[0]['ref'], 'a')
+        self.assertEqual(len(results[1]['ids']), 7)
+        self.assertEqual(results[2]['error'], 'Task 999999 not found')
+        self.assertEqual(len(results[4]['tasks']), 3)
+        self.assertEqual(Task.objects.count(), 8)
+        self.assertEqual(TaskChange.objects.filter(action='created').count(), 8)
+        self.assertIn('3 ok, 2 failed, 1 transaction(s)', err)
+
+    def test_edit_complete_delete(self):
+        task = Task.objects.create(user=self.user, name='T', project='P', due_date=date(2030, 1, 1), due_time='10:00')
+        results, _ = self._batch([
+            {'op': 'edit', 'id': task.id, 'name': 'Renamed', 'due_date': '2030-02-01'},
+            {'op': 'edit', 'id': task.id, 'due_date': 'tomorrow'},
+            {'op': 'complete', 'id': task.id},
+        ], '--group-size', '2')
+        self.assertEqual([r['ok'] for r in results], [True, False, True])
+        task.refresh_from_db()
+        self.assertEqual((task.name, task.due_date, task.completed), ('Renamed', date(2030, 2, 1), True))
+
+        results, _ = self._batch([{'op': 'delete', 'id': task.id}])
+        self.assertTrue(results[0]['ok'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_malformed_command_fails_alone(self):
+        results, err = self._batch([
+            {'op': 'add', 'user': 'testuser', 'name': 'Kept'},
+            {'op': 'add', 'user': 'testuser', 'name': 'Bad time', 'due_time': 'bad'},
+            {'op': 'add', 'user': 'testuser', 'name': 'No project', 'project': None},  # NOT NULL violation
+            {'op': 'add', 'user': 'testuser', 'name': 'Also kept'},
+            {'op': 'list', 'user': 'testuser', 'limit': 'x'},
+        ])
+        self.assertEqual([r['ok'] for r in results], [True, False, False, True, False])
+        self.assertEqual(results[1]['error'], 'Invalid time format. Use HH:MM.')
+        self.assertIn('IntegrityError', results[2]['error'])
+        self.assertEqual(results[4]['error'], "'limit' must be a non-negative integer")
+        self.assertEqual(sorted(Task.objects.values_list('name', flat=True)), ['Also kept', 'Kept'])
+        self.assertIn('2 ok, 3 failed, 1 transaction(s)', err)
+
+
+class ApiPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.ids = [Task.objects.create(user=self.user, name=f'Task {i}', project='P', due_date=date(2030, 1, 1),
+                                        due_time='10:00', completed=i % 2 == 0).id for i in range(5)]
+
+    def test_keyset_pages_until_next_is_null(self):
+        seen, after = [], 0
+        while after is not None:
+            data = self.client.get('/api/tasks/', {'email': 'testuser', 'limit': 2, 'after': after}).json()
+            seen += [t['id'] for t in data['tasks']]
+            after = data['next']
+        self.assertEqual(seen, self.ids)
+
+    def test_status_filter_and_bad_params(self):
+        data = self.client.get('/api/tasks/', {'email': 'testuser', 'limit': 10, 'status': 'pending'}).json()
+        self.assertEqual([t['id'] for t in data['tasks']], self.ids[1::2])
+        self.assertIsNone(data['next'])
+        self.assertEqual(self.client.get('/api/tasks/', {'email': 'testuser', 'limit': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/tasks/', {'email': 'testuser', 'limit': 2,
+                                                         'include_archived': 1}).status_code, 400)
+
+    def test_status_filter_applies_to_archived_tasks(self):
+        archived = ArchivedTask.objects.create(id=1000, user=self.user, name='Old', project='P',
+                                               due_date=date(2020, 1, 1), due_time='10:00',
+                                               created_at=datetime.now(dt_timezone.utc))
+        get = lambda status: self.client.get('/api/tasks/', {'email': 'testuser', 'status': status,
+                                                             'include_archived': 1}).json()['tasks']
+        self.assertEqual([t['id'] for t in get('pending')], self.ids[1::2])
+        self.assertEqual([t['id'] for t in get('completed')], self.ids[::2] + [archived.id])
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        Task.objects.bulk_create([Task(user=self.user, name=f'Task {i}', project='P', due_date=date(2030, 1, 1),
+                                       due_time='10:00') for i in range(50)])
+
+    def get_tasks(self, encoding, **params):
+        return self.client.get('/api/tasks/', {'email': 'testuser', **params}, HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_gzip_json_round_trips(self):
+        response = self.get_tasks('gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['tasks']), 50)
+
+    @skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli_preferred_by_q_value(self):
+        response = self.get_tasks('gzip;q=0.5, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(len(json.loads(compression.brotli.decompress(response.content))['tasks']), 50)
+        self.assertEqual(self.get_tasks('br;q=0, gzip')['Content-Encoding'], 'gzip')
+
+    @skipUnless(compression.brotli, 'brotli is not installed')
+    def test_brotli_output_is_padded_by_random_length(self):
+        content = b'<p>csrf token</p>' * 500
+        outputs = [compression.compress(content, 'br') for _ in range(20)]
+        self.assertTrue(all(compression.brotli.decompress(out) == content for out in outputs))
+        self.assertGreater(len({len(out) for out in outputs}), 1)
+        self.assertGreater(min(map(len, outputs)),
+                           len(compression.brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)))
+
+    def test_small_or_unaccepted_bodies_are_left_alone(self):
+        small = self.get_tasks('gzip', limit=1)
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', small['Vary'])
+        self.assertFalse(self.get_tasks('identity').has_header('Content-Encoding'))
+        with override_settings(COMPRESSION_ENABLED=False):
+            self.assertFalse(self.get_tasks('gzip').has_header('Content-Encoding'))
+
+    def test_strong_etag_is_weakened(self):
+        def view(request):
+            response = HttpResponse('x' * 5000, content_type='text/html')
+            response['ETag'] = '"abc"'
+            return response
+
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = compression.CompressionMiddleware(view)(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_dashboard_uses_static_script(self):
+        self.client.login(username='testuser', password='password')
+        response = self.client.get('/dashboard/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        html = gzip.decompress(response.content).decode()
+        self.assertIn('<script src="/static/dashboard.js">', html)
+        self.assertNotIn('function openModal', html)
+
+
+class CalendarTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password', first_name='Test')
+        for day, hour in ((1, 15), (1, 9), (3, 12), (20, 8)):
+            Task.objects.create(user=self.user, name=f'Task {day}/{hour}', project='P', due_date=date(2030, 1, day),
+                                due_time=f'{hour}:00')
+        self.feed_url = f'/calendar/{feed_token(self.user)}.ics'
+
+    def test_range_grouped_by_day(self):
+        with self.assertNumQueries(2):  # user lookup + one range query
+            data = self.client.get('/api/tasks/calendar/', {'email': 'testuser', 'from': '2030-01-01',
+                                                             'to': '2030-01-07'}).json()
+        self.assertEqual(list(data['days']), ['2030-01-01', '2030-01-03'])
+        self.assertEqual([t['name'] for t in data['days']['2030-01-01']], ['Task 1/9', 'Task 1/15'])
+
+    def test_session_auth_and_bad_ranges(self):
+        self.client.login(username='testuser', password='password')
+        self.assertEqual(len(self.client.get('/api/tasks/calendar/', {'from': '2030-01-20', 'to': '2030-01-20'})
+                             .json()['days']), 1)
+        for params in ({'from': '2030-01-07', 'to': '2030-01-01'}, {'from': '2030-02-30', 'to': '2030-03-01'},
+                       {'from': '2030-01-01', 'to': '2032-01-01'}, {'from': '2030-01-01'}):
+            self.assertEqual(self.client.get('/api/tasks/calendar/', params).status_code, 400)
+
+    def test_feed_streams_events(self):
+        response = self.client.get(self.feed_url)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 4)
+        self.assertIn('DTSTART:20300101T090000\r\n', body)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split('\r\n')))
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(self.feed_url)['ETag']
+        self.assertEqual(self.client.get(self.feed_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.client.login(username='testuser', password='password')
+        task = Task.objects.filter(user=self.user).first()
+        self.client.post(f'/ajax/tasks/{task.id}/complete/')
+        self.assertEqual(self.client.get(self.feed_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_bad_or_revoked_token(self):
+        self.assertEqual(self.client.get(f'/calendar/{self.user.id}-0123.ics').status_code, 404)
+        self.user.set_password('changed')
+        self.user.save()
+        self.assertEqual(self.client.get(self.feed_url).status_code, 404)
+
+    def test_long_lines_are_folded(self):
+        from .ical import _fold
+        folded = _fold('SUMMARY:' + 'é' * 100)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in folded.split('\r\n')))
+        self.assertEqual(folded.replace('\r\n ', '').rstrip('\r\n'), 'SUMMARY:' + 'é' * 100)
+
+
+class SeriesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+        self.client.post('/add-task/', {'name': 'Standup', 'project': 'Work', 'priority': 'Low',
+                                        'due_date': '2030-01-01', 'due_time': '09:00', 'recurrence': 'daily_7'})
+        self.single = Task.objects.create(user=self.user, name='Once', project='P', due_date=date(2030, 1, 1),
+                                          due_time='10:00')
+        self.series = list(Task.objects.filter(series_id__isnull=False).order_by('due_date'))
+
+    def task_statements(self, queries, verb):
+        return [q['sql'] for q in queries if q['sql'].startswith(verb) and 'accounts_task"' in q['sql']]
+
+    def test_recurrence_shares_series_id(self):
+        self.assertEqual(len(self.series), 7)
+        self.assertEqual(len({t.series_id for t in self.series}), 1)
+        self.assertIsNone(self.single.series_id)
+        payload = self.client.get('/api/tasks/', {'email': 'testuser'}).json()['tasks']
+        self.assertEqual({t['series_id'] for t in payload}, {str(self.series[0].series_id), None})
+
+    def test_edit_and_shift_in_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f'/api/tasks/{self.series[3].id}/series/edit/',
+                                        {'email': 'testuser', 'name': 'Daily sync', 'shift_days': -2},
+                                        content_type='application/json')
+        self.assertEqual(response.json()['affected'], 7)
+        self.assertEqual(len(self.task_statements(queries, 'UPDATE')), 1)
+        tasks = Task.objects.filter(series_id=self.series[0].series_id).order_by('due_date')
+        self.assertEqual({t.name for t in tasks}, {'Daily sync'})
+        self.assertEqual(tasks[0].due_date, date(2029, 12, 30))
+        change = TaskChange.objects.filter(task_id=self.series[0].id).last()
+        self.assertEqual(change.data, {'name': 'Daily sync', 'due_date': '2029-12-30'})
+
+    def test_delete_in_one_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f'/ajax/tasks/{self.series[0].id}/series/delete/')
+        self.assertEqual(len(self.task_statements(queries, 'DELETE')), 1)
+        self.assertEqual(response.json()['counts']['total'], 1)
+        self.assertEqual(list(Task.objects.values_list('id', flat=True)), [self.single.id])
+
+    def test_errors(self):
+        shift = lambda task_id, **body: self.client.post(f'/api/tasks/{task_id}/series/shift/', {'days': 1, **body},
+                                                         content_type='application/json')
+        self.assertEqual(shift(self.single.id).status_code, 400)
+        self.assertEqual(shift(999999).status_code, 404)
+        User.objects.create_user(username='other', password='password')
+        self.assertEqual(shift(self.series[0].id, email='other').status_code, 404)
+        response = self.client.post(f'/api/tasks/{self.series[0].id}/series/edit/', {'due_date': '2030-02-01'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_dashboard_edit_with_new_date_shifts_series(self):
+        self.client.post(f'/edit-task/{self.series[2].id}/', {
+            'name': 'Standup', 'project': 'Work', 'priority': 'High', 'due_date': '2030-01-10',
+            'due_time': '09:30', 'scope': 'series'})
+        tasks = list(Task.objects.filter(series_id=self.series[0].series_id).order_by('due_date'))
+        self.assertEqual([t.due_date for t in tasks], [date(2030, 1, 8) + timedelta(days=i) for i in range(7)])
+        self.assertEqual({(t.priority, str(t.due_time)) for t in tasks}, {('High', '09:30:00')})
+
+    def test_cli_series(self):
+        out = StringIO()
+        call_command('task_cli', 'series', 'shift', str(self.series[0].id), '--days', '7', stdout=out)
+        self.assertIn('Updated 7 tasks', out.getvalue())
+        self.assertEqual(Task.objects.get(id=self.series[0].id).due_date, date(2030, 1, 8))
+        call_command('task_cli', 'series', 'delete', str(self.series[0].id), stdout=out)
+        self.assertEqual(Task.objects.count(), 1)
+
+
+class ConcurrencyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+        self.task = Task.objects.create(user=self.user, name='Report', project='Work', priority='Medium',
+                                        due_date=date(2030, 1, 1), due_time='09:00')
+
+    def api_edit(self, **body):
+        return self.client.post(f'/api/tasks/{self.task.id}/edit/', body, content_type='application/json')
+
+    def test_stale_version_gets_409_with_current_task(self):
+        self.assertEqual(self.task.version, 1)
+        response = self.api_edit(name='Final report', version=1)
+        self.assertEqual(response.json(), {'success': True, 'version': 2})
+        response = self.api_edit(priority='Low', version=1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['task']['name'], 'Final report')
+        self.assertEqual(response.json()['task']['version'], 2)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.priority, self.task.version), ('Medium', 2))
+        self.assertEqual(TaskChange.objects.last().data, {'name': 'Final report', 'version': 2})
+
+    def test_every_write_bumps_version(self):
+        response = self.client.post(f'/ajax/tasks/{self.task.id}/complete/')
+        self.assertEqual(response.json()['task']['version'], 2)
+        self.assertEqual(self.client.post(f'/api/tasks/{self.task.id}/pending/').json()['version'], 3)
+        jobs.apply_bulk_action(self.user, 'complete', [self.task.id])
+        self.api_edit(project='Home')  # no version: applied unconditionally
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.project, self.task.version), ('Home', 5))
+
+    def test_dashboard_edit_conflict(self):
+        form = {'name': 'Mine', 'project': 'Work', 'priority': 'High', 'due_date': '2030-01-01',
+                'due_time': '09:00', 'version': '1'}
+        self.api_edit(name='Theirs')
+        response = self.client.post(f'/edit-task/{self.task.id}/', form)
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, 'changed elsewhere', status_code=409)
+        self.assertEqual(Task.objects.get(id=self.task.id).name, 'Theirs')
+        response = self.client.post(f'/edit-task/{self.task.id}/', {**form, 'version': '2'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Task.objects.get(id=self.task.id).name, 'Mine')
+
+    def test_batch_and_cli_conflicts(self):
+        self.api_edit(name='Theirs')
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as f:
+            f.write(json.dumps({'op': 'edit', 'id': self.task.id, 'version': 1, 'name': 'Mine'}))
+        self.addCleanup(os.remove, f.name)
+        out = StringIO()
+        call_command('task_cli', 'batch', '--file', f.name, stdout=out, stderr=StringIO())
+        result = json.loads(out.getvalue())
+        self.assertFalse(result['ok'])
+        self.assertIn('changed by someone else', result['error'])
+        call_command('task_cli', 'edit', str(self.task.id), '--name', 'Mine', '--if-version', '1', stdout=out)
+        self.assertIn('nothing was changed', out.getvalue())
+        self.assertEqual(Task.objects.get(id=self.task.id).name, 'Theirs')
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+        self.today = date.today()
+        self.monday = self.today - timedelta(days=self.today.weekday())
+
+    def add(self, name, weeks_ago, project='Work', completed_on=None):
+        task = Task.objects.create(user=self.user, name=name, project=project,
+                                   due_date=self.monday - timedelta(weeks=weeks_ago), due_time='09:00')
+        if completed_on is not None:
+            Task.objects.filter(id=task.id).update(
+                completed=True, completed_at=datetime.combine(task.due_date + timedelta(days=completed_on),
+                                                              datetime.min.time(), tzinfo=dt_timezone.utc))
+        return task
+
+    def test_completion_paths_set_completed_at(self):
+        task = self.add('A', 0)
+        self.client.post(f'/ajax/tasks/{task.id}/complete/')
+        task.refresh_from_db()
+        first = task.completed_at
+        self.assertIsNotNone(first)
+        self.client.post(f'/api/tasks/{task.id}/complete/')  # completing again keeps the first time
+        task.refresh_from_db()
+        self.assertEqual(task.completed_at, first)
+        self.client.post(f'/pending-task/{task.id}/')
+        task.refresh_from_db()
+        self.assertIsNone(task.completed_at)
+        jobs.apply_bulk_action(self.user, 'complete', [task.id])
+        self.assertIsNotNone(Task.objects.get(id=task.id).completed_at)
+
+    def test_report(self):
+        self.add('on time', 1, completed_on=0)
+        self.add('early', 1, completed_on=-2)
+        self.add('late', 1, project='Home', completed_on=5)
+        self.add('open', 1, project='Home')
+        done_unknown = self.add('before completed_at', 0)
+        Task.objects.filter(id=done_unknown.id).update(completed=True)
+        self.add('too old', 3, completed_on=0)
+
+        response = self.client.get('/api/analytics/', {'weeks': 2})
+        data = response.json()
+        self.assertEqual(data['from'], str(self.monday - timedelta(weeks=1)))
+        self.assertEqual([(w['due'], w['completed']) for w in data['weeks']], [(4, 3), (1, 1)])
+        self.assertEqual(data['weeks'][0]['rate'], 0.75)
+        self.assertEqual(data['timeliness'], {
+            'on_time': 2, 'late': 1, 'unknown': 1, 'overdue': 1,
+            'late_days': {'1': 0, '2-3': 0, '4-7': 1, '8-14': 0, '15-30': 0, '31+': 0}})
+        self.assertEqual(data['projects'][0], {'project': 'Work', 'due': 3, 'completed': 3, 'rate': 1.0,
+                                               'per_week': 1.5})
+        self.assertEqual(self.client.get('/api/analytics/', {'weeks': 0}).status_code, 400)
+
+    def test_archived_tasks_still_count(self):
+        self.add('archived', 1, completed_on=3)
+        self.add('archived too', 1, completed_on=3)
+        call_command('task_cli', 'archive', '--older-than', '0', stdout=StringIO())
+        self.assertEqual(ArchivedTask.objects.count(), 2)
+        self.add('live', 1, completed_on=3)
+        for engine in ('python', 'numpy') if analytics.np is not None else ('python',):
+            data = analytics.report(self.user, 2, engine=engine)
+            self.assertEqual((data['weeks'][0]['due'], data['weeks'][0]['completed']), (3, 3))
+            self.assertEqual(data['timeliness']['late_days']['2-3'], 3)
+
+    @skipUnless(analytics.np is not None, "NumPy is not installed")
+    def test_numpy_and_python_agree(self):
+        call_command('task_cli', 'seed', '--users', '1', '--tasks-per-user', '500', '--prefix', 'an',
+                     stdout=StringIO())
+        user = User.objects.get(username='an-0@example.com')
+        fast, slow = analytics.report(user, 60, engine='numpy'), analytics.report(user, 60, engine='python')
+        self.assertEqual(fast.pop('engine'), 'numpy')
+        self.assertEqual(slow.pop('engine'), 'python')
+        self.assertEqual(fast, slow)
+        self.assertGreater(fast['timeliness']['late'], 0)
+
+    def test_cli_report(self):
+        self.add('late', 0, completed_on=2)
+        out = StringIO()
+        call_command('task_cli', 'report', '--user', 'testuser', '--weeks', '1', '--format', 'json', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['timeliness']['late_days']['2-3'], 1)
+        call_command('task_cli', 'report', '--user', 'testuser', '--engine', 'python', stdout=out)
+        self.assertIn('Days late', out.getvalue())
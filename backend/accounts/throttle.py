@@ -0,0 +1,111 @@
+"""
+Login Throttling for TaskCLI
+============================
+Every login and signup attempt runs the PBKDF2 password hasher, so a burst
+of bad logins can pin every gunicorn worker. This module implements a
+cache-backed attempt counter per client IP and per account, checked *before*
+authenticate() or create_user() is called.
+
+Counters live in the default cache; configure a shared cache (Redis,
+Memcached) so limits apply across all worker processes.
+
+Author: TaskCLI Team
+"""
+
+import hashlib
+import json
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.shortcuts import render
+
+
+def take_token(key, capacity, period):
+    """
+    Take one of the `capacity` attempts allowed per `period` seconds under `key`.
+
+    The window starts with the first attempt: cache.add() creates the
+    counter with a `period` timeout and cache.incr() counts attempts. Both
+    are atomic on Redis, Memcached and LocMemCache, so parallel requests
+    cannot all read the same count and each slip through. A rejected
+    attempt gives its slot back, so hammering a locked bucket does not
+    extend the lockout. Returns 0 if the attempt may proceed, otherwise the
+    number of seconds until the window ends.
+    """
+    now = time.time()
+    if cache.add(key, 0, period):
+        cache.set(f"{key}:start", now, period)
+    try:
+        count = cache.incr(key)
+    except ValueError:  # expired between add() and incr()
+        cache.set(key, 1, period)
+        cache.set(f"{key}:start", now, period)
+        count = 1
+
+    if count > capacity:
+        cache.decr(key)
+        return max(cache.get(f"{key}:start", now) + period - now, 1)
+    return 0
+
+
+def client_ip(request):
+    """Return the client IP, honouring X-Forwarded-For behind a trusted proxy."""
+    if settings.LOGIN_THROTTLE_TRUST_PROXY:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _account(request):
+    """Extract the email being logged into / signed up from a form or JSON body."""
+    if request.content_type == 'application/json':
+        try:
+            email = json.loads(request.body).get('email', '')
+        except (ValueError, AttributeError):
+            email = ''
+    else:
+        email = request.POST.get('email', '')
+    return str(email).strip().lower()
+
+
+def check_login_throttle(request):
+    """
+    Consume a token from the IP and account buckets for this attempt.
+
+    Returns 0 if the attempt may proceed, otherwise the Retry-After delay
+    in seconds.
+    """
+    ip_capacity, ip_period = settings.LOGIN_THROTTLE_RATES['ip']
+    retry_after = take_token(f"taskcli:throttle:ip:{client_ip(request)}", ip_capacity, ip_period)
+    if retry_after:
+        return retry_after
+
+    account = _account(request)
+    if account:
+        digest = hashlib.sha256(account.encode()).hexdigest()[:32]
+        acct_capacity, acct_period = settings.LOGIN_THROTTLE_RATES['account']
+        return take_token(f"taskcli:throttle:account:{digest}", acct_capacity, acct_period)
+    return 0
+
+
+def throttle_login(view_func):
+    """Reject over-limit POSTs with 429 + Retry-After before the view hashes a password."""
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if request.method == 'POST' and settings.LOGIN_THROTTLE_ENABLED:
+            retry_after = check_login_throttle(request)
+            if retry_after:
+                error = "Too many attempts. Please try again later."
+                if request.content_type == 'application/json':
+                    response = JsonResponse({"success": False, "error": error}, status=429)
+                else:
+                    response = render(request, "index.html", {"error": error}, status=429)
+                response['Retry-After'] = str(math.ceil(retry_after))
+                return response
+        return view_func(request, *args, **kwargs)
+    return _wrapped
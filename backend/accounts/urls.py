@@ -6,6 +6,7 @@ Defines all URL routes for authentication, task operations, and API.
 
 from django.urls import path
 from . import views
+from .metrics import metrics_view
 
 urlpatterns = [
     # Authentication Routes
@@ -24,13 +25,35 @@ urlpatterns = [
     path("pending-task/<int:task_id>/", views.pending_task, name="pending_task"),
     path("delete-task/<int:task_id>/", views.delete_task, name="delete_task"),
     
+    # AJAX variants used by the dashboard (JSON, session + CSRF)
+    path("ajax/tasks/<int:task_id>/complete/", views.ajax_complete_task, name="ajax_complete_task"),
+    path("ajax/tasks/<int:task_id>/pending/", views.ajax_pending_task, name="ajax_pending_task"),
+    path("ajax/tasks/<int:task_id>/delete/", views.ajax_delete_task, name="ajax_delete_task"),
+    path("ajax/tasks/<int:task_id>/series/delete/", views.ajax_delete_series, name="ajax_delete_series"),
+    
     # API Endpoints for CLI
     path("api/login/", views.api_login, name="api_login"),
     path("api/signup/", views.api_signup, name="api_signup"),
     path("api/tasks/", views.api_tasks, name="api_tasks"),
     path("api/tasks/add/", views.api_add_task, name="api_add_task"),
+    path("api/tasks/changes/", views.api_task_changes, name="api_task_changes"),
+    path("api/tasks/bulk/", views.api_bulk_tasks, name="api_bulk_tasks"),
+    path("api/tasks/calendar/", views.api_calendar, name="api_calendar"),
+    path("api/analytics/", views.api_analytics, name="api_analytics"),
+    path("api/jobs/<int:job_id>/", views.api_job_status, name="api_job_status"),
     path("api/tasks/<int:task_id>/complete/", views.api_complete_task, name="api_complete_task"),
     path("api/tasks/<int:task_id>/pending/", views.api_pending_task, name="api_pending_task"),
     path("api/tasks/<int:task_id>/edit/", views.api_edit_task, name="api_edit_task"),
     path("api/tasks/<int:task_id>/delete/", views.api_delete_task, name="api_delete_task"),
+
+    # Whole recurring series, addressed by any of its tasks
+    path("api/tasks/<int:task_id>/series/edit/", views.api_edit_series, name="api_edit_series"),
+    path("api/tasks/<int:task_id>/series/shift/", views.api_shift_series, name="api_shift_series"),
+    path("api/tasks/<int:task_id>/series/delete/", views.api_delete_series, name="api_delete_series"),
+
+    # Subscribable iCalendar feed (secret per-user token instead of a login)
+    path("calendar/<str:token>.ics", views.calendar_feed, name="calendar_feed"),
+
+    # Monitoring (Prometheus scrape target)
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -13,7 +13,18 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
-from .models import Task
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_time
+from .models import ArchivedTask, Job, Task, TaskChange
+from .changes import record_change, record_created, task_payload
+from .routers import use_replica, pin_primary
+from .throttle import throttle_login
+from .jobs import apply_bulk_action, enqueue, job_payload
+from .idempotency import idempotent
+from .ical import feed_token
+from .concurrency import EDIT_FIELDS, VersionConflict, update_task
+from .series import SERIES_FIELDS, delete_series, new_series_id, update_series
 
 
 # =============================================================================
@@ -32,6 +43,7 @@ def login_page(request):
     return render(request, "index.html")
 
 
+@throttle_login
 def do_login(request):
     """
     Handle user login form submission.
@@ -59,6 +71,7 @@ def do_login(request):
     return redirect("/")
 
 
+@throttle_login
 def do_signup(request):
     """
     Handle new user registration.
@@ -109,6 +122,7 @@ def do_logout(request):
 # =============================================================================
 
 @login_required(login_url="/")
+@use_replica
 @ensure_csrf_cookie
 def dashboard_page(request):
     """
@@ -119,7 +133,8 @@ def dashboard_page(request):
     tasks = Task.objects.filter(user=request.user)
     context = {
         'tasks': tasks,
-        'user_name': request.user.first_name or request.user.username
+        'user_name': request.user.first_name or request.user.username,
+        'calendar_feed_url': request.build_absolute_uri(f"/calendar/{feed_token(request.user)}.ics"),
     }
     return render(request, "dashboard.html", context)
 
@@ -129,6 +144,7 @@ def dashboard_page(request):
 # =============================================================================
 
 @login_required(login_url="/")
+@pin_primary
 @csrf_protect
 def add_task(request):
     """
@@ -180,21 +196,37 @@ def add_task(request):
                 # Single, non-recurring task
                 dates_to_create.append(start_date)
 
-            # Flag for recurring status
+            # Flag for recurring status; all occurrences share one series_id
             is_recurring_flag = recurrence != 'none'
-
-            # Create task(s)
-            for d in dates_to_create:
-                Task.objects.create(
-                    user=request.user,
-                    name=name,
-                    project=project,
-                    priority=priority,
-                    due_date=d,
-                    due_time=due_time,
-                    completed=False,
-                    is_recurring=is_recurring_flag
-                )
+            series_id = new_series_id(recurrence)
+
+            # Large expansions are handed to `task_cli worker`
+            if settings.JOB_INLINE_LIMIT and len(dates_to_create) > settings.JOB_INLINE_LIMIT:
+                if parse_time(due_time) is None:
+                    raise ValueError("Invalid due time")
+                enqueue('create_tasks', user=request.user, name=name, project=project, priority=priority,
+                        due_time=due_time, is_recurring=is_recurring_flag,
+                        series_id=str(series_id) if series_id else None,
+                        dates=[d.isoformat() for d in dates_to_create])
+                return redirect("/dashboard/")
+
+            # Create task(s) and their change log rows atomically
+            with transaction.atomic():
+                created = [
+                    Task.objects.create(
+                        user=request.user,
+                        name=name,
+                        project=project,
+                        priority=priority,
+                        due_date=d,
+                        due_time=due_time,
+                        completed=False,
+                        is_recurring=is_recurring_flag,
+                        series_id=series_id
+                    )
+                    for d in dates_to_create
+                ]
+                record_created(created)
             return redirect("/dashboard/")
             
         except Exception as e:
@@ -210,6 +242,7 @@ def add_task(request):
 
 
 @login_required(login_url="/")
+@pin_primary
 def complete_task(request, task_id):
     """
     Mark a task as completed.
@@ -217,15 +250,14 @@ def complete_task(request, task_id):
     Only allows completing tasks owned by the current user.
     """
     try:
-        task = Task.objects.get(id=task_id, user=request.user)
-        task.completed = True
-        task.save()
+        update_task(task_id, {"completed": True}, user=request.user)
     except Task.DoesNotExist:
         pass  # Silently ignore if task doesn't exist or doesn't belong to user
     return redirect("/dashboard/")
 
 
 @login_required(login_url="/")
+@pin_primary
 def pending_task(request, task_id):
     """
     Mark a task as pending (uncomplete).
@@ -233,22 +265,25 @@ def pending_task(request, task_id):
     Only allows modifying tasks owned by the current user.
     """
     try:
-        task = Task.objects.get(id=task_id, user=request.user)
-        task.completed = False
-        task.save()
+        update_task(task_id, {"completed": False}, user=request.user)
     except Task.DoesNotExist:
         pass
     return redirect("/dashboard/")
 
 
 @login_required(login_url="/")
+@pin_primary
 @csrf_protect
 def edit_task(request, task_id):
     """
     Edit an existing task.
     
     Updates task name, project, priority, due date, and due time.
-    Only allows editing tasks owned by the current user.
+    Only allows editing tasks owned by the current user. With
+    scope=series the edit applies to the task's whole recurring series.
+    The form sends the task's `version`; if the task changed since the
+    page was rendered, nothing is saved and the dashboard is shown again
+    (409) with the current values.
     """
     try:
         task = Task.objects.get(id=task_id, user=request.user)
@@ -273,14 +308,28 @@ def edit_task(request, task_id):
             })
 
         try:
-            # Update task fields
-            task.name = name
-            task.project = project
-            task.priority = priority
-            task.due_date = due_date
-            task.due_time = due_time
-            task.save()
+            # Whole series: one UPDATE; a new date moves every occurrence by the same number of days
+            if request.POST.get("scope") == "series" and task.series_id:
+                shift_days = (datetime.strptime(due_date, "%Y-%m-%d").date() - task.due_date).days
+                update_series(task.id, {"name": name, "project": project, "priority": priority,
+                                        "due_time": due_time}, shift_days, user=request.user)
+                return redirect("/dashboard/")
+
+            # Update task fields, unless someone else changed the task meanwhile
+            version = int(request.POST["version"]) if request.POST.get("version") else None
+            update_task(task.id, {
+                "name": name, "project": project, "priority": priority,
+                "due_date": due_date, "due_time": due_time,
+            }, version=version, user=request.user)
             return redirect("/dashboard/")
+        except VersionConflict as e:
+            tasks = Task.objects.filter(user=request.user)
+            return render(request, "dashboard.html", {
+                'tasks': tasks,
+                'user_name': request.user.first_name or request.user.username,
+                'error': f"'{e.task.name}' was changed elsewhere while you were editing it, so your changes "
+                         f"were not saved. The list below is up to date; edit it again if needed.",
+            }, status=409)
         except Exception:
             tasks = Task.objects.filter(user=request.user)
             return render(request, "dashboard.html", {
@@ -293,6 +342,7 @@ def edit_task(request, task_id):
 
 
 @login_required(login_url="/")
+@pin_primary
 def delete_task(request, task_id):
     """
     Delete a task.
@@ -301,13 +351,102 @@ def delete_task(request, task_id):
     Only allows deleting tasks owned by the current user.
     """
     try:
-        task = Task.objects.get(id=task_id, user=request.user)
-        task.delete()
+        with transaction.atomic():
+            task = Task.objects.get(id=task_id, user=request.user)
+            record_change(task.user_id, task.id, 'deleted')
+            task.delete()
     except Task.DoesNotExist:
         pass
     return redirect("/dashboard/")
 
 
+# =============================================================================
+# AJAX ENDPOINTS FOR DASHBOARD
+# =============================================================================
+# JSON variants of the status/delete views above. The dashboard patches the
+# changed row and the stat counters in place instead of reloading the page;
+# the redirecting views stay as its fallback.
+
+from django.db.models import Count, Q
+from django.views.decorators.http import require_POST
+
+
+def _dashboard_counts(user):
+    """Return the dashboard stat counters for a user in a single query."""
+    return Task.objects.filter(user=user).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(completed=True)),
+        high=Count('id', filter=Q(priority='High')),
+    )
+
+
+def _ajax_set_completed(request, task_id, completed):
+    """Flip a task's completed flag with one UPDATE and return the new counters."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "error": "Login required"}, status=401)
+    try:
+        version = update_task(task_id, {"completed": completed}, user=request.user)
+    except Task.DoesNotExist:
+        return JsonResponse({"success": False, "error": "Task not found"}, status=404)
+    return JsonResponse({
+        "success": True,
+        "task": {"id": task_id, "completed": completed, "version": version},
+        "counts": _dashboard_counts(request.user),
+    })
+
+
+@require_POST
+@pin_primary
+@csrf_protect
+def ajax_complete_task(request, task_id):
+    """Mark a task as completed; returns the changed row state and counters."""
+    return _ajax_set_completed(request, task_id, True)
+
+
+@require_POST
+@pin_primary
+@csrf_protect
+def ajax_pending_task(request, task_id):
+    """Mark a task as pending; returns the changed row state and counters."""
+    return _ajax_set_completed(request, task_id, False)
+
+
+@require_POST
+@pin_primary
+@csrf_protect
+def ajax_delete_task(request, task_id):
+    """Delete a task; returns the deleted ID and the new counters."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "error": "Login required"}, status=401)
+    with transaction.atomic():
+        deleted, _ = Task.objects.filter(id=task_id, user=request.user).delete()
+        if deleted:
+            record_change(request.user.id, task_id, 'deleted')
+    if not deleted:
+        return JsonResponse({"success": False, "error": "Task not found"}, status=404)
+    return JsonResponse({
+        "success": True,
+        "task": {"id": task_id, "deleted": True},
+        "counts": _dashboard_counts(request.user),
+    })
+
+
+@require_POST
+@pin_primary
+@csrf_protect
+def ajax_delete_series(request, task_id):
+    """Delete every task in the series of a task; returns the deleted IDs and the new counters."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "error": "Login required"}, status=401)
+    try:
+        ids = delete_series(task_id, user=request.user)
+    except Task.DoesNotExist:
+        return JsonResponse({"success": False, "error": "Task not found"}, status=404)
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+    return JsonResponse({"success": True, "task_ids": ids, "counts": _dashboard_counts(request.user)})
+
+
 # =============================================================================
 # API ENDPOINTS FOR CLI
 # =============================================================================
@@ -317,6 +456,7 @@ from django.views.decorators.csrf import csrf_exempt
 import json
 
 @csrf_exempt
+@throttle_login
 def api_login(request):
     """API endpoint for CLI login."""
     if request.method == "POST":
@@ -340,6 +480,7 @@ def api_login(request):
     return JsonResponse({"error": "POST required"}, status=405)
 
 @csrf_exempt
+@throttle_login
 def api_signup(request):
     """API endpoint for CLI signup."""
     if request.method == "POST":
@@ -369,31 +510,57 @@ def api_signup(request):
     return JsonResponse({"error": "POST required"}, status=405)
 
 @csrf_exempt
+@use_replica
 def api_tasks(request):
-    """API endpoint to list tasks."""
+    """
+    API endpoint to list tasks.
+
+    Pass `include_archived=1` to also return tasks moved to the archive
+    by `task_cli archive`; every task then carries an `archived` flag.
+
+    `status=pending|completed` filters by completion. With `limit`
+    (at most API_PAGE_MAX) tasks are returned in ID order, one page at a
+    time: pass the response's `next` back as `after` to get the following
+    page; `next` is null on the last one.
+    """
     if request.method == "GET":
         email = request.GET.get("email", "")
+        include_archived = request.GET.get("include_archived", "").lower() in ("1", "true", "yes")
+        try:
+            limit = int(request.GET["limit"]) if request.GET.get("limit") else None
+            after = int(request.GET.get("after") or 0)
+        except ValueError:
+            return JsonResponse({"success": False, "error": "limit and after must be integers"}, status=400)
+        if limit is not None and include_archived:
+            return JsonResponse({"success": False, "error": "include_archived can't be combined with limit"},
+                                status=400)
         try:
             user = User.objects.get(username=email)
             tasks = Task.objects.filter(user=user)
-            task_list = []
-            for t in tasks:
-                task_list.append({
-                    "id": t.id,
-                    "name": t.name,
-                    "project": t.project,
-                    "priority": t.priority,
-                    "due_date": str(t.due_date),
-                    "due_time": str(t.due_time),
-                    "completed": t.completed,
-                    "is_recurring": t.is_recurring
-                })
+            status = request.GET.get("status")
+            if status in ("pending", "completed"):
+                tasks = tasks.filter(completed=status == "completed")
+            if limit is not None:
+                limit = max(1, min(limit, settings.API_PAGE_MAX))
+                page = list(tasks.filter(id__gt=after).order_by("id")[:limit + 1])
+                more = len(page) > limit
+                page = page[:limit]
+                return JsonResponse({"success": True, "tasks": [task_payload(t) for t in page],
+                                     "next": page[-1].id if more else None})
+            task_list = [task_payload(t) for t in tasks]
+            if include_archived and status != "pending":  # archived tasks are all completed
+                for t in task_list:
+                    t["archived"] = False
+                task_list += [{**task_payload(t), "archived": True}
+                              for t in ArchivedTask.objects.filter(user=user)]
             return JsonResponse({"success": True, "tasks": task_list})
         except User.DoesNotExist:
             return JsonResponse({"success": False, "error": "User not found"}, status=404)
     return JsonResponse({"error": "GET required"}, status=405)
 
 @csrf_exempt
+@pin_primary
+@idempotent
 def api_add_task(request):
     """API endpoint to add a task."""
     if request.method == "POST":
@@ -401,63 +568,68 @@ def api_add_task(request):
             data = json.loads(request.body)
             user = User.objects.get(username=data.get("email"))
             
-            task = Task.objects.create(
-                user=user,
-                name=data.get("name"),
-                project=data.get("project", "General"),
-                priority=data.get("priority", "Medium"),
-                due_date=data.get("due_date"),
-                due_time=data.get("due_time", "12:00"),
-                completed=False,
-                is_recurring=data.get("is_recurring", False)
-            )
+            with transaction.atomic():
+                task = Task.objects.create(
+                    user=user,
+                    name=data.get("name"),
+                    project=data.get("project", "General"),
+                    priority=data.get("priority", "Medium"),
+                    due_date=data.get("due_date"),
+                    due_time=data.get("due_time", "12:00"),
+                    completed=False,
+                    is_recurring=data.get("is_recurring", False)
+                )
+                record_created([task])
             return JsonResponse({"success": True, "task_id": task.id})
         except Exception as e:
             return JsonResponse({"success": False, "error": str(e)}, status=400)
     return JsonResponse({"error": "POST required"}, status=405)
 
 @csrf_exempt
+@pin_primary
+@idempotent
 def api_complete_task(request, task_id):
     """API endpoint to mark task complete."""
     if request.method == "POST":
         try:
-            task = Task.objects.get(id=task_id)
-            task.completed = True
-            task.save()
-            return JsonResponse({"success": True})
+            version = update_task(task_id, {"completed": True})
+            return JsonResponse({"success": True, "version": version})
         except Task.DoesNotExist:
             return JsonResponse({"success": False, "error": "Task not found"}, status=404)
     return JsonResponse({"error": "POST required"}, status=405)
 
 @csrf_exempt
+@pin_primary
+@idempotent
 def api_pending_task(request, task_id):
     """API endpoint to mark task pending."""
     if request.method == "POST":
         try:
-            task = Task.objects.get(id=task_id)
-            task.completed = False
-            task.save()
-            return JsonResponse({"success": True})
+            version = update_task(task_id, {"completed": False})
+            return JsonResponse({"success": True, "version": version})
         except Task.DoesNotExist:
             return JsonResponse({"success": False, "error": "Task not found"}, status=404)
     return JsonResponse({"error": "POST required"}, status=405)
 
 @csrf_exempt
+@pin_primary
+@idempotent
 def api_edit_task(request, task_id):
-    """API endpoint to edit a task."""
+    """
+    API endpoint to edit a task.
+
+    With "version" in the body the edit only applies if the task is still at
+    that version; otherwise 409 with the current task, for the client to
+    merge and retry.
+    """
     if request.method == "POST":
         try:
             data = json.loads(request.body)
-            task = Task.objects.get(id=task_id)
-            
-            if data.get("name"): task.name = data["name"]
-            if data.get("project"): task.project = data["project"]
-            if data.get("priority"): task.priority = data["priority"]
-            if data.get("due_date"): task.due_date = data["due_date"]
-            if data.get("due_time"): task.due_time = data["due_time"]
-            
-            task.save()
-            return JsonResponse({"success": True})
+            changed = {f: data[f] for f in EDIT_FIELDS if data.get(f)}
+            version = update_task(task_id, changed, version=data.get("version"))
+            return JsonResponse({"success": True, "version": version})
+        except VersionConflict as e:
+            return JsonResponse({"success": False, "error": str(e), "task": task_payload(e.task)}, status=409)
         except Task.DoesNotExist:
             return JsonResponse({"success": False, "error": "Task not found"}, status=404)
         except Exception as e:
@@ -465,13 +637,316 @@ def api_edit_task(request, task_id):
     return JsonResponse({"error": "POST required"}, status=405)
 
 @csrf_exempt
+@pin_primary
+@idempotent
 def api_delete_task(request, task_id):
     """API endpoint to delete a task."""
     if request.method == "POST":
         try:
-            task = Task.objects.get(id=task_id)
-            task.delete()
+            with transaction.atomic():
+                task = Task.objects.get(id=task_id)
+                record_change(task.user_id, task.id, 'deleted')
+                task.delete()
             return JsonResponse({"success": True})
         except Task.DoesNotExist:
             return JsonResponse({"success": False, "error": "Task not found"}, status=404)
     return JsonResponse({"error": "POST required"}, status=405)
+
+def _api_series(request, task_id, action):
+    """Shared body of the series endpoints; `email` in the body limits them to that user's tasks."""
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+    try:
+        data = json.loads(request.body or "{}")
+        user = User.objects.get(username=data["email"]) if data.get("email") else None
+        if action == "delete":
+            ids = delete_series(task_id, user=user)
+        elif action == "shift":
+            ids = update_series(task_id, shift_days=int(data.get("days") or 0), user=user)
+        else:
+            changes = {f: data[f] for f in SERIES_FIELDS if data.get(f)}
+            ids = update_series(task_id, changes, int(data.get("shift_days") or 0), user=user)
+        return JsonResponse({"success": True, "affected": len(ids), "task_ids": ids})
+    except (Task.DoesNotExist, User.DoesNotExist):
+        return JsonResponse({"success": False, "error": "Task not found"}, status=404)
+    except Exception as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+
+@csrf_exempt
+@pin_primary
+@idempotent
+def api_edit_series(request, task_id):
+    """
+    API endpoint to edit every task in a task's recurring series at once.
+
+    Body: any of name, project, priority, due_time, plus `shift_days` to
+    move every due date; applied with one UPDATE.
+    """
+    return _api_series(request, task_id, "edit")
+
+@csrf_exempt
+@pin_primary
+@idempotent
+def api_shift_series(request, task_id):
+    """API endpoint to move every due date of a task's series by `days` (may be negative)."""
+    return _api_series(request, task_id, "shift")
+
+@csrf_exempt
+@pin_primary
+@idempotent
+def api_delete_series(request, task_id):
+    """API endpoint to delete every task of a task's series with one DELETE."""
+    return _api_series(request, task_id, "delete")
+
+@csrf_exempt
+@pin_primary
+@idempotent
+def api_bulk_tasks(request):
+    """
+    API endpoint to complete, reopen or delete many tasks at once.
+
+    Body: {"email": ..., "action": "complete" | "pending" | "delete", "task_ids": [...]}.
+    Selections larger than JOB_INLINE_LIMIT are queued for `task_cli worker`
+    and answered with 202 and a job status URL.
+    """
+    if request.method == "POST":
+        try:
+            data = json.loads(request.body)
+            user = User.objects.get(username=data.get("email"))
+            action = data.get("action")
+            task_ids = [int(i) for i in data.get("task_ids", [])]
+            if action not in ("complete", "pending", "delete"):
+                return JsonResponse({"success": False, "error": "Unknown action"}, status=400)
+
+            if settings.JOB_INLINE_LIMIT and len(task_ids) > settings.JOB_INLINE_LIMIT:
+                job = enqueue('bulk_tasks', user=user, action=action, task_ids=task_ids)
+                return JsonResponse({
+                    "success": True,
+                    "job_id": job.id,
+                    "status_url": f"/api/jobs/{job.id}/",
+                }, status=202)
+
+            ids = apply_bulk_action(user, action, task_ids)
+            return JsonResponse({"success": True, "affected": len(ids), "task_ids": ids})
+        except User.DoesNotExist:
+            return JsonResponse({"success": False, "error": "User not found"}, status=404)
+        except Exception as e:
+            return JsonResponse({"success": False, "error": str(e)}, status=400)
+    return JsonResponse({"error": "POST required"}, status=405)
+
+@csrf_exempt
+def api_job_status(request, job_id):
+    """API endpoint to poll a background job (web session or ?email=)."""
+    if request.method == "GET":
+        user = request.user if request.user.is_authenticated else None
+        if user is None:
+            user = User.objects.filter(username=request.GET.get("email", "")).first()
+        job = Job.objects.filter(id=job_id, user=user).first() if user else None
+        if job is None:
+            return JsonResponse({"success": False, "error": "Job not found"}, status=404)
+        return JsonResponse({"success": True, "job": job_payload(job)})
+    return JsonResponse({"error": "GET required"}, status=405)
+
+
+# =============================================================================
+# CALENDAR
+# =============================================================================
+# A date-range view for week/month calendars, and the subscribable .ics feed
+# (see accounts/ical.py).
+
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from .ical import feed_etag, feed_user, ics_chunks
+
+
+@csrf_exempt
+@use_replica
+def api_calendar(request):
+    """
+    API endpoint for tasks due between `from` and `to` (inclusive, YYYY-MM-DD).
+
+    Authenticates with the web session or `?email=`. Returns
+    {"days": {"2030-01-31": [task, ...], ...}}: only days that have tasks,
+    in date order, each day's tasks by due time. At most CALENDAR_MAX_DAYS
+    days per request.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET required"}, status=405)
+    try:
+        start, end = parse_date(request.GET.get("from", "")), parse_date(request.GET.get("to", ""))
+    except ValueError:
+        start = end = None
+    if start is None or end is None:
+        return JsonResponse({"success": False, "error": "from and to must be dates (YYYY-MM-DD)"}, status=400)
+    if not 0 <= (end - start).days < settings.CALENDAR_MAX_DAYS:
+        return JsonResponse({"success": False, "error": f"from..to must be 1 to {settings.CALENDAR_MAX_DAYS} days"},
+                            status=400)
+
+    user = request.user if request.user.is_authenticated else None
+    if user is None:
+        user = User.objects.filter(username=request.GET.get("email", "")).first()
+        if user is None:
+            return JsonResponse({"success": False, "error": "User not found"}, status=404)
+
+    days = {}
+    tasks = Task.objects.filter(user=user, due_date__range=(start, end)).order_by("due_date", "due_time", "id")
+    for task in tasks:
+        days.setdefault(str(task.due_date), []).append(task_payload(task))
+    return JsonResponse({"success": True, "from": str(start), "to": str(end), "days": days})
+
+
+@use_replica
+def calendar_feed(request, token):
+    """The user's tasks as a streamed iCalendar feed; 304 while its ETag still matches."""
+    if request.method not in ("GET", "HEAD"):
+        return JsonResponse({"error": "GET required"}, status=405)
+    user = feed_user(token)
+    if user is None:
+        raise Http404("Unknown calendar feed")
+    etag = feed_etag(user.id)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = StreamingHttpResponse(ics_chunks(user), content_type="text/calendar; charset=utf-8")
+        response["Content-Disposition"] = 'inline; filename="taskcli.ics"'
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)  # always revalidate; the URL is a secret
+    return response
+
+
+# =============================================================================
+# ANALYTICS
+# =============================================================================
+# Weekly completion rate, on-time vs. late and per-project throughput
+# (see accounts/analytics.py).
+
+from .analytics import report as analytics_report
+
+
+@csrf_exempt
+@use_replica
+def api_analytics(request):
+    """
+    API endpoint for the productivity report over the last `weeks` weeks
+    (default 12, at most ANALYTICS_MAX_WEEKS), this week included.
+
+    Authenticates with the web session or `?email=`.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET required"}, status=405)
+    try:
+        weeks = int(request.GET.get("weeks", 12))
+    except ValueError:
+        weeks = 0
+    if not 1 <= weeks <= settings.ANALYTICS_MAX_WEEKS:
+        return JsonResponse({"success": False, "error": f"weeks must be 1 to {settings.ANALYTICS_MAX_WEEKS}"},
+                            status=400)
+
+    user = request.user if request.user.is_authenticated else None
+    if user is None:
+        user = User.objects.filter(username=request.GET.get("email", "")).first()
+        if user is None:
+            return JsonResponse({"success": False, "error": "User not found"}, status=404)
+    return JsonResponse({"success": True, **analytics_report(user, weeks)})
+
+
+# =============================================================================
+# CHANGE FEED (SERVER-SENT EVENTS)
+# =============================================================================
+# Async view: under ASGI (taskcli.asgi) an idle feed connection costs no
+# worker thread. Under WSGI a blocking stream is served instead, which holds
+# a worker, so every stream ends after CHANGE_FEED_MAX_SECONDS and the
+# client reconnects with Last-Event-ID.
+
+import asyncio
+import time
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+
+def _sse_event(change):
+    """Format a TaskChange as one Server-Sent Event."""
+    payload = json.dumps({
+        "action": change.action,
+        "task_id": change.task_id,
+        "data": change.data,
+        "at": change.created_at.isoformat(),
+    })
+    return f"id: {change.id}\nevent: task\ndata: {payload}\n\n"
+
+
+def _poll_changes(user_id, last_id):
+    """Return (events, new last_id) for the user's changes after `last_id`."""
+    changes = list(
+        TaskChange.objects.filter(user_id=user_id, id__gt=last_id).order_by('id')[:settings.CHANGE_FEED_BATCH_SIZE]
+    )
+    if not changes:
+        return [], last_id
+    return [_sse_event(change) for change in changes], changes[-1].id
+
+
+async def _change_stream(user_id, last_id):
+    """Yield SSE events after `last_id` without holding a thread while idle."""
+    deadline = time.monotonic() + settings.CHANGE_FEED_MAX_SECONDS
+    idle = 0.0
+    yield f"retry: {settings.CHANGE_FEED_RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        events, last_id = await sync_to_async(_poll_changes)(user_id, last_id)
+        for event in events:
+            yield event
+        if events:
+            idle = 0.0
+            continue
+        await asyncio.sleep(settings.CHANGE_FEED_POLL_SECONDS)
+        idle += settings.CHANGE_FEED_POLL_SECONDS
+        if idle >= settings.CHANGE_FEED_HEARTBEAT_SECONDS:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+
+
+def _change_stream_sync(user_id, last_id):
+    """Blocking variant of _change_stream for WSGI servers."""
+    deadline = time.monotonic() + settings.CHANGE_FEED_MAX_SECONDS
+    idle = 0.0
+    yield f"retry: {settings.CHANGE_FEED_RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        events, last_id = _poll_changes(user_id, last_id)
+        yield from events
+        if events:
+            idle = 0.0
+            continue
+        time.sleep(settings.CHANGE_FEED_POLL_SECONDS)
+        idle += settings.CHANGE_FEED_POLL_SECONDS
+        if idle >= settings.CHANGE_FEED_HEARTBEAT_SECONDS:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+
+
+async def api_task_changes(request):
+    """
+    Stream the user's task changes as Server-Sent Events.
+
+    Authenticates with the web session, or with `?email=` like the other
+    CLI API endpoints. Resumes after the `Last-Event-ID` header (or
+    `?last_event_id=`); without one, only changes from now on are sent.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "GET required"}, status=405)
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        try:
+            user = await User.objects.aget(username=request.GET.get("email", ""))
+        except User.DoesNotExist:
+            return JsonResponse({"success": False, "error": "User not found"}, status=404)
+
+    try:
+        last_id = int(request.headers.get("Last-Event-ID") or request.GET["last_event_id"])
+    except (KeyError, ValueError):
+        last_id = await TaskChange.objects.filter(user=user).order_by('-id').values_list('id', flat=True).afirst() or 0
+
+    stream = _change_stream if isinstance(request, ASGIRequest) else _change_stream_sync
+    response = StreamingHttpResponse(stream(user.id, last_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Disable proxy buffering
+    return response
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Analytics Report Benchmark
+==========================
+Time to build the productivity report (accounts/analytics.py) for one user
+with N tasks, in a temporary SQLite database seeded by accounts.seed:
+
+- objects: Task instances iterated from the ORM and counted in Python (the
+           per-object loop the report replaces)
+- python:  grouped values_list() columns, counted in one pure-Python pass
+- numpy:   grouped values_list() columns, counted with NumPy (if installed)
+
+Each row splits the time into fetching the rows and counting them (best
+of --runs).
+
+USAGE:
+------
+    cd backend
+    python benchmarks/analytics_report.py --tasks 1000000
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup():
+    tmpdir = tempfile.mkdtemp(prefix="taskcli-bench-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.sqlite3",
+        "DJANGO_SQLITE_TUNING": "true",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+    })
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+
+
+def best(func, runs):
+    """(best seconds, last result) of `runs` calls."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def object_counts(user, start, end):
+    """The old way: one model instance per task."""
+    from accounts.models import Task
+    weeks, projects, late = Counter(), Counter(), Counter()
+    for task in Task.objects.filter(user=user, due_date__range=(start, end)):
+        weeks[(task.due_date - start).days // 7] += 1
+        projects[task.project] += task.completed
+        if task.completed and task.completed_at:
+            late[(task.completed_at.date() - task.due_date).days > 0] += 1
+    return weeks, projects, late
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000000, help="Tasks of the measured user")
+    parser.add_argument("--weeks", type=int, default=80, help="Report window; the seed spans ~65 weeks")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per variant")
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth.models import User
+    from accounts import analytics
+    from accounts.seed import seed
+
+    start = time.perf_counter()
+    seed(users=1, tasks_per_user=args.tasks, prefix="bench")
+    print(f"Seeded {args.tasks:,} tasks in {time.perf_counter() - start:.1f}s")
+    user = User.objects.get(username="bench-0@example.com")
+    first, last = analytics.window(args.weeks)
+
+    fetch_s, cols = best(lambda: analytics.columns(user, first, last), args.runs)
+    print(f"{sum(cols[4]):,} tasks in the {args.weeks}-week window, fetched as {len(cols[0]):,} grouped rows\n")
+    print(f"{'variant':<9} {'fetch s':>8} {'count s':>8} {'total s':>8}")
+    objects_s, _ = best(lambda: object_counts(user, first, last), args.runs)
+    print(f"{'objects':<9} {'':>8} {'':>8} {objects_s:>8.2f}")
+
+    engines = ["python", "numpy"] if analytics.np is not None else ["python"]
+    counters = {"python": analytics._python_counts, "numpy": analytics._numpy_counts}
+    today = date.today()
+    for engine in engines:
+        count_s, _ = best(lambda: counters[engine](cols, first, args.weeks, today), args.runs)
+        print(f"{engine:<9} {fetch_s:>8.2f} {count_s:>8.2f} {fetch_s + count_s:>8.2f}")
+    if analytics.np is None:
+        print("\nNumPy is not installed; pip install numpy to measure it.")
+
+
+if __name__ == "__main__":
+    main()
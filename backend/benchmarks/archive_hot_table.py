@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Task Archive Benchmark
+======================
+Seeds one user with N tasks in a temporary SQLite database (by default 95%
+completed and due long ago, the rest pending), then reports hot-table size
+and dashboard / task-list latency before and after
+`task_cli archive --older-than 30`.
+
+Requests go through Django's test client in-process, so the numbers are
+view + ORM + template time without any HTTP server in the way.
+
+USAGE:
+------
+    cd backend
+    python benchmarks/archive_hot_table.py --tasks 50000 --completed 0.95
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_EMAIL = "bench@example.com"
+
+
+def setup():
+    sys.path.insert(0, str(BACKEND_DIR))
+    tmpdir = tempfile.mkdtemp(prefix="taskcli-bench-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.sqlite3",
+        "DJANGO_SQLITE_TUNING": "true",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+    })
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+
+
+def seed(args):
+    from django.contrib.auth.models import User
+    from accounts.models import Task
+
+    user = User.objects.create_user(BENCH_EMAIL, BENCH_EMAIL, "bench123")
+    rng = random.Random(42)
+    today = date.today()
+    batch = []
+    for i in range(args.tasks):
+        done = rng.random() < args.completed
+        due = today - timedelta(days=rng.randrange(60, 720)) if done else today + timedelta(days=rng.randrange(30))
+        batch.append(Task(user=user, name=f"Task {i}", project="Bench", due_date=due,
+                          due_time="12:00", completed=done))
+        if len(batch) == 10000:
+            Task.objects.bulk_create(batch)
+            batch = []
+    Task.objects.bulk_create(batch)
+
+
+def measure(label, client, requests):
+    from accounts.archive import table_size
+    from accounts.models import Task
+
+    rows, size = table_size(Task)
+    results = []
+    for url in ("/dashboard/", f"/api/tasks/?email={BENCH_EMAIL}"):
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get(url, HTTP_HOST="localhost")
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        results.append(f"{url.split('?')[0]} p50={timings[len(timings) // 2] * 1000:7.1f}ms")
+    size = f"{size / 1024 / 1024:6.1f} MB" if size is not None else "size n/a"
+    print(f"{label:<7} hot rows={rows:>8} hot size={size}  " + "  ".join(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50_000, help="tasks for the benchmark user")
+    parser.add_argument("--completed", type=float, default=0.95, help="fraction completed and due long ago")
+    parser.add_argument("--requests", type=int, default=10, help="requests per URL per phase")
+    args = parser.parse_args()
+
+    setup()
+    from django.core.management import call_command
+    from django.test import Client
+
+    seed(args)
+    client = Client()
+    client.login(username=BENCH_EMAIL, password="bench123")
+
+    measure("before", client, args.requests)
+    start = time.perf_counter()
+    call_command("task_cli", "archive", "--older-than", "30", "--batch-size", "1000", stdout=StringIO())
+    print(f"archive took {time.perf_counter() - start:.1f}s")
+    measure("after", client, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Batch Mode vs Per-Process Benchmark
+===================================
+Compares two ways a script can create N tasks in a temporary SQLite
+database:
+
+- per-process: one `python manage.py task_cli add ...` per task, the way a
+  shell loop around taskcli.sh / manage.py drives the CLI (Django setup,
+  app loading and a new DB connection every time)
+- batch: one `python manage.py task_cli batch` reading N NDJSON `add`
+  commands from stdin
+
+Both run as real subprocesses, so startup cost is included.
+
+USAGE:
+------
+    cd backend
+    python benchmarks/batch_vs_process.py --process-tasks 50 --batch-tasks 20000
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_EMAIL = "bench@example.com"
+
+
+def manage(env, *args, **kwargs):
+    return subprocess.run([sys.executable, "manage.py", *args], cwd=BACKEND_DIR, env=env, check=True,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **kwargs)
+
+
+def setup():
+    tmpdir = tempfile.mkdtemp(prefix="taskcli-bench-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.sqlite3",
+        "DJANGO_SQLITE_TUNING": "true",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+    }
+    manage(env, "migrate", "--verbosity", "0")
+    manage(env, "shell", "-c",
+           f"from django.contrib.auth.models import User; User.objects.create_user('{BENCH_EMAIL}', '{BENCH_EMAIL}', 'x')")
+    return env
+
+
+def per_process(env, n):
+    start = time.perf_counter()
+    for i in range(n):
+        manage(env, "task_cli", "add", f"Process task {i}", "--user", BENCH_EMAIL, "--due_date", "2030-01-01")
+    return time.perf_counter() - start
+
+
+def batch(env, n, group_size):
+    commands = "".join(
+        json.dumps({"op": "add", "user": BENCH_EMAIL, "name": f"Batch task {i}", "due_date": "2030-01-01"}) + "\n"
+        for i in range(n)
+    )
+    start = time.perf_counter()
+    result = manage(env, "task_cli", "batch", "--group-size", str(group_size), input=commands)
+    elapsed = time.perf_counter() - start
+    failed = sum(not json.loads(line)["ok"] for line in result.stdout.splitlines())
+    return elapsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--process-tasks", type=int, default=50, help="Tasks created one process each")
+    parser.add_argument("--batch-tasks", type=int, default=20000, help="Tasks created in one batch process")
+    parser.add_argument("--group-size", type=int, default=500, help="Writes per transaction in batch mode")
+    args = parser.parse_args()
+
+    env = setup()
+    print(f"{'mode':<12} {'tasks':>7} {'seconds':>9} {'tasks/s':>10} {'ms/task':>9}")
+    seconds = per_process(env, args.process_tasks)
+    print(f"{'per-process':<12} {args.process_tasks:>7} {seconds:>9.2f} {args.process_tasks / seconds:>10.1f} "
+          f"{seconds / args.process_tasks * 1000:>9.2f}")
+    seconds, failed = batch(env, args.batch_tasks, args.group_size)
+    print(f"{'batch':<12} {args.batch_tasks:>7} {seconds:>9.2f} {args.batch_tasks / seconds:>10.1f} "
+          f"{seconds / args.batch_tasks * 1000:>9.2f}" + (f"  ({failed} failed)" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
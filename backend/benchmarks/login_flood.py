@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Login Flood Load Test
+=====================
+Measures dashboard latency for a logged-in user in three phases:
+
+1. baseline          - dashboard requests only
+2. flood, unthrottled - plus N threads posting bad passwords to /api/login/
+3. flood, throttled   - same flood with LOGIN_THROTTLE enabled
+
+Without throttling every bad login burns a worker on PBKDF2 and dashboard
+latency climbs; with throttling the flood gets cheap 429s and latency
+should stay close to baseline.
+
+USAGE:
+------
+    cd backend
+    python benchmarks/login_flood.py --workers 2 --flooders 16 --seconds 10
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_EMAIL = "bench@example.com"
+
+SETUP_SCRIPT = f"""
+from django.contrib.auth.models import User
+from django.test import Client
+from accounts.models import Task
+user = User.objects.create_user('{BENCH_EMAIL}', '{BENCH_EMAIL}', 'bench123')
+Task.objects.bulk_create([
+    Task(user=user, name=f'Task {{i}}', project='Bench', due_date='2030-01-01', due_time='12:00')
+    for i in range(50)
+])
+client = Client()
+client.login(username='{BENCH_EMAIL}', password='bench123')
+print(client.cookies['sessionid'].value)
+"""
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else float("nan")
+
+
+def run_phase(args, env, label, flood):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "taskcli.wsgi", "--workers", str(args.workers),
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{base}/", timeout=1).read()
+            break
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+
+    deadline = time.monotonic() + args.seconds
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+
+    def dashboard():
+        req = urllib.request.Request(f"{base}/dashboard/", headers={"Cookie": f"sessionid={env['BENCH_SESSION']}"})
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            urllib.request.urlopen(req, timeout=60).read()
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    def flooder():
+        body = json.dumps({"email": BENCH_EMAIL, "password": "wrong-password"}).encode()
+        while time.monotonic() < deadline:
+            req = urllib.request.Request(f"{base}/api/login/", data=body,
+                                         headers={"Content-Type": "application/json"})
+            try:
+                status = urllib.request.urlopen(req, timeout=60).status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except (urllib.error.URLError, ConnectionError):
+                status = "error"
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+
+    threads = [threading.Thread(target=dashboard)]
+    if flood:
+        threads += [threading.Thread(target=flooder) for _ in range(args.flooders)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.terminate()
+    server.wait()
+
+    latencies.sort()
+    print(f"{label:<20} dashboard p50={percentile(latencies, 0.5):7.1f}ms "
+          f"p95={percentile(latencies, 0.95):7.1f}ms max={percentile(latencies, 1.0):7.1f}ms "
+          f"login responses={statuses or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--flooders", type=int, default=16, help="concurrent bad-login threads")
+    parser.add_argument("--seconds", type=float, default=10, help="duration of each phase")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="taskcli-bench-")
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.sqlite3",
+        "DJANGO_SQLITE_TUNING": "true",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+    })
+    subprocess.run([sys.executable, "manage.py", "migrate", "--noinput"], cwd=BACKEND_DIR, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+    env["BENCH_SESSION"] = subprocess.run(
+        [sys.executable, "manage.py", "shell", "-c", SETUP_SCRIPT],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout.strip().splitlines()[-1]
+
+    run_phase(args, env, "baseline", flood=False)
+    run_phase(args, {**env, "DJANGO_LOGIN_THROTTLE": "false"}, "flood, unthrottled", flood=True)
+    run_phase(args, {**env, "DJANGO_LOGIN_THROTTLE": "true"}, "flood, throttled", flood=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+PostgreSQL Connection Pool Load Test
+====================================
+Runs gunicorn (gthread workers) against a local PostgreSQL database twice:
+once with persistent per-thread connections (CONN_MAX_AGE=600) and once
+with the native psycopg pool (DJANGO_DB_POOL=true). For each run it reports
+request throughput, latency percentiles and the peak number of server
+connections seen in pg_stat_activity.
+
+USAGE:
+------
+    cd backend
+    createdb taskcli_bench
+    pip install "psycopg[binary,pool]"
+    DATABASE_URL=postgresql://localhost/taskcli_bench \\
+        python benchmarks/pg_pool_load.py --workers 4 --threads 8 --clients 64
+
+Pool checkout/wait statistics are logged by the workers every
+DJANGO_DB_POOL_STATS_INTERVAL seconds (see accounts/db.py).
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_EMAIL = "bench@example.com"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_connections(database_url):
+    """Return the number of connections to the benchmark database."""
+    import psycopg
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        row = conn.execute(
+            "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()"
+        ).fetchone()
+    return row[0] - 1  # exclude this monitoring connection
+
+
+def run_mode(args, pooled):
+    env = dict(os.environ)
+    env.update({
+        "DJANGO_DB_POOL": "true" if pooled else "false",
+        "DJANGO_DB_POOL_MAX_SIZE": str(args.pool_max),
+        "DJANGO_DB_POOL_STATS_INTERVAL": "5",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+    })
+
+    subprocess.run([sys.executable, "manage.py", "migrate", "--noinput"], cwd=BACKEND_DIR, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+    subprocess.run([sys.executable, "manage.py", "shell", "-c",
+                    "from django.contrib.auth.models import User; "
+                    f"User.objects.filter(username='{BENCH_EMAIL}').exists() or "
+                    f"User.objects.create_user('{BENCH_EMAIL}', '{BENCH_EMAIL}', 'bench123')"],
+                   cwd=BACKEND_DIR, env=env, check=True)
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "taskcli.wsgi", "--worker-class", "gthread",
+         "--workers", str(args.workers), "--threads", str(args.threads),
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}/api/tasks/?email={BENCH_EMAIL}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            break
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+
+    latencies, errors, peak = [], [0], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    def client():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=30).read()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except (urllib.error.URLError, ConnectionError):
+                with lock:
+                    errors[0] += 1
+
+    def monitor():
+        while time.monotonic() < deadline:
+            peak[0] = max(peak[0], server_connections(env["DATABASE_URL"]))
+            time.sleep(0.5)
+
+    threads = [threading.Thread(target=client) for _ in range(args.clients)]
+    threads.append(threading.Thread(target=monitor))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.terminate()
+    server.wait()
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")
+    label = "native pool" if pooled else "persistent conns"
+    print(f"{label:<17} req/s={len(latencies) / args.seconds:8.1f} errors={errors[0]:<4} "
+          f"p50={pct(0.50):7.1f}ms p95={pct(0.95):7.1f}ms p99={pct(0.99):7.1f}ms "
+          f"peak_server_conns={peak[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="threads per gunicorn worker")
+    parser.add_argument("--clients", type=int, default=64, help="concurrent HTTP client threads")
+    parser.add_argument("--pool-max", type=int, default=4, help="DJANGO_DB_POOL_MAX_SIZE per worker")
+    parser.add_argument("--seconds", type=float, default=20, help="duration of each run")
+    args = parser.parse_args()
+
+    if not os.environ.get("DATABASE_URL", "").startswith("postgres"):
+        parser.error("DATABASE_URL must point at a local PostgreSQL database")
+
+    for pooled in (False, True):
+        run_mode(args, pooled)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Reminder Scheduler Benchmark
+============================
+Bulk-inserts N pending tasks (default 1M) with due times spread over the
+next few days into a temporary SQLite database, then measures:
+
+1. heap load   - one indexed range query for the lookahead window
+2. firing      - popping every instant in the window and sending its
+                 reminders to a null sink (the clock is advanced, not slept)
+3. webhook     - the same firing against a local HTTP stand-in, for a
+                 smaller sample, to show per-reminder sink cost
+
+USAGE:
+------
+    cd backend
+    python benchmarks/reminder_scheduler.py --tasks 1000000 --lookahead 60
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class NullSink:
+    def __init__(self):
+        self.count = 0
+
+    def send(self, payload):
+        self.count += 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def setup(args):
+    sys.path.insert(0, str(BACKEND_DIR))
+    tmpdir = tempfile.mkdtemp(prefix="taskcli-bench-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.sqlite3",
+        "DJANGO_SQLITE_TUNING": "true",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+        "DJANGO_REMINDER_LOOKAHEAD_MINUTES": str(args.lookahead),
+        "DJANGO_LOG_LEVEL": "WARNING",
+    })
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+
+
+def seed(args, start):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from accounts.models import Task
+
+    user = User.objects.create_user("bench@example.com", "bench@example.com", "bench123")
+    rng = random.Random(42)
+    spread = args.days * 24 * 60
+    began = time.perf_counter()
+    batch = []
+    for i in range(args.tasks):
+        due = timezone.localtime(start + timedelta(minutes=rng.randrange(spread)))
+        batch.append(Task(user=user, name=f"Task {i}", project="Bench",
+                          due_date=due.date(), due_time=due.time()))
+        if len(batch) == 10000:
+            Task.objects.bulk_create(batch)
+            batch = []
+    Task.objects.bulk_create(batch)
+    elapsed = time.perf_counter() - began
+    print(f"seeded {args.tasks} pending tasks over {args.days} days in {elapsed:.1f}s")
+
+
+def fire_window(scheduler, start, minutes):
+    """Advance the fake clock minute by minute through the lookahead window."""
+    now = [start]
+    scheduler.clock = lambda: now[0]
+    scheduler.tick()
+    began = time.perf_counter()
+    for _ in range(minutes):
+        now[0] += timedelta(minutes=1)
+        scheduler.tick()
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="pending tasks to insert")
+    parser.add_argument("--days", type=int, default=7, help="spread due times over this many days")
+    parser.add_argument("--lookahead", type=int, default=60, help="scheduler lookahead in minutes")
+    parser.add_argument("--webhook-minutes", type=int, default=5, help="minutes of reminders sent to the stand-in")
+    args = parser.parse_args()
+
+    setup(args)
+    from django.utils import timezone
+    from accounts.models import Task
+    from accounts.reminders import ReminderScheduler, WebhookSink
+
+    start = timezone.now().replace(second=0, microsecond=0)
+    seed(args, start)
+
+    sink = NullSink()
+    scheduler = ReminderScheduler(sink, name="bench", clock=lambda: start)
+    scheduler.acquire_lease(start)
+    began = time.perf_counter()
+    scheduler.load(start)
+    load_ms = (time.perf_counter() - began) * 1000
+    print(f"heap load: {len(scheduler.heap)} instants in the next {args.lookahead} min in {load_ms:.1f}ms")
+
+    window = (Task.objects.filter(completed=False, due_date__gte=start.date())
+              .order_by('due_date', 'due_time').values_list('due_date', 'due_time').distinct()[:1000])
+    print("plan:", window.explain().replace("\n", "; "))
+
+    elapsed = fire_window(scheduler, start, args.lookahead)
+    print(f"firing (null sink): {sink.count} reminders in {elapsed:.2f}s "
+          f"({sink.count / elapsed:,.0f}/s)")
+
+    server = HTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    webhook = WebhookSink(url=f"http://127.0.0.1:{server.server_port}/hook")
+    counted = NullSink()
+
+    class CountingWebhook:
+        def send(self, payload):
+            counted.send(payload)
+            webhook.send(payload)
+
+    after = start + timedelta(minutes=args.lookahead)
+    scheduler = ReminderScheduler(CountingWebhook(), name="bench-webhook", clock=lambda: after)
+    elapsed = fire_window(scheduler, after, args.webhook_minutes)
+    server.shutdown()
+    print(f"firing (webhook stand-in): {counted.count} reminders in {elapsed:.2f}s "
+          f"({counted.count / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
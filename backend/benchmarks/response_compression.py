@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Response Compression Benchmark
+==============================
+Bytes on the wire for one dashboard load of a user with N tasks, in a
+temporary SQLite database, for each Accept-Encoding:
+
+- first:  the page as sent by CompressionMiddleware + dashboard.js +
+          style.css (as WhiteNoise serves them from collectstatic output:
+          hashed names, pre-compressed .gz/.br)
+- repeat: the page only; the hashed assets are cached by the browser
+- before: the old page (script inlined in the HTML), nothing compressed
+
+Also reports the server time spent compressing the page (best of --runs).
+
+USAGE:
+------
+    cd backend
+    python benchmarks/response_compression.py --tasks 1000 10000
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ENCODINGS = ["identity", "gzip", "br"]
+ASSETS = ["dashboard.js", "style.css"]
+
+
+def setup():
+    tmpdir = tempfile.mkdtemp(prefix="taskcli-bench-")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.sqlite3",
+        "DJANGO_SQLITE_TUNING": "true",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+    })
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.management import call_command
+    settings.STATIC_ROOT = f"{tmpdir}/static"
+    call_command("migrate", verbosity=0)
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return settings.STATIC_ROOT
+
+
+def asset_bytes(static_root):
+    """{encoding: total bytes of the hashed assets} as WhiteNoise would send them."""
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    totals = dict.fromkeys(ENCODINGS, 0)
+    for name in ASSETS:
+        path = Path(static_root, staticfiles_storage.stored_name(name))
+        totals["identity"] += path.stat().st_size
+        for encoding, suffix in (("gzip", ".gz"), ("br", ".br")):
+            compressed = path.with_name(path.name + suffix)
+            totals[encoding] += compressed.stat().st_size if compressed.exists() else path.stat().st_size
+    return totals
+
+
+def dashboard(client, encoding):
+    """Body of the dashboard response, as sent."""
+    response = client.get("/dashboard/", HTTP_ACCEPT_ENCODING=encoding)
+    assert response.status_code == 200, response.status_code
+    assert response.get("Content-Encoding", "identity") == encoding, response.get("Content-Encoding")
+    return response.content
+
+
+def compress_ms(body, encoding, runs):
+    from accounts.compression import compress
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        compress(body, encoding)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10000], help="Task counts to measure")
+    parser.add_argument("--runs", type=int, default=5, help="Requests per encoding")
+    args = parser.parse_args()
+
+    static_root = setup()
+    from django.test import Client
+    from accounts.seed import seed
+    from accounts import compression
+
+    encodings = ENCODINGS if compression.brotli else ENCODINGS[:2]
+    assets = asset_bytes(static_root)
+    script_bytes = (BACKEND_DIR.parent / "frontend" / "static" / "dashboard.js").stat().st_size
+    style_bytes = (BACKEND_DIR.parent / "frontend" / "static" / "style.css").stat().st_size
+
+    for n in args.tasks:
+        prefix = f"bench{n}"
+        seed(users=1, tasks_per_user=n, prefix=prefix, recurring=0)
+        client = Client(SERVER_NAME="localhost")
+        client.login(username=f"{prefix}-0@example.com", password="password123")
+        page = dashboard(client, "identity")
+        before = len(page) + script_bytes + style_bytes
+
+        print(f"\n{n} tasks (before: {before / 1024:.1f} KiB every load)")
+        print(f"{'encoding':<10} {'first KiB':>10} {'repeat KiB':>11} {'vs before':>10} {'compress ms':>12}")
+        for encoding in encodings:
+            size = len(dashboard(client, encoding))
+            ms = compress_ms(page, encoding, args.runs) if encoding != "identity" else 0
+            print(f"{encoding:<10} {(size + assets[encoding]) / 1024:>10.1f} {size / 1024:>11.1f} "
+                  f"{size / before:>10.1%} {ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
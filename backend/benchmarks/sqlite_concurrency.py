@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+SQLite Concurrency Benchmark
+============================
+Runs gunicorn workers serving `api_tasks` while several `task_cli add`
+writers hammer the same SQLite file, once with the default rollback journal
+and once with the SQLITE_TUNING profile (WAL, busy_timeout, ...).
+
+Reports reader latency percentiles plus reader/writer error counts
+("database is locked") for each mode.
+
+USAGE:
+------
+    cd backend
+    python benchmarks/sqlite_concurrency.py --workers 4 --writers 4 --seconds 20
+
+Requires gunicorn (already in requirements.txt).
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_EMAIL = "bench@example.com"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def writer_loop(seconds):
+    """Child process: call task_cli add in a loop, print "<ok> <errors>"."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "taskcli.settings")
+    import django
+    django.setup()
+    from io import StringIO
+    from django.core.management import call_command
+    from django.db import OperationalError
+
+    ok = errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            call_command("task_cli", "add", "Bench task", "--user", BENCH_EMAIL, stdout=StringIO())
+            ok += 1
+        except OperationalError:
+            errors += 1
+    print(ok, errors)
+
+
+def run_mode(args, tuned):
+    tmpdir = tempfile.mkdtemp(prefix="taskcli-bench-")
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{tmpdir}/bench.sqlite3",
+        "DJANGO_SQLITE_TUNING": "true" if tuned else "false",
+        "DJANGO_SETTINGS_MODULE": "taskcli.settings",
+    })
+
+    def manage(*cmd):
+        subprocess.run([sys.executable, "manage.py", *cmd], cwd=BACKEND_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+
+    manage("migrate", "--noinput")
+    manage("shell", "-c",
+           f"from django.contrib.auth.models import User; User.objects.create_user('{BENCH_EMAIL}', '{BENCH_EMAIL}', 'bench123')")
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "taskcli.wsgi", "--workers", str(args.workers),
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}/api/tasks/?email={BENCH_EMAIL}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            break
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+
+    writers = [
+        subprocess.Popen([sys.executable, __file__, "--writer", "--seconds", str(args.seconds)],
+                         cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(args.writers)
+    ]
+
+    latencies, read_errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    def reader():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(url, timeout=30).read()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except (urllib.error.URLError, ConnectionError):
+                with lock:
+                    read_errors[0] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    writes = write_errors = 0
+    for w in writers:
+        out, _ = w.communicate()
+        ok, errors = (int(x) for x in out.split())
+        writes += ok
+        write_errors += errors
+    server.terminate()
+    server.wait()
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")
+    label = "tuned (WAL)" if tuned else "default journal"
+    print(f"{label:<16} reads={len(latencies):<6} read_err={read_errors[0]:<4} "
+          f"p50={pct(0.50):7.1f}ms p95={pct(0.95):7.1f}ms p99={pct(0.99):7.1f}ms "
+          f"mean={statistics.fmean(latencies) * 1000 if latencies else float('nan'):7.1f}ms "
+          f"writes={writes:<6} write_err={write_errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent HTTP reader threads")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent task_cli writer processes")
+    parser.add_argument("--seconds", type=float, default=15, help="duration of each run")
+    parser.add_argument("--writer", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.writer:
+        writer_loop(args.seconds)
+        return
+
+    for tuned in (False, True):
+        run_mode(args, tuned)
+
+
+if __name__ == "__main__":
+    main()
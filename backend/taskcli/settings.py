@@ -10,6 +10,7 @@ Author: TaskCLI Team
 import os
 from pathlib import Path
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # =============================================================================
 # BASE CONFIGURATION
@@ -59,12 +60,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'accounts.metrics.MetricsMiddleware',  # First, so timings cover all other middleware
+    'accounts.compression.CompressionMiddleware',  # Right after metrics, so sizes are bytes on the wire
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files in production
+    'accounts.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise (static files in production), async-capable
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.CachedAuthenticationMiddleware',  # AuthenticationMiddleware + cached User
+    'accounts.profiling.ProfilingMiddleware',  # Removed at startup unless DJANGO_PROFILING is on
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -109,6 +113,247 @@ DATABASES = {
     )
 }
 
+# Optional read replica for read-only views (see accounts/routers.py)
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL", "")
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['accounts.routers.ReplicaRouter']
+
+# Seconds a client keeps reading from the primary after it writes
+REPLICA_PIN_SECONDS = int(os.environ.get("DJANGO_REPLICA_PIN_SECONDS", "10"))
+
+# =============================================================================
+# CONNECTION POOLING (PostgreSQL)
+# =============================================================================
+
+# Opt-in native psycopg pool (Django >= 5.1, requires `psycopg[binary,pool]`).
+# Pooled connections are returned after every request, so CONN_MAX_AGE is 0.
+DATABASE_POOL = os.environ.get("DJANGO_DB_POOL", "False").lower() in ("1", "true", "yes")
+DATABASE_POOL_MIN_SIZE = int(os.environ.get("DJANGO_DB_POOL_MIN_SIZE", "2"))
+DATABASE_POOL_MAX_SIZE = int(os.environ.get("DJANGO_DB_POOL_MAX_SIZE", "10"))
+DATABASE_POOL_TIMEOUT = float(os.environ.get("DJANGO_DB_POOL_TIMEOUT", "10"))  # seconds to wait for a connection
+
+# Seconds between pool statistics log lines per process (0 disables)
+DATABASE_POOL_STATS_INTERVAL = int(os.environ.get("DJANGO_DB_POOL_STATS_INTERVAL", "60"))
+
+if DATABASE_POOL:
+    for db in DATABASES.values():
+        if db['ENGINE'] == 'django.db.backends.postgresql':
+            db['CONN_MAX_AGE'] = 0
+            db.setdefault('OPTIONS', {})['pool'] = {
+                'min_size': DATABASE_POOL_MIN_SIZE,
+                'max_size': DATABASE_POOL_MAX_SIZE,
+                'timeout': DATABASE_POOL_TIMEOUT,
+            }
+
+# =============================================================================
+# SQLITE TUNING
+# =============================================================================
+
+# Opt-in pragma profile applied to every new SQLite connection (accounts/db.py).
+# WAL lets web readers keep working while task_cli writes to the same file.
+SQLITE_TUNING = os.environ.get("DJANGO_SQLITE_TUNING", "False").lower() in ("1", "true", "yes")
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.environ.get("DJANGO_SQLITE_BUSY_TIMEOUT", "5000")),  # milliseconds
+    'mmap_size': int(os.environ.get("DJANGO_SQLITE_MMAP_SIZE", str(128 * 1024 * 1024))),  # bytes
+    'cache_size': int(os.environ.get("DJANGO_SQLITE_CACHE_SIZE", "-20000")),  # negative = KiB
+    'temp_store': 'MEMORY',
+}
+
+# Seconds between `PRAGMA optimize` runs per process
+SQLITE_OPTIMIZE_INTERVAL = int(os.environ.get("DJANGO_SQLITE_OPTIMIZE_INTERVAL", "3600"))
+
+# Start transactions with BEGIN IMMEDIATE: a deferred transaction that reads
+# before it writes (e.g. several `task_cli worker` threads) fails at once with
+# "database is locked" instead of waiting for busy_timeout.
+if SQLITE_TUNING:
+    for db in DATABASES.values():
+        if db['ENGINE'] == 'django.db.backends.sqlite3':
+            db.setdefault('OPTIONS', {})['transaction_mode'] = 'IMMEDIATE'
+
+# =============================================================================
+# CACHE & SESSIONS
+# =============================================================================
+
+# Per-process memory cache by default; point at Redis/Memcached in production
+# so all gunicorn workers share it, e.g.
+#   DJANGO_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   DJANGO_CACHE_LOCATION=redis://127.0.0.1:6379
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        'LOCATION': os.environ.get("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+
+# Session and User caching only pay off with a cache all workers share: with
+# a per-process cache, a logout or password change on one gunicorn worker
+# would leave the session and User valid on the others.
+CACHE_IS_SHARED = not CACHES['default']['BACKEND'].endswith(('.LocMemCache', '.DummyCache'))
+
+# cached_db (the default with a shared cache) reads sessions from the cache
+# and falls back to the database; use
+# django.contrib.sessions.backends.signed_cookies for no server state.
+SESSION_ENGINE = os.environ.get(
+    "DJANGO_SESSION_ENGINE",
+    "django.contrib.sessions.backends.cached_db" if CACHE_IS_SHARED else "django.contrib.sessions.backends.db",
+)
+if SESSION_ENGINE.endswith(('.cache', '.cached_db')) and not CACHE_IS_SHARED:
+    raise ImproperlyConfigured(
+        f"DJANGO_SESSION_ENGINE={SESSION_ENGINE} needs a shared DJANGO_CACHE_BACKEND (Redis/Memcached); "
+        "a per-process cache keeps logged-out sessions alive on other workers"
+    )
+
+# Seconds a logged-in User object stays cached (accounts/middleware.py);
+# 0 (the default without a shared cache) loads it from the database every request
+USER_CACHE_TIMEOUT = int(os.environ.get("DJANGO_USER_CACHE_TIMEOUT", "300" if CACHE_IS_SHARED else "0"))
+
+# =============================================================================
+# LOGIN THROTTLING
+# =============================================================================
+
+# Attempt counters checked before any password is hashed (accounts/throttle.py).
+# Each rate is (capacity, period in seconds): at most `capacity` attempts
+# per IP or account in a `period`-second window from the first one.
+LOGIN_THROTTLE_ENABLED = os.environ.get("DJANGO_LOGIN_THROTTLE", "True").lower() in ("1", "true", "yes")
+LOGIN_THROTTLE_RATES = {
+    'ip': (int(os.environ.get("DJANGO_LOGIN_THROTTLE_IP", "20")), 60),
+    'account': (int(os.environ.get("DJANGO_LOGIN_THROTTLE_ACCOUNT", "5")), 60),
+}
+
+# Take the client IP from X-Forwarded-For (only behind a trusted proxy)
+LOGIN_THROTTLE_TRUST_PROXY = os.environ.get("DJANGO_LOGIN_THROTTLE_TRUST_PROXY", "False").lower() in ("1", "true", "yes")
+
+# =============================================================================
+# CHANGE FEED
+# =============================================================================
+
+# Server-Sent Events feed of task changes (api_task_changes in views.py)
+CHANGE_FEED_POLL_SECONDS = float(os.environ.get("DJANGO_CHANGE_FEED_POLL_SECONDS", "1"))
+CHANGE_FEED_HEARTBEAT_SECONDS = 15
+CHANGE_FEED_MAX_SECONDS = int(os.environ.get("DJANGO_CHANGE_FEED_MAX_SECONDS", "300"))  # client reconnects after
+CHANGE_FEED_RETRY_MS = 3000
+CHANGE_FEED_BATCH_SIZE = 100
+
+# =============================================================================
+# REMINDERS
+# =============================================================================
+
+# Due-time reminders fired by `python manage.py task_cli scheduler`
+# (accounts/reminders.py). Sink: log, file, webhook or a dotted class path.
+REMINDER_SINK = os.environ.get("DJANGO_REMINDER_SINK", "log")
+REMINDER_FILE = os.environ.get("DJANGO_REMINDER_FILE", str(BASE_DIR / "reminders.jsonl"))
+REMINDER_WEBHOOK_URL = os.environ.get("DJANGO_REMINDER_WEBHOOK_URL", "")
+REMINDER_LOOKAHEAD_MINUTES = int(os.environ.get("DJANGO_REMINDER_LOOKAHEAD_MINUTES", "60"))
+REMINDER_REFRESH_SECONDS = int(os.environ.get("DJANGO_REMINDER_REFRESH_SECONDS", "30"))  # pick up new/edited tasks
+REMINDER_LEASE_SECONDS = int(os.environ.get("DJANGO_REMINDER_LEASE_SECONDS", "60"))
+REMINDER_BATCH_SIZE = 1000  # due instants loaded into the heap per query
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+# Per-route request metrics served at /metrics (accounts/metrics.py).
+# Set METRICS_DIR to a directory shared by all gunicorn workers on the host
+# so a scrape aggregates every worker process.
+METRICS_ENABLED = os.environ.get("DJANGO_METRICS", "True").lower() in ("1", "true", "yes")
+METRICS_TOKEN = os.environ.get("DJANGO_METRICS_TOKEN", "")
+METRICS_DIR = os.environ.get("DJANGO_METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = 5
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+# On-demand profiling of single requests for staff holding a signed token,
+# and of `task_cli --profile` commands (accounts/profiling.py)
+PROFILING_ENABLED = os.environ.get("DJANGO_PROFILING", "False").lower() in ("1", "true", "yes")
+PROFILING_DIR = os.environ.get("DJANGO_PROFILING_DIR", str(BASE_DIR / "profiles"))
+PROFILING_TOKEN_MAX_AGE = 60 * 60  # seconds
+PROFILER = os.environ.get("DJANGO_PROFILER", "auto")  # 'auto' uses pyinstrument if installed, else 'cprofile'
+
+# =============================================================================
+# SLOW-QUERY LOG
+# =============================================================================
+
+# Queries slower than this (milliseconds) are logged with their call site
+# (accounts/slowlog.py); 0 disables the wrapper entirely
+SLOW_QUERY_MS = float(os.environ.get("DJANGO_SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.environ.get("DJANGO_SLOW_QUERY_EXPLAIN", "False").lower() in ("1", "true", "yes")
+SLOW_QUERY_SINK = os.environ.get("DJANGO_SLOW_QUERY_SINK", "log")  # 'log' or 'table' (SlowQuery model)
+SLOW_QUERY_LOG_FILE = os.environ.get("DJANGO_SLOW_QUERY_LOG_FILE", "")  # rotating file, in addition to console
+
+# =============================================================================
+# IDEMPOTENCY KEYS
+# =============================================================================
+
+# Stored responses for the Idempotency-Key header on mutation APIs
+# (accounts/idempotency.py)
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("DJANGO_IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+IDEMPOTENCY_LOCK_SECONDS = 60  # an unfinished first attempt older than this may be retried
+IDEMPOTENCY_PURGE_INTERVAL = 3600  # seconds between expired-key purges per process
+
+# =============================================================================
+# BACKGROUND JOBS
+# =============================================================================
+
+# Work larger than this many tasks (recurrence expansion, bulk API) is queued
+# as a Job for `python manage.py task_cli worker` instead of running in the
+# request. 0 keeps everything inline (deployments without a worker process).
+JOB_INLINE_LIMIT = int(os.environ.get("DJANGO_JOB_INLINE_LIMIT", "0"))
+JOB_POLL_SECONDS = float(os.environ.get("DJANGO_JOB_POLL_SECONDS", "1"))
+JOB_TIMEOUT_SECONDS = int(os.environ.get("DJANGO_JOB_TIMEOUT_SECONDS", "600"))  # reclaim jobs of dead workers
+JOB_MAX_ATTEMPTS = 3
+
+# =============================================================================
+# API PAGINATION
+# =============================================================================
+
+# Largest page /api/tasks/?limit= returns (keyset pages, see api_tasks)
+API_PAGE_MAX = 1000
+
+# =============================================================================
+# CALENDAR
+# =============================================================================
+
+# Longest from..to range /api/tasks/calendar/ answers, in days
+CALENDAR_MAX_DAYS = 366
+# Length of each task's event in the .ics feed
+CALENDAR_EVENT_MINUTES = int(os.environ.get("DJANGO_CALENDAR_EVENT_MINUTES", "30"))
+
+# =============================================================================
+# ANALYTICS
+# =============================================================================
+
+# Longest window /api/analytics/ and `task_cli report` cover, in weeks
+ANALYTICS_MAX_WEEKS = 520
+
+# =============================================================================
+# RESPONSE COMPRESSION
+# =============================================================================
+
+# Dynamic HTML/JSON is compressed with brotli (if installed) or gzip by
+# accounts.compression.CompressionMiddleware; static files are pre-compressed
+# by WhiteNoise at collectstatic time.
+COMPRESSION_ENABLED = os.environ.get("DJANGO_COMPRESSION", "True").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_BYTES = int(os.environ.get("DJANGO_COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("DJANGO_COMPRESSION_BROTLI_QUALITY", "5"))  # 0-11
+COMPRESSION_TYPES = {
+    'text/html',
+    'text/plain',
+    'application/json',
+    'application/x-ndjson',
+}
+
 # =============================================================================
 # PASSWORD VALIDATION
 # =============================================================================
@@ -137,11 +382,45 @@ STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR.parent / "frontend" / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
-# WhiteNoise configuration for serving static files in production
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise serves collectstatic output with content-hashed names
+# (style.3f2a...css) and pre-compressed .gz/.br copies; hashed files are sent
+# with a far-future Cache-Control. STORAGES replaces STATICFILES_STORAGE,
+# which Django 5.1+ no longer reads.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "accounts.storage.StaticFilesStorage"},
+}
 
 # =============================================================================
 # DEFAULT AUTO FIELD
 # =============================================================================
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# =============================================================================
+# LOGGING
+# =============================================================================
+
+# Application loggers write to stdout, which gunicorn forwards (see Procfile)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'accounts': {
+            'handlers': ['console'],
+            'level': os.environ.get("DJANGO_LOG_LEVEL", "INFO"),
+        },
+    },
+}
+
+if SLOW_QUERY_LOG_FILE:
+    LOGGING['handlers']['slow_query_file'] = {
+        'class': 'logging.handlers.RotatingFileHandler',
+        'filename': SLOW_QUERY_LOG_FILE,
+        'maxBytes': 10 * 1024 * 1024,
+        'backupCount': 5,
+    }
+    LOGGING['loggers']['accounts.slowlog'] = {'handlers': ['slow_query_file'], 'level': 'WARNING'}
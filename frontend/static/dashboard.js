@@ -0,0 +1,377 @@
+/*
+  TaskCLI - Dashboard Script
+  ==========================
+  Behaviour of the dashboard page (templates/dashboard.html): the add/edit
+  popup, status changes, deletion, filters and the countdown to the next
+  due task. Served as a hashed static file (see accounts/storage.py), so
+  browsers cache it across dashboard loads.
+
+  Author: TaskCLI Team
+*/
+let countdownInterval = null;
+let editingTaskId = null;
+
+function openModal() {
+    editingTaskId = null;
+    document.getElementById("popup-title").textContent = "Add New Task";
+    document.getElementById("saveBtn").textContent = "Add";
+    document.getElementById("editTaskId").value = "";
+    document.getElementById("editVersion").value = "";
+    document.getElementById("taskName").value = "";
+    document.getElementById("projectName").value = "Professional";
+    document.getElementById("priority").value = "Medium";
+    document.getElementById("dueDate").value = "";
+    document.getElementById("dueTime").value = "";
+    document.getElementById("recurrence").value = "none";
+    document.getElementById("recurrence").style.display = "";
+    document.getElementById("editScope").style.display = "none";
+    document.getElementById("popup").style.display = "flex";
+    document.getElementById("app-content").classList.add("blur");
+}
+
+function closeModal() {
+    document.getElementById("popup").style.display = "none";
+    document.getElementById("app-content").classList.remove("blur");
+    editingTaskId = null;
+}
+
+function logout() {
+    window.location.href = "/logout/";
+}
+
+function getCookie(name) {
+    const match = document.cookie.match(new RegExp('(?:^|; )' + name + '=([^;]*)'));
+    return match ? decodeURIComponent(match[1]) : null;
+}
+
+// POST to an AJAX endpoint; on any failure fall back to the full-page URL
+function postTaskAction(url, fallbackUrl) {
+    return fetch(url, {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: { 'X-CSRFToken': getCookie('csrftoken') }
+    })
+    .then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+    })
+    .catch(err => {
+        console.error('Task action failed, reloading:', err);
+        window.location.href = fallbackUrl;
+        return null;
+    });
+}
+
+function applyCounts(counts) {
+    document.getElementById("total-count").textContent = counts.total;
+    document.getElementById("completed-count").textContent = counts.completed;
+    document.getElementById("recurring-count").textContent = counts.high;
+}
+
+function updateTaskStatus(taskId, status) {
+    const completed = status === 'completed';
+    const action = completed ? 'complete' : 'pending';
+    const fallbackUrl = completed ? `/complete-task/${taskId}/` : `/pending-task/${taskId}/`;
+
+    postTaskAction(`/ajax/tasks/${taskId}/${action}/`, fallbackUrl).then(data => {
+        if (!data) return;
+        const row = document.querySelector(`tr[data-task-id="${taskId}"]`);
+        if (row) {
+            row.classList.toggle("completed", data.task.completed);
+            row.dataset.version = data.task.version;
+        }
+        applyCounts(data.counts);
+        computeNearestTask();
+    });
+}
+
+function editTask(taskId) {
+    // Get the task row
+    const row = document.querySelector(`tr[data-task-id="${taskId}"]`);
+    if (!row) return;
+
+    // Extract task data from the row
+    const taskName = row.children[0].textContent;
+    const project = row.children[1].textContent;
+    const priority = row.children[2].textContent;
+    const dueDate = row.dataset.date;
+    const dueTime = row.dataset.time;
+
+    // Populate the form
+    document.getElementById("popup-title").textContent = "Edit Task";
+    document.getElementById("saveBtn").textContent = "Update";
+    document.getElementById("taskForm").action = `/edit-task/${taskId}/`;
+    document.getElementById("editTaskId").value = taskId;
+    document.getElementById("editVersion").value = row.dataset.version;  // the server refuses the edit if it changed since
+    document.getElementById("taskName").value = taskName;
+    document.getElementById("projectName").value = project;
+    document.getElementById("priority").value = priority;
+    document.getElementById("dueDate").value = dueDate;
+    document.getElementById("dueTime").value = dueTime;
+
+    // Recurrence only applies when adding; tasks of a series can be edited all at once
+    document.getElementById("recurrence").style.display = "none";
+    const scope = document.getElementById("editScope");
+    scope.value = "task";
+    scope.style.display = row.dataset.series ? "" : "none";
+    
+    editingTaskId = taskId;
+
+    // Open the modal
+    document.getElementById("popup").style.display = "flex";
+    document.getElementById("app-content").classList.add("blur");
+}
+
+function deleteTask(taskId) {
+    if (!confirm('Delete this task?')) return;
+
+    postTaskAction(`/ajax/tasks/${taskId}/delete/`, `/delete-task/${taskId}/`).then(data => {
+        if (!data) return;
+        const row = document.querySelector(`tr[data-task-id="${taskId}"]`);
+        if (row) row.remove();
+
+        const tbody = document.getElementById("taskTbody");
+        if (!tbody.querySelector("tr")) {
+            tbody.innerHTML = '<tr><td colspan="6" style="text-align: center; padding: 40px; color: #999;">No tasks yet. Create one to get started!</td></tr>';
+        }
+        applyCounts(data.counts);
+        computeNearestTask();
+    });
+}
+
+function deleteSeries(taskId) {
+    if (!confirm('Delete every task in this recurring series?')) return;
+
+    postTaskAction(`/ajax/tasks/${taskId}/series/delete/`, '/dashboard/').then(data => {
+        if (!data) return;
+        data.task_ids.forEach(id => {
+            const row = document.querySelector(`tr[data-task-id="${id}"]`);
+            if (row) row.remove();
+        });
+
+        const tbody = document.getElementById("taskTbody");
+        if (!tbody.querySelector("tr")) {
+            tbody.innerHTML = '<tr><td colspan="6" style="text-align: center; padding: 40px; color: #999;">No tasks yet. Create one to get started!</td></tr>';
+        }
+        applyCounts(data.counts);
+        computeNearestTask();
+    });
+}
+
+// Handle form submission to refresh alert after adding task
+document.getElementById("taskForm").addEventListener("submit", function(e) {
+    // Form will submit normally, page will reload
+});
+
+document.getElementById("cancelBtn").onclick = closeModal;
+
+window.onclick = function(event) {
+    const modal = document.getElementById("popup");
+    if (event.target == modal) {
+        closeModal();
+    }
+}
+
+function pad(n) {
+    return n < 10 ? '0' + n : String(n);
+}
+
+function isoDatetimeFrom(dateStr, timeStr) {
+    const t = timeStr || '00:00';
+    return `${dateStr}T${t}:00`;
+}
+
+function updateStats() {
+    const rows = Array.from(document.querySelectorAll("#taskTbody tr"));
+    let completed = 0;
+    let highPriority = 0;
+    
+    rows.forEach(row => {
+        if (row.classList.contains("completed")) completed++;
+        const priorityCell = row.querySelector(".priority-high");
+        if (priorityCell) highPriority++;
+    });
+    
+    document.getElementById("completed-count").textContent = completed;
+    document.getElementById("recurring-count").textContent = highPriority;
+}
+
+function computeNearestTask() {
+    if (countdownInterval) {
+        clearInterval(countdownInterval);
+        countdownInterval = null;
+    }
+
+    const alertBar = document.getElementById("alert-bar");
+    const tbody = document.getElementById("taskTbody");
+    
+    
+    const allRows = Array.from(tbody.getElementsByTagName("tr"));
+    
+    console.log('Total rows in table:', allRows.length);
+
+ 
+    const pendingRows = allRows.filter(r => {
+        
+        const firstCell = r.children[0] ? r.children[0].textContent.trim() : '';
+        if (firstCell.includes('No tasks yet')) {
+            return false;
+        }
+        
+       
+        const hasData = r.dataset.date && r.dataset.time;
+        const isNotCompleted = !r.classList.contains("completed");
+        
+        return hasData && isNotCompleted;
+    });
+
+    console.log('Pending rows after filter:', pendingRows.length);
+
+    if (pendingRows.length === 0) {
+        alertBar.innerHTML = '<strong> No pending tasks</strong> — Add a task to get started';
+        alertBar.className = 'alert-box alert-info';
+        alertBar.style.display = 'block';
+        alertBar.style.visibility = 'visible';
+        return;
+    }
+
+    const now = new Date();
+    let nearest = null, nearestDiff = Infinity;
+
+    pendingRows.forEach(r => {
+        try {
+            const dateStr = r.dataset.date;
+            const timeStr = r.dataset.time;
+            console.log('Processing task date:', dateStr, 'time:', timeStr);
+            
+            const d = new Date(isoDatetimeFrom(dateStr, timeStr));
+            if (!isNaN(d.getTime())) {
+                const diff = Math.abs(d - now);
+                if (diff < nearestDiff) {
+                    nearestDiff = diff;
+                    nearest = { row: r, due: d };
+                }
+            }
+        } catch (e) {
+            console.error('Error parsing task date:', e);
+        }
+    });
+
+    if (!nearest) {
+        console.log('No valid nearest task found');
+        alertBar.innerHTML = '<strong>No pending tasks</strong> — Add a task to get started';
+        alertBar.className = 'alert-box alert-info';
+        alertBar.style.display = 'block';
+        alertBar.style.visibility = 'visible';
+        return;
+    }
+
+    console.log('Found nearest task:', nearest.row.children[0].textContent);
+
+    function update() {
+        try {
+            const now = new Date();
+            const diffMs = nearest.due - now;
+            const abs = Math.abs(diffMs);
+            const hrs = Math.floor(abs / (1000 * 60 * 60));
+            const mins = Math.floor((abs % (1000 * 60 * 60)) / (1000 * 60));
+            const secs = Math.floor((abs % (1000 * 60)) / 1000);
+
+            let html = '', cls = 'alert-info';
+            const taskName = nearest.row.children[0].textContent.trim();
+
+            if (diffMs < 0) {
+                html = `<strong> Task overdue:</strong> ${taskName} — Late by <strong>${pad(hrs)}h : ${pad(mins)}m : ${pad(secs)}s</strong>`;
+                cls = 'alert-danger';
+            } else if (diffMs <= 60 * 60 * 1000) {
+                html = `<strong> Due within 1 hour:</strong> ${taskName} — <strong>${pad(hrs)}h : ${pad(mins)}m : ${pad(secs)}s</strong>`;
+                cls = 'alert-warning';
+            } else {
+                const startToday = new Date();
+                startToday.setHours(0, 0, 0, 0);
+                const startTomorrow = new Date(startToday);
+                startTomorrow.setDate(startToday.getDate() + 1);
+
+                if (nearest.due >= startToday && nearest.due < startTomorrow) {
+                    html = `<strong> Due today:</strong> ${taskName} — <strong>${pad(hrs)}h : ${pad(mins)}m : ${pad(secs)}s</strong>`;
+                    cls = 'alert-warning';
+                } else {
+                    html = `<strong> Upcoming:</strong> ${taskName} — <strong>${pad(hrs)}h : ${pad(mins)}m : ${pad(secs)}s</strong>`;
+                    cls = 'alert-info';
+                }
+            }
+
+            alertBar.innerHTML = html;
+            alertBar.className = 'alert-box ' + cls;
+            alertBar.style.display = 'block';
+            alertBar.style.visibility = 'visible';
+        } catch (e) {
+            console.error('Error updating alert:', e);
+        }
+    }
+
+    update();
+    countdownInterval = setInterval(update, 1000);
+}
+
+document.addEventListener("DOMContentLoaded", function() {
+    updateStats();
+    
+    
+    setTimeout(() => {
+        computeNearestTask();
+    }, 300);
+});
+
+function filterTasks(filterType) {
+const rows = document.querySelectorAll("#taskTbody tr");
+
+rows.forEach(row => {
+    const isCompleted = row.classList.contains("completed");
+    const priority = row.children[2].textContent.trim().toLowerCase();
+    const project = row.children[1].textContent.trim();
+
+    let show = false;
+
+    switch(filterType) {
+
+        case 'completed':
+            show = isCompleted;
+            break;
+
+        case 'pending':
+            show = !isCompleted;
+            break;
+
+        case 'high':
+            show = priority === "high";
+            break;
+
+        case 'medium':
+            show = priority === "medium";
+            break;
+
+        case 'low':
+            show = priority === "low";
+            break;
+
+        case 'recurring':
+            show = row.dataset.recurring === "true";
+            break;
+
+        // project filters
+        case 'Professional':
+        case 'College':
+        case 'Personal':
+        case 'New Project':
+            show = project === filterType;
+            break;
+
+        case 'all':
+            show = true;
+            break;
+    }
+
+    row.style.display = show ? "" : "none";
+});
+}
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Client Memory Benchmark
+=======================
+Builds N tasks from API-shaped JSON in two ways and compares the memory
+retained (tracemalloc):
+
+- dicts:  json.loads() of an /api/tasks/ response, what TaskCLI and ad-hoc
+          scripts keep today
+- Task:   taskcli.client.Task.from_dict() for each of them (slots, typed
+          dates/times, interned project/priority)
+
+Offline: no server needed.
+
+USAGE:
+------
+    cd frontend/taskcli-pypi
+    python benchmarks/client_memory.py --tasks 100000
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from taskcli.client import Task  # noqa: E402
+
+
+def api_body(n):
+    rng = random.Random(42)
+    projects = ["Work", "Personal", "Study", "Health", "Home"]
+    return json.dumps({"success": True, "tasks": [{
+        "id": i,
+        "name": f"{rng.choice(['Write', 'Review', 'Fix', 'Plan'])} {rng.choice(['report', 'slides', 'budget'])} #{i}",
+        "project": rng.choice(projects),
+        "priority": rng.choice(["High", "Medium", "Low"]),
+        "due_date": f"2030-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "due_time": f"{rng.randint(0, 23):02d}:{rng.choice([0, 15, 30, 45]):02d}:00",
+        "completed": rng.random() < 0.4,
+        "is_recurring": rng.random() < 0.1,
+        "series_id": None,
+        "version": rng.randint(1, 5),
+    } for i in range(1, n + 1)]})
+
+
+def retained(build):
+    """Bytes still allocated after `build()` returns, and its result."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000, help="Number of tasks")
+    args = parser.parse_args()
+
+    body = api_body(args.tasks)
+    dict_bytes, dicts = retained(lambda: json.loads(body)["tasks"])
+    task_bytes, tasks = retained(lambda: [Task.from_dict(d) for d in json.loads(body)["tasks"]])
+    assert [t.to_dict() for t in tasks[:100]] == dicts[:100]
+
+    print(f"{'representation':<16} {'total MB':>9} {'bytes/task':>11}")
+    print(f"{'dict':<16} {dict_bytes / 1e6:>9.1f} {dict_bytes / args.tasks:>11.0f}")
+    print(f"{'Task (slots)':<16} {task_bytes / 1e6:>9.1f} {task_bytes / args.tasks:>11.0f}"
+          f"  ({task_bytes / dict_bytes:.0%} of dict)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+CLI Startup-Time Benchmark
+==========================
+Guards the cold start of the `taskcli` entry point:
+
+1. `python -X importtime -c "import taskcli.cli"`: cumulative import time
+   of the CLI module, and the list of heavy modules it pulled in. Fails if
+   `requests`/`urllib3` are imported at load time.
+2. Wall time of `python -m taskcli.cli --help` (parse arguments and exit),
+   median of N runs, next to a bare `python -c pass` for reference.
+
+Exits with status 1 when a check fails or the import time exceeds
+--budget-ms, so it can run in CI as a regression test.
+
+USAGE:
+------
+    cd frontend/taskcli-pypi
+    python benchmarks/startup_time.py --runs 20 --budget-ms 40
+
+Author: TaskCLI Team
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+FORBIDDEN = ("requests", "urllib3", "charset_normalizer", "idna", "certifi")
+
+
+def import_profile(code="import taskcli.cli"):
+    """(cumulative microseconds for taskcli.cli, set of top-level modules imported)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=PACKAGE_DIR, env=_env(), capture_output=True, text=True, check=True)
+    total, modules = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules.add(name.split(".")[0])
+        if name == "taskcli.cli":
+            total = int(cumulative)
+    return total, modules
+
+
+def wall_time(args, runs):
+    """Median wall time in ms of running the interpreter with `args`."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=PACKAGE_DIR, env=_env(), capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _env():
+    return {**os.environ, "PYTHONPATH": str(PACKAGE_DIR), "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Runs per wall-time measurement")
+    parser.add_argument("--budget-ms", type=float, default=40.0, help="Max import time of taskcli.cli")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache and page cache so the first run isn't an outlier
+    import_profile()
+    samples = [import_profile() for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _ in samples) / 1000
+    # Ignore what the interpreter itself loads at startup (site, .pth hooks)
+    heavy = sorted(set(FORBIDDEN) & (samples[0][1] - import_profile("pass")[1]))
+
+    baseline = wall_time(["-c", "pass"], args.runs)
+    help_ms = wall_time(["-m", "taskcli.cli", "--help"], args.runs)
+    requests_ms = wall_time(["-c", "import requests"], args.runs) if _has_requests() else None
+
+    print(f"import taskcli.cli          {import_ms:8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+    print(f"python -c pass              {baseline:8.1f} ms")
+    print(f"taskcli --help              {help_ms:8.1f} ms  (+{help_ms - baseline:.1f} ms over bare interpreter)")
+    if requests_ms is not None:
+        print(f"python -c 'import requests' {requests_ms:8.1f} ms  (for reference)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: imported at load time: {', '.join(heavy)}")
+        failed = True
+    if import_ms > args.budget_ms:
+        print(f"FAIL: import time {import_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+def _has_requests():
+    import importlib.util
+    return importlib.util.find_spec("requests") is not None
+
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,29 @@ Connects to TaskCLI web API for data synchronization.
 Usage:
     pip install taskcli-manager
     taskcli
+    taskcli watch --email you@example.com   # stream live task changes
+    taskcli list --email you@example.com --status pending
+    taskcli done 12 13                      # also: pending, delete
+
+The one-shot commands (list/done/pending/delete) talk to the API through
+the standard library's http.client and never import `requests`, which
+alone costs more startup time than the rest of the CLI; the interactive
+menu imports it on first use (and falls back to http.client when it is
+not installed).
 
 Author: Ishita Tiwari
 """
 
-import requests
+import argparse
 import getpass
+import json
 import os
 import sys
+import time
 from datetime import datetime
 
+from .transport import MAX_ATTEMPTS, StdlibTransport, default_transport, post_with_retries
+
 # API Base URL - Default to Railway deployed app but allow local testing
 API_URL = os.environ.get("TASKCLI_API_URL", "https://ojtprojectrepo-production.up.railway.app")
 
@@ -32,11 +45,64 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# Concurrent requests for multi-task actions on servers without /api/tasks/bulk/
+MAX_WORKERS = 8
+
+def parse_ids(specs):
+    """['3-5,9', '12'] -> [3, 4, 5, 9, 12] (duplicates dropped, order kept)."""
+    ids = []
+    for spec in specs:
+        for part in spec.replace(" ", "").split(","):
+            if not part:
+                continue
+            start, sep, end = part.partition("-")
+            if not start.isdigit() or (sep and not end.isdigit()):
+                raise ValueError(f"Invalid task ID or range: '{part}'")
+            first, last = int(start), int(end) if sep else int(start)
+            if last < first:
+                raise ValueError(f"Invalid range: '{part}'")
+            ids.extend(range(first, last + 1))
+    if not ids:
+        raise ValueError("No task IDs given")
+    return list(dict.fromkeys(ids))
+
+def format_ids(ids):
+    """[3, 4, 5, 9] -> '3-5,9'."""
+    ranges, ids = [], sorted(ids)
+    start = prev = ids[0]
+    for task_id in ids[1:] + [None]:
+        if task_id is not None and task_id == prev + 1:
+            prev = task_id
+            continue
+        ranges.append(str(start) if start == prev else f"{start}-{prev}")
+        start = prev = task_id
+    return ",".join(ranges)
+
+# Non-interactive actions: command -> (API path segment, message)
+ACTIONS = {
+    "done": ("complete", "marked as complete"),
+    "pending": ("pending", "marked as pending"),
+    "delete": ("delete", "deleted"),
+}
+
 class TaskCLI:
-    def __init__(self):
+    def __init__(self, transport=None):
         self.current_user = None
         self.user_email = None
+        self.request = transport or default_transport()
     
+    def post_mutation(self, path, payload=None):
+        """
+        POST a task mutation, retrying timeouts, in-progress 409s and 5xx errors.
+
+        Every attempt carries the same Idempotency-Key, so the server replays
+        the first result instead of creating or changing the task again.
+        """
+        def on_retry(attempt):
+            print(f"{Colors.YELLOW}⟳ Retrying ({attempt}/{MAX_ATTEMPTS - 1})...{Colors.END}")
+
+        return post_with_retries(self.request, f"{API_URL}{path}", payload, on_retry=on_retry)
+
     def clear_screen(self):
         os.system('clear' if os.name != 'nt' else 'cls')
     
@@ -93,10 +159,10 @@ class TaskCLI:
             return False
         
         try:
-            response = requests.post(f"{API_URL}/api/login/", json={
+            response = self.request("POST", f"{API_URL}/api/login/", payload={
                 "email": email,
                 "password": password
-            }, timeout=10)
+            })
             
             data = response.json()
             if data.get("success"):
@@ -107,7 +173,7 @@ class TaskCLI:
             else:
                 print(f"\n{Colors.RED}❌ {data.get('error', 'Login failed')}{Colors.END}")
                 return False
-        except requests.exceptions.RequestException as e:
+        except OSError as e:
             print(f"\n{Colors.RED}❌ Connection error: {e}{Colors.END}")
             return False
     
@@ -129,11 +195,11 @@ class TaskCLI:
             return False
         
         try:
-            response = requests.post(f"{API_URL}/api/signup/", json={
+            response = self.request("POST", f"{API_URL}/api/signup/", payload={
                 "name": name,
                 "email": email,
                 "password": password
-            }, timeout=10)
+            })
             
             data = response.json()
             if data.get("success"):
@@ -144,18 +210,19 @@ class TaskCLI:
             else:
                 print(f"\n{Colors.RED}❌ {data.get('error', 'Signup failed')}{Colors.END}")
                 return False
-        except requests.exceptions.RequestException as e:
+        except OSError as e:
             print(f"\n{Colors.RED}❌ Connection error: {e}{Colors.END}")
             return False
     
-    def list_tasks(self, filter_type=None):
+    def list_tasks(self, filter_type=None, as_json=False):
+        """Print the user's tasks; returns False if they could not be fetched."""
         try:
-            response = requests.get(f"{API_URL}/api/tasks/", params={"email": self.user_email}, timeout=10)
+            response = self.request("GET", f"{API_URL}/api/tasks/", params={"email": self.user_email})
             data = response.json()
             
             if not data.get("success"):
                 print(f"{Colors.RED}❌ {data.get('error', 'Failed to fetch tasks')}{Colors.END}")
-                return
+                return False
             
             tasks = data.get("tasks", [])
             
@@ -165,9 +232,13 @@ class TaskCLI:
             elif filter_type == "completed":
                 tasks = [t for t in tasks if t["completed"]]
             
+            if as_json:
+                print(json.dumps(tasks, indent=2))
+                return True
+            
             if not tasks:
                 print(f"{Colors.YELLOW}⚠️ No tasks found.{Colors.END}")
-                return
+                return True
             
             print(f"\n{Colors.BOLD}{'ID':<5} {'Name':<22} {'Project':<12} {'Priority':<8} {'Due':<12} {'Status'}{Colors.END}")
             print(f"{Colors.BLUE}{'─' * 75}{Colors.END}")
@@ -182,9 +253,11 @@ class TaskCLI:
                 print(f"{task['id']:<5} {name:<22} {project:<12} {priority_color}{task['priority']:<8}{Colors.END} {task['due_date']:<12} {status_icon}{Colors.END}")
             
             print(f"\n{Colors.CYAN}Total: {len(tasks)} task(s){Colors.END}")
+            return True
             
-        except requests.exceptions.RequestException as e:
+        except OSError as e:
             print(f"{Colors.RED}❌ Connection error: {e}{Colors.END}")
+            return False
     
     def add_task(self):
         print(f"\n{Colors.CYAN}{Colors.BOLD}➕ ADD NEW TASK{Colors.END}")
@@ -207,62 +280,67 @@ class TaskCLI:
         due_time = self.get_input("Due time (HH:MM, default: 12:00): ") or "12:00"
         
         try:
-            response = requests.post(f"{API_URL}/api/tasks/add/", json={
+            response = self.post_mutation("/api/tasks/add/", {
                 "email": self.user_email,
                 "name": name,
                 "project": project,
                 "priority": priority,
                 "due_date": due_date,
                 "due_time": due_time
-            }, timeout=10)
+            })
             
             data = response.json()
             if data.get("success"):
                 print(f"{Colors.GREEN}✅ Task '{name}' created with ID {data.get('task_id')}{Colors.END}")
             else:
                 print(f"{Colors.RED}❌ {data.get('error', 'Failed to create task')}{Colors.END}")
-        except requests.exceptions.RequestException as e:
+        except OSError as e:
             print(f"{Colors.RED}❌ Connection error: {e}{Colors.END}")
     
     def complete_task(self):
         print(f"\n{Colors.CYAN}{Colors.BOLD}✔️ MARK TASK AS COMPLETE{Colors.END}")
         self.list_tasks("pending")
-        task_id = self.get_input("\nEnter Task ID to complete: ")
+        task_ids = self.get_input("\nEnter Task ID(s) to complete (e.g. 3-40,52): ")
         
-        if task_id:
-            try:
-                response = requests.post(f"{API_URL}/api/tasks/{task_id}/complete/", timeout=10)
-                data = response.json()
-                if data.get("success"):
-                    print(f"{Colors.GREEN}✅ Task {task_id} marked as complete!{Colors.END}")
-                else:
-                    print(f"{Colors.RED}❌ {data.get('error', 'Failed')}{Colors.END}")
-            except:
-                print(f"{Colors.RED}❌ Connection error{Colors.END}")
+        if task_ids:
+            self.apply_action_input("done", task_ids)
     
     def pending_task(self):
         print(f"\n{Colors.CYAN}{Colors.BOLD}⏸️ MARK TASK AS PENDING{Colors.END}")
         self.list_tasks("completed")
-        task_id = self.get_input("\nEnter Task ID to mark pending: ")
+        task_ids = self.get_input("\nEnter Task ID(s) to mark pending (e.g. 3-40,52): ")
         
-        if task_id:
-            try:
-                response = requests.post(f"{API_URL}/api/tasks/{task_id}/pending/", timeout=10)
-                data = response.json()
-                if data.get("success"):
-                    print(f"{Colors.YELLOW}⏳ Task {task_id} marked as pending.{Colors.END}")
-                else:
-                    print(f"{Colors.RED}❌ {data.get('error', 'Failed')}{Colors.END}")
-            except:
-                print(f"{Colors.RED}❌ Connection error{Colors.END}")
+        if task_ids:
+            self.apply_action_input("pending", task_ids)
     
     def edit_task(self):
+        from .client import APIError, Client, ConflictError  # not needed by the one-shot commands
+        
         print(f"\n{Colors.CYAN}{Colors.BOLD}✏️ EDIT TASK{Colors.END}")
         self.list_tasks()
         task_id = self.get_input("\nEnter Task ID to edit: ")
         
         if not task_id:
             return
+        if not task_id.isdigit():
+            print(f"{Colors.RED}❌ Invalid task ID: '{task_id}'{Colors.END}")
+            return
+        task_id = int(task_id)
+        
+        # Read the task as it is now: the edit only applies to this version
+        client = Client(self.user_email, API_URL, self.request)
+        try:
+            tasks, _ = client.page(after=task_id - 1, limit=1)
+        except APIError as e:
+            print(f"{Colors.RED}❌ {e.message}{Colors.END}")
+            return
+        except OSError as e:
+            print(f"{Colors.RED}❌ Connection error: {e}{Colors.END}")
+            return
+        if not tasks or tasks[0].id != task_id:
+            print(f"{Colors.RED}❌ Task {task_id} not found{Colors.END}")
+            return
+        base = tasks[0]
         
         print(f"\n{Colors.YELLOW}Enter new values (press Enter to skip):{Colors.END}")
         name = self.get_input("New name: ")
@@ -278,35 +356,192 @@ class TaskCLI:
         
         if update_data:
             try:
-                response = requests.post(f"{API_URL}/api/tasks/{task_id}/edit/", json=update_data, timeout=10)
-                data = response.json()
-                if data.get("success"):
-                    print(f"{Colors.GREEN}✅ Task {task_id} updated!{Colors.END}")
-                else:
-                    print(f"{Colors.RED}❌ {data.get('error', 'Failed')}{Colors.END}")
-            except:
-                print(f"{Colors.RED}❌ Connection error{Colors.END}")
+                # Re-applied on top of concurrent edits to other fields
+                client.edit(task_id, base=base, **update_data)
+                print(f"{Colors.GREEN}✅ Task {task_id} updated!{Colors.END}")
+            except ConflictError as e:
+                changed = ", ".join(f"{field}={getattr(e.current, field)}" for field in update_data
+                                    if getattr(e.current, field) != getattr(base, field))
+                print(f"{Colors.RED}❌ Task {task_id} was changed elsewhere ({changed}); "
+                      f"your edit was not saved.{Colors.END}")
+            except APIError as e:
+                print(f"{Colors.RED}❌ {e.message}{Colors.END}")
+            except OSError as e:
+                print(f"{Colors.RED}❌ Connection error: {e}{Colors.END}")
     
     def delete_task(self):
         print(f"\n{Colors.CYAN}{Colors.BOLD}🗑️ DELETE TASK{Colors.END}")
         self.list_tasks()
-        task_id = self.get_input("\nEnter Task ID to delete: ")
+        task_ids = self.get_input("\nEnter Task ID(s) to delete (e.g. 3-40,52): ")
         
-        if task_id:
+        if task_ids:
             confirm = self.get_input(f"{Colors.RED}Are you sure? (yes/no): {Colors.END}")
             if confirm and confirm.lower() in ['yes', 'y']:
-                try:
-                    response = requests.post(f"{API_URL}/api/tasks/{task_id}/delete/", timeout=10)
-                    data = response.json()
-                    if data.get("success"):
-                        print(f"{Colors.GREEN}✅ Task {task_id} deleted.{Colors.END}")
-                    else:
-                        print(f"{Colors.RED}❌ {data.get('error', 'Failed')}{Colors.END}")
-                except:
-                    print(f"{Colors.RED}❌ Connection error{Colors.END}")
+                self.apply_action_input("delete", task_ids)
             else:
                 print(f"{Colors.YELLOW}Deletion cancelled.{Colors.END}")
     
+    def apply_action_input(self, action, spec):
+        """Interactive wrapper: parse an ID list typed at a prompt and apply `action`."""
+        try:
+            task_ids = parse_ids([spec])
+        except ValueError as e:
+            print(f"{Colors.RED}❌ {e}{Colors.END}")
+            return
+        self.apply_action(action, task_ids)
+    
+    def apply_action(self, action, task_ids, workers=MAX_WORKERS):
+        """
+        Complete, reopen or delete many tasks; returns the number that failed.
+
+        With a known email the server's bulk endpoint does it in one request.
+        Otherwise (or on servers without it) the per-task endpoints are
+        called from a pool of `workers` threads.
+        """
+        results = None
+        if self.user_email and len(task_ids) > 1:
+            results = self.bulk_action(action, task_ids)
+        if results is None:
+            results = self.fan_out(action, task_ids, workers)
+        
+        failed = [task_id for task_id in task_ids if results[task_id] is not True]
+        if len(task_ids) > 1:
+            summary = f"{len(task_ids) - len(failed)} {ACTIONS[action][1]}, {len(failed)} failed"
+            if failed:
+                summary += f" (IDs: {format_ids(failed)})"
+            print(f"\n{Colors.CYAN}Summary: {summary}{Colors.END}")
+        return len(failed)
+    
+    def _print_result(self, action, task_id, result, done=None, total=None):
+        progress = f"[{done}/{total}] " if total and total > 1 else ""
+        if result is True:
+            print(f"{progress}{Colors.GREEN}✅ Task {task_id} {ACTIONS[action][1]}.{Colors.END}")
+        else:
+            print(f"{progress}{Colors.RED}❌ Task {task_id}: {result}{Colors.END}")
+    
+    def fan_out(self, action, task_ids, workers):
+        """Call the per-task endpoint for each ID concurrently; returns {id: True or error}."""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        path = ACTIONS[action][0]
+        
+        def one(task_id):
+            try:
+                response = self.post_mutation(f"/api/tasks/{task_id}/{path}/")
+            except OSError as e:
+                return f"Connection error: {e}"
+            try:
+                data = response.json()
+            except ValueError:
+                return f"HTTP {response.status_code}"
+            return True if data.get("success") else data.get("error", "Failed")
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(task_ids)))) as pool:
+            futures = {pool.submit(one, task_id): task_id for task_id in task_ids}
+            for done, future in enumerate(as_completed(futures), 1):
+                task_id = futures[future]
+                results[task_id] = future.result()
+                self._print_result(action, task_id, results[task_id], done, len(task_ids))
+        return results
+    
+    def bulk_action(self, action, task_ids):
+        """
+        Apply `action` through /api/tasks/bulk/; returns {id: True or error}, or
+        None if the server has no bulk endpoint. API errors such as "User not
+        found" (404 with the API's JSON) are reported for every task.
+        """
+        try:
+            response = self.post_mutation("/api/tasks/bulk/", {
+                "email": self.user_email,
+                "action": ACTIONS[action][0],
+                "task_ids": task_ids,
+            })
+            data = response.json()  # an older server's HTML 404/405 page raises ValueError
+            if response.status_code in (404, 405) and "success" not in data:
+                return None  # older server without the bulk endpoint
+            if response.status_code == 202:
+                data = self.wait_for_job(data["status_url"])
+        except (OSError, ValueError, KeyError):
+            return None
+        if not data.get("success"):
+            error = data.get("error", "Failed")
+            results = {task_id: error for task_id in task_ids}
+        else:
+            affected = set(data.get("task_ids", []))
+            results = {task_id: True if task_id in affected else "Task not found" for task_id in task_ids}
+        for task_id in task_ids:
+            self._print_result(action, task_id, results[task_id])
+        return results
+    
+    def wait_for_job(self, status_url, timeout=120):
+        """Poll a queued bulk job until it finishes; returns its result like an inline response."""
+        print(f"{Colors.BLUE}⏳ Queued on the server, waiting...{Colors.END}")
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = self.request("GET", f"{API_URL}{status_url}", params={"email": self.user_email}).json()["job"]
+            if job["status"] == "done":
+                return {"success": True, **job["result"]}
+            if job["status"] == "failed":
+                return {"success": False, "error": job["error"] or "Job failed"}
+            time.sleep(0.5)
+        return {"success": False, "error": "Timed out waiting for the server"}
+    
+    def watch(self):
+        """Stream task changes from the server's change feed until Ctrl+C."""
+        import requests  # streaming needs requests; imported here to keep startup fast
+        
+        print(f"{Colors.CYAN}👀 Watching task changes for {self.user_email} (Ctrl+C to stop){Colors.END}")
+        last_event_id = None
+        retry = 3.0
+        
+        while True:
+            headers = {"Accept": "text/event-stream"}
+            if last_event_id:
+                headers["Last-Event-ID"] = last_event_id
+            try:
+                with requests.get(f"{API_URL}/api/tasks/changes/", params={"email": self.user_email},
+                                  headers=headers, stream=True, timeout=(10, 60)) as response:
+                    if response.status_code != 200:
+                        print(f"{Colors.RED}❌ {response.json().get('error', 'Failed to open change feed')}{Colors.END}")
+                        return
+                    event_id, data = None, []
+                    for line in response.iter_lines(chunk_size=1, decode_unicode=True):  # unbuffered: events are small
+                        if line.startswith("id:"):
+                            event_id = line[3:].strip()
+                        elif line.startswith("data:"):
+                            data.append(line[5:].strip())
+                        elif line.startswith("retry:"):
+                            retry = int(line[6:].strip()) / 1000
+                        elif line == "" and data:
+                            self.print_change(json.loads("\n".join(data)))
+                            last_event_id = event_id or last_event_id
+                            event_id, data = None, []
+            except KeyboardInterrupt:
+                print(f"\n{Colors.GREEN}👋 Stopped watching.{Colors.END}")
+                return
+            except requests.exceptions.RequestException:
+                pass  # Reconnect below and resume from last_event_id
+            
+            try:
+                time.sleep(retry)
+            except KeyboardInterrupt:
+                print(f"\n{Colors.GREEN}👋 Stopped watching.{Colors.END}")
+                return
+    
+    def print_change(self, change):
+        at = change.get("at", "")[11:19]
+        action = change.get("action")
+        data = change.get("data") or {}
+        icon = {"created": "➕", "updated": "✏️ ", "deleted": "🗑️ "}.get(action, "•")
+        if action == "created":
+            detail = f"'{data.get('name')}' due {data.get('due_date')} {str(data.get('due_time', ''))[:5]}"
+        elif action == "updated":
+            detail = ", ".join(f"{k}={v}" for k, v in data.items())
+        else:
+            detail = ""
+        print(f"{Colors.BLUE}[{at}]{Colors.END} {icon} Task {change.get('task_id')} {action} {detail}")
+    
     def run(self):
         self.clear_screen()
         self.print_header()
@@ -375,8 +610,50 @@ class TaskCLI:
             self.print_header()
 
 def main():
-    cli = TaskCLI()
-    cli.run()
+    parser = argparse.ArgumentParser(prog="taskcli", description="Interactive task manager for TaskCLI")
+    subparsers = parser.add_subparsers(dest="command")
+    watch_parser = subparsers.add_parser("watch", help="Stream live task changes")
+    watch_parser.add_argument("--email", default=os.environ.get("TASKCLI_EMAIL"), help="Account email (or set TASKCLI_EMAIL)")
+    list_parser = subparsers.add_parser("list", help="Print your tasks and exit")
+    list_parser.add_argument("--email", default=os.environ.get("TASKCLI_EMAIL"), help="Account email (or set TASKCLI_EMAIL)")
+    list_parser.add_argument("--status", choices=["all", "pending", "completed"], default="all", help="Filter by status")
+    list_parser.add_argument("--json", action="store_true", help="Print the tasks as JSON")
+    for name, help_text in (("done", "Mark tasks complete"), ("pending", "Mark tasks pending"), ("delete", "Delete tasks")):
+        action_parser = subparsers.add_parser(name, help=help_text)
+        action_parser.add_argument("task_ids", nargs="+", metavar="IDS", help="Task IDs, ranges or lists, e.g. 3-40,52")
+        action_parser.add_argument("--email", default=os.environ.get("TASKCLI_EMAIL"),
+                                   help="Account email (or set TASKCLI_EMAIL); enables the bulk endpoint")
+        action_parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Concurrent requests without the bulk endpoint")
+        if name == "delete":
+            action_parser.add_argument("-y", "--yes", action="store_true", help="Don't ask for confirmation")
+    args = parser.parse_args()
+    
+    if args.command == "watch":
+        cli = TaskCLI()
+        cli.user_email = args.email or cli.get_input("Email: ")
+        if cli.user_email:
+            cli.watch()
+    elif args.command == "list":
+        if not args.email:
+            parser.error("list needs --email or TASKCLI_EMAIL")
+        cli = TaskCLI(StdlibTransport())
+        cli.user_email = args.email
+        sys.exit(0 if cli.list_tasks(None if args.status == "all" else args.status, as_json=args.json) else 1)
+    elif args.command in ACTIONS:
+        try:
+            task_ids = parse_ids(args.task_ids)
+        except ValueError as e:
+            parser.error(str(e))
+        cli = TaskCLI(StdlibTransport())
+        cli.user_email = args.email
+        if args.command == "delete" and not args.yes:
+            confirm = cli.get_input(f"{Colors.RED}Delete {len(task_ids)} task(s)? (yes/no): {Colors.END}")
+            if not confirm or confirm.lower() not in ['yes', 'y']:
+                print(f"{Colors.YELLOW}Deletion cancelled.{Colors.END}")
+                return
+        sys.exit(1 if cli.apply_action(args.command, task_ids, workers=args.workers) else 0)
+    else:
+        TaskCLI().run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,367 @@
+"""
+TaskCLI Python Client
+=====================
+Typed access to the TaskCLI API for scripts, so they don't have to
+re-implement the HTTP calls:
+
+    from taskcli.client import Client
+
+    client = Client("you@example.com")
+    for task in client.tasks(status="pending"):   # streams page by page
+        print(task.id, task.name, task.due_date)
+    task_id = client.add("Write report", priority="High", due_date="2030-01-31")
+    client.complete([task_id, 12, 13])            # one bulk request
+    for task in client.tasks(status="pending"):
+        if task.priority == "High":              # merged if someone else edited it meanwhile
+            client.edit(task.id, base=task, priority="Medium")
+
+    import asyncio
+    from taskcli.client import AsyncClient
+
+    async def main():
+        client = AsyncClient("you@example.com")
+        async for task in client.tasks():
+            ...
+        await client.add_many([{"name": f"Task {i}"} for i in range(100)])
+
+    asyncio.run(main())
+
+- Tasks are `Task` objects with __slots__, typed fields (datetime.date /
+  datetime.time) and interned project/priority strings: a fraction of the
+  memory of the API's JSON dicts.
+- `tasks()` pages through the listing (keyset pages of `page_size`) and
+  fetches the next page on a background thread while the current one is
+  consumed, so memory stays flat and the network wait overlaps your work.
+- Mutations carry an Idempotency-Key and are retried like the CLI's.
+- Edits against a `base` task are conditional on its version. If the task
+  changed since, the edit is retried on top of the new version when the
+  other writer touched none of the same fields; otherwise ConflictError.
+- AsyncClient runs the same calls in a thread pool (the package has no
+  async HTTP dependency), so it works in any asyncio program.
+
+Author: TaskCLI Team
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time as dt_time
+
+from .transport import default_transport, post_with_retries
+
+API_URL = os.environ.get("TASKCLI_API_URL", "https://ojtprojectrepo-production.up.railway.app")
+PAGE_SIZE = 500
+MAX_WORKERS = 8
+MAX_MERGES = 3
+
+
+class APIError(Exception):
+    """The API answered with an error (or something that isn't its JSON)."""
+
+    def __init__(self, status_code, message):
+        super().__init__(f"{message} (HTTP {status_code})")
+        self.status_code = status_code
+        self.message = message
+
+
+class ConflictError(APIError):
+    """The task changed since it was read and the changes overlap; `current` is its state now."""
+
+    def __init__(self, status_code, message, current):
+        super().__init__(status_code, message)
+        self.current = current
+
+
+class Task:
+    """One task, as returned by the API."""
+
+    __slots__ = FIELDS = ("id", "name", "project", "priority", "due_date", "due_time", "completed", "is_recurring",
+                          "series_id", "version")
+
+    def __init__(self, id, name, project, priority, due_date, due_time, completed=False, is_recurring=False,
+                 series_id=None, version=1):
+        self.id = id
+        self.name = name
+        self.project = project
+        self.priority = priority
+        self.due_date = due_date
+        self.due_time = due_time
+        self.completed = completed
+        self.is_recurring = is_recurring
+        self.series_id = series_id
+        self.version = version
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["id"],
+            data["name"],
+            sys.intern(data["project"]),
+            sys.intern(data["priority"]),
+            date.fromisoformat(data["due_date"]),
+            dt_time.fromisoformat(data["due_time"]),
+            data["completed"],
+            data["is_recurring"],
+            data.get("series_id"),
+            data.get("version", 1),
+        )
+
+    def to_dict(self):
+        """The API's JSON shape."""
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data["due_date"], data["due_time"] = self.due_date.isoformat(), self.due_time.isoformat()
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    def __repr__(self):
+        status = "done" if self.completed else "pending"
+        return f"<Task {self.id} {self.name!r} {self.due_date} {self.due_time:%H:%M} {self.priority} {status}>"
+
+
+def _json(response):
+    """Decoded body of a successful response; raises APIError otherwise."""
+    try:
+        data = response.json()
+    except ValueError:
+        raise APIError(response.status_code, "Response is not JSON")
+    if response.status_code == 409 and "task" in data:
+        raise ConflictError(409, data.get("error", "Conflict"), Task.from_dict(data["task"]))
+    if response.status_code >= 400 or not data.get("success", True):
+        raise APIError(response.status_code, data.get("error", "Request failed"))
+    return data
+
+
+class TaskIterator:
+    """Iterates over a listing page by page, prefetching the next page in a background thread."""
+
+    def __init__(self, client, status=None, page_size=PAGE_SIZE, prefetch=True):
+        self.client = client
+        self.status = status
+        self.page_size = page_size
+        self.prefetch = prefetch
+
+    def pages(self):
+        """Yield lists of Task, one per page."""
+        fetch = functools.partial(self.client.page, limit=self.page_size, status=self.status)
+        if not self.prefetch:
+            after = 0
+            while after is not None:
+                tasks, after = fetch(after=after)
+                yield tasks
+            return
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="taskcli-prefetch") as pool:
+            future = pool.submit(fetch, after=0)
+            while future is not None:
+                tasks, after = future.result()
+                future = pool.submit(fetch, after=after) if after is not None else None
+                yield tasks
+
+    def __iter__(self):
+        for tasks in self.pages():
+            yield from tasks
+
+
+class Client:
+    """Synchronous TaskCLI API client for one account."""
+
+    def __init__(self, email, base_url=None, transport=None, page_size=PAGE_SIZE, workers=MAX_WORKERS):
+        self.email = email
+        self.base_url = (base_url or API_URL).rstrip("/")
+        self.request = transport or default_transport()
+        self.page_size = page_size
+        self.workers = workers
+
+    def _get(self, path, params=None):
+        return _json(self.request("GET", f"{self.base_url}{path}", params={"email": self.email, **(params or {})}))
+
+    def _post(self, path, payload=None):
+        return _json(post_with_retries(self.request, f"{self.base_url}{path}", payload))
+
+    # Reading -----------------------------------------------------------------
+
+    def page(self, after=0, limit=None, status=None):
+        """One page of tasks in ID order: (tasks, `after` for the next page or None)."""
+        params = {"limit": limit or self.page_size, "after": after}
+        if status:
+            params["status"] = status
+        data = self._get("/api/tasks/", params)
+        return [Task.from_dict(t) for t in data["tasks"]], data.get("next")
+
+    def tasks(self, status=None, page_size=None, prefetch=True):
+        """Lazily iterate over all tasks (status: None, 'pending' or 'completed')."""
+        return TaskIterator(self, status, page_size or self.page_size, prefetch)
+
+    def calendar(self, start, end):
+        """Tasks due from `start` to `end` (inclusive) by day: {date: [Task, ...]}, days without tasks omitted."""
+        data = self._get("/api/tasks/calendar/", {"from": str(start), "to": str(end)})
+        return {date.fromisoformat(day): [Task.from_dict(t) for t in tasks] for day, tasks in data["days"].items()}
+
+    def analytics(self, weeks=12):
+        """The productivity report for the last `weeks` weeks, as the API's JSON dict."""
+        data = self._get("/api/analytics/", {"weeks": weeks})
+        data.pop("success", None)
+        return data
+
+    # Writing -----------------------------------------------------------------
+
+    def add(self, name, project="General", priority="Medium", due_date=None, due_time="12:00"):
+        """Create a task; returns its ID."""
+        data = self._post("/api/tasks/add/", {
+            "email": self.email,
+            "name": name,
+            "project": project,
+            "priority": priority,
+            "due_date": str(due_date or date.today()),
+            "due_time": str(due_time),
+        })
+        return data["task_id"]
+
+    def add_many(self, tasks):
+        """Create tasks from dicts of add() arguments, `workers` at a time; returns their IDs in order."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="taskcli-add") as pool:
+            return list(pool.map(lambda spec: self.add(**spec), tasks))
+
+    def edit(self, task_id, base=None, **fields):
+        """
+        Change any of name, project, priority, due_date, due_time; returns the new version.
+
+        With `base` (the Task as the caller last read it) the edit only applies
+        to that version. If someone changed the task since, and none of the
+        fields being set, the edit is re-sent against the new version;
+        otherwise ConflictError is raised with the current task.
+        """
+        payload = {k: str(v) for k, v in fields.items() if v is not None}
+        if base is None:
+            return self._post(f"/api/tasks/{task_id}/edit/", payload).get("version")
+        version = base.version
+        for _ in range(MAX_MERGES):
+            try:
+                return self._post(f"/api/tasks/{task_id}/edit/", {**payload, "version": version})["version"]
+            except ConflictError as e:
+                if any(getattr(e.current, field) != getattr(base, field) for field in payload):
+                    raise
+                version = e.current.version
+        raise APIError(409, f"Task {task_id} kept changing; gave up after {MAX_MERGES} attempts")
+
+    def bulk(self, action, task_ids, poll=0.5, timeout=120):
+        """Complete, reopen ('pending') or delete many tasks in one request; returns the affected IDs."""
+        data = self._post("/api/tasks/bulk/", {"email": self.email, "action": action, "task_ids": list(task_ids)})
+        deadline = time.monotonic() + timeout
+        while "job_id" in data:  # queued on the server (202): wait for the worker
+            job = self._get(data["status_url"])["job"]
+            if job["status"] == "done":
+                return job["result"]["task_ids"]
+            if job["status"] == "failed":
+                raise APIError(500, job["error"] or "Job failed")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Job {data['job_id']} still {job['status']} after {timeout}s")
+            time.sleep(poll)
+        return data["task_ids"]
+
+    def complete(self, task_ids):
+        return self.bulk("complete", task_ids)
+
+    def pending(self, task_ids):
+        return self.bulk("pending", task_ids)
+
+    def delete(self, task_ids):
+        return self.bulk("delete", task_ids)
+
+    # Recurring series (addressed by any of their tasks) -----------------------
+
+    def edit_series(self, task_id, shift_days=0, **fields):
+        """Change name, project, priority or due_time on the whole series and/or move it; returns the task IDs."""
+        payload = {"email": self.email, "shift_days": shift_days}
+        payload.update({k: str(v) for k, v in fields.items() if v is not None})
+        return self._post(f"/api/tasks/{task_id}/series/edit/", payload)["task_ids"]
+
+    def shift_series(self, task_id, days):
+        """Move every due date of the series by `days` (may be negative); returns the task IDs."""
+        return self._post(f"/api/tasks/{task_id}/series/shift/", {"email": self.email, "days": days})["task_ids"]
+
+    def delete_series(self, task_id):
+        """Delete every task of the series; returns their IDs."""
+        return self._post(f"/api/tasks/{task_id}/series/delete/", {"email": self.email})["task_ids"]
+
+
+class AsyncClient:
+    """
+    asyncio variant of Client with the same methods as coroutines.
+
+    Each call runs the blocking client in `executor` (the loop's default
+    if None); `tasks()` is an async iterator that requests the next page
+    while the caller processes the current one.
+    """
+
+    def __init__(self, email, base_url=None, transport=None, page_size=PAGE_SIZE, workers=MAX_WORKERS, executor=None):
+        self.client = Client(email, base_url, transport, page_size, workers)
+        self.executor = executor
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def page(self, after=0, limit=None, status=None):
+        return await self._run(self.client.page, after, limit, status)
+
+    async def calendar(self, start, end):
+        return await self._run(self.client.calendar, start, end)
+
+    async def analytics(self, weeks=12):
+        return await self._run(self.client.analytics, weeks)
+
+    async def tasks(self, status=None, page_size=None):
+        pending = asyncio.ensure_future(self.page(0, page_size, status))
+        try:
+            while pending is not None:
+                tasks, after = await pending
+                pending = asyncio.ensure_future(self.page(after, page_size, status)) if after is not None else None
+                for task in tasks:
+                    yield task
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def add(self, name, **kwargs):
+        return await self._run(self.client.add, name, **kwargs)
+
+    async def add_many(self, tasks):
+        """Create tasks concurrently, at most `workers` requests in flight; returns their IDs in order."""
+        semaphore = asyncio.Semaphore(self.client.workers)
+
+        async def one(spec):
+            async with semaphore:
+                return await self.add(**spec)
+
+        return list(await asyncio.gather(*(one(spec) for spec in tasks)))
+
+    async def edit(self, task_id, base=None, **fields):
+        return await self._run(self.client.edit, task_id, base, **fields)
+
+    async def bulk(self, action, task_ids):
+        return await self._run(self.client.bulk, action, task_ids)
+
+    async def complete(self, task_ids):
+        return await self.bulk("complete", task_ids)
+
+    async def pending(self, task_ids):
+        return await self.bulk("pending", task_ids)
+
+    async def delete(self, task_ids):
+        return await self.bulk("delete", task_ids)
+
+    async def edit_series(self, task_id, shift_days=0, **fields):
+        return await self._run(self.client.edit_series, task_id, shift_days, **fields)
+
+    async def shift_series(self, task_id, days):
+        return await self._run(self.client.shift_series, task_id, days)
+
+    async def delete_series(self, task_id):
+        return await self._run(self.client.delete_series, task_id)
@@ -0,0 +1,154 @@
+"""
+HTTP Transports for TaskCLI
+===========================
+Shared by the CLI (taskcli.cli) and the SDK (taskcli.client).
+
+A transport is called as transport(method, url, params=, payload=,
+headers=, timeout=) and returns an object with .status_code, .headers and
+.json(). Connection failures and timeouts are raised as the built-in
+ConnectionError / TimeoutError; everything else is an OSError subclass.
+
+`requests` (with urllib3, charset detection, ...) takes longer to import
+than the rest of the package, so RequestsTransport imports it on first use
+and StdlibTransport (http.client) never does.
+
+Author: TaskCLI Team
+"""
+
+import importlib.util
+import json
+import os
+import time
+
+# Retries for task mutations; each operation sends one Idempotency-Key so a
+# retry after a timeout never applies the change twice
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5  # seconds, doubled after each attempt
+
+
+class Response:
+    """The part of requests.Response the CLI and SDK use."""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class StdlibTransport:
+    """http.client transport; keeps one connection alive per host and thread."""
+
+    def __init__(self):
+        import threading
+
+        self._local = threading.local()
+
+    @property
+    def _connections(self):
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def __call__(self, method, url, params=None, payload=None, headers=None, timeout=10):
+        import socket
+        from http.client import HTTPConnection, HTTPException, HTTPSConnection
+        from urllib.parse import urlencode, urlsplit
+
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        query = "&".join(q for q in (parts.query, urlencode(params or {})) if q)
+        if query:
+            path += "?" + query
+        request_headers = {"Accept": "application/json", **(headers or {})}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode()
+            request_headers["Content-Type"] = "application/json"
+        elif method == "POST":
+            body = b""
+
+        key = (parts.scheme, parts.netloc)
+        while True:
+            conn = self._connections.get(key)
+            reused = conn is not None
+            if not reused:
+                conn_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+                conn = self._connections[key] = conn_class(parts.netloc, timeout=timeout)
+            try:
+                conn.request(method, path, body=body, headers=request_headers)
+                response = conn.getresponse()
+                return Response(response.status, response.headers, response.read())
+            except socket.timeout as e:
+                self._drop(key)
+                raise TimeoutError(f"{url}: timed out") from e
+            except (OSError, HTTPException) as e:
+                self._drop(key)
+                if not reused:
+                    raise ConnectionError(f"{url}: {e}") from e
+                # The server closed an idle kept-alive connection; reconnect once
+
+    def _drop(self, key):
+        self._connections.pop(key).close()
+
+
+class RequestsTransport:
+    """requests transport (one Session); `requests` is imported on first use."""
+
+    def __init__(self):
+        self._session = None
+
+    def __call__(self, method, url, params=None, payload=None, headers=None, timeout=10):
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+        try:
+            return self._session.request(method, url, params=params, json=payload, headers=headers, timeout=timeout)
+        except requests.exceptions.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(str(e)) from e
+
+
+def default_transport():
+    """TASKCLI_HTTP=stdlib|requests, else requests if installed."""
+    choice = os.environ.get("TASKCLI_HTTP", "auto")
+    if choice == "requests" or (choice == "auto" and importlib.util.find_spec("requests") is not None):
+        return RequestsTransport()
+    return StdlibTransport()
+
+
+def post_with_retries(request, url, payload=None, on_retry=None):
+    """
+    POST a task mutation, retrying timeouts, 5xx errors and "still in
+    progress" 409s (the ones with Retry-After).
+
+    Every attempt carries the same Idempotency-Key, so the server replays
+    the first result instead of creating or changing the task again. A 409
+    without Retry-After is a version conflict: retrying can't fix it, so it
+    is returned to the caller. `on_retry(attempt)` is called before each
+    retry.
+    """
+    import uuid
+
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    delay = RETRY_BACKOFF
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            response = request("POST", url, payload=payload, headers=headers)
+            in_progress = response.status_code == 409 and "Retry-After" in response.headers
+            if not in_progress and response.status_code < 500:
+                return response
+            if attempt == MAX_ATTEMPTS:
+                return response
+            delay = max(delay, float(response.headers.get("Retry-After", 0)))
+        except (ConnectionError, TimeoutError):
+            if attempt == MAX_ATTEMPTS:
+                raise
+        if on_retry:
+            on_retry(attempt)
+        time.sleep(delay)
+        delay *= 2
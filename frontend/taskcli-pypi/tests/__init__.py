@@ -0,0 +1 @@
+"""Tests for the taskcli package; run with `python -m unittest` from frontend/taskcli-pypi."""
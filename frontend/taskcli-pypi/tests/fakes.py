@@ -0,0 +1,38 @@
+"""A scripted transport for exercising the CLI and SDK without a server."""
+
+import json
+
+from taskcli.transport import Response
+
+
+def response(status_code=200, body=None, headers=None):
+    """A transport Response with a JSON body."""
+    return Response(status_code, headers or {}, json.dumps(body if body is not None else {"success": True}).encode())
+
+
+class FakeTransport:
+    """
+    Transport answering from a script instead of the network.
+
+    Each call pops the next entry of `script`: a Response is returned, an
+    exception is raised, and a callable is called with the request's
+    (method, path, params, payload) and its result used instead. Calls are
+    recorded in `calls` as dicts.
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = []
+
+    def __call__(self, method, url, params=None, payload=None, headers=None, timeout=10):
+        path = url.split("://", 1)[-1].partition("/")[2]
+        self.calls.append({"method": method, "path": "/" + path, "params": params, "payload": payload,
+                           "headers": headers or {}})
+        if not self.script:
+            raise AssertionError(f"Unexpected request: {method} /{path}")
+        answer = self.script.pop(0)
+        if isinstance(answer, BaseException):
+            raise answer
+        if callable(answer):
+            answer = answer(method, "/" + path, params, payload)
+        return answer
@@ -0,0 +1,114 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from taskcli.cli import TaskCLI, format_ids, parse_ids
+from taskcli.transport import Response
+
+from .fakes import FakeTransport, response
+from .test_client import conflict, page
+
+
+class ParseIdsTests(unittest.TestCase):
+    def test_ranges_and_lists(self):
+        self.assertEqual(parse_ids(["3-5,9", "12"]), [3, 4, 5, 9, 12])
+        self.assertEqual(parse_ids(["7-7"]), [7])
+
+    def test_whitespace_and_empty_parts_are_ignored(self):
+        self.assertEqual(parse_ids([" 3 - 5 , ,9 "]), [3, 4, 5, 9])
+
+    def test_duplicates_are_dropped_in_order(self):
+        self.assertEqual(parse_ids(["9,3-5", "4,9"]), [9, 3, 4, 5])
+
+    def test_rejects_reversed_ranges_and_bad_tokens(self):
+        for spec in ("5-3", "a", "3-", "-3", "1-2-3", "3.5", ""):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_ids([spec])
+
+    def test_format_ids_collapses_runs(self):
+        self.assertEqual(format_ids([9, 3, 5, 4, 12, 13]), "3-5,9,12-13")
+        self.assertEqual(format_ids([1]), "1")
+
+
+class ApplyActionTests(unittest.TestCase):
+    def cli(self, *script, email="you@example.com"):
+        cli = TaskCLI(FakeTransport(*script))
+        cli.user_email = email
+        return cli
+
+    def run_action(self, cli, action, task_ids):
+        with redirect_stdout(io.StringIO()) as out:
+            failed = cli.apply_action(action, task_ids, workers=2)
+        return failed, out.getvalue()
+
+    def paths(self, cli):
+        return sorted(call["path"] for call in cli.request.calls)
+
+    def test_bulk_endpoint_in_one_request(self):
+        cli = self.cli(response(200, {"success": True, "affected": 1, "task_ids": [3]}))
+        failed, out = self.run_action(cli, "done", [3, 4])
+        self.assertEqual(failed, 1)
+        self.assertEqual(self.paths(cli), ["/api/tasks/bulk/"])
+        self.assertEqual(cli.request.calls[0]["payload"]["action"], "complete")
+        self.assertIn("Task 4: Task not found", out)
+
+    def test_falls_back_to_per_task_requests_without_bulk_endpoint(self):
+        not_found = Response(404, {"Content-Type": "text/html"}, b"<h1>Not Found</h1>")
+        answer = lambda method, path, params, payload: response(200, {"success": path != "/api/tasks/4/delete/",
+                                                                     "error": "Task not found"})
+        cli = self.cli(not_found, answer, answer)
+        failed, out = self.run_action(cli, "delete", [3, 4])
+        self.assertEqual(failed, 1)
+        self.assertEqual(self.paths(cli), ["/api/tasks/3/delete/", "/api/tasks/4/delete/", "/api/tasks/bulk/"])
+        self.assertIn("1 deleted, 1 failed (IDs: 4)", out)
+
+    def test_api_404_is_reported_not_fanned_out(self):
+        cli = self.cli(response(404, {"success": False, "error": "User not found"}))
+        failed, out = self.run_action(cli, "pending", [3, 4])
+        self.assertEqual(failed, 2)
+        self.assertEqual(self.paths(cli), ["/api/tasks/bulk/"])
+        self.assertEqual(out.count("User not found"), 2)
+
+    def test_without_email_goes_straight_to_per_task_requests(self):
+        cli = self.cli(response(), response(), email=None)
+        failed, _ = self.run_action(cli, "done", [3, 4])
+        self.assertEqual(failed, 0)
+        self.assertEqual(self.paths(cli), ["/api/tasks/3/complete/", "/api/tasks/4/complete/"])
+
+    def test_apply_action_input_reports_bad_ids_without_requests(self):
+        cli = self.cli()
+        with redirect_stdout(io.StringIO()) as out:
+            cli.apply_action_input("done", "4-2")
+        self.assertIn("Invalid range: '4-2'", out.getvalue())
+        self.assertEqual(cli.request.calls, [])
+
+
+class EditTaskTests(unittest.TestCase):
+    def edit(self, answers, *script):
+        cli = TaskCLI(FakeTransport(*script))
+        cli.user_email = "you@example.com"
+        with mock.patch.object(cli, "list_tasks"), mock.patch.object(cli, "get_input", side_effect=answers), \
+                redirect_stdout(io.StringIO()) as out:
+            cli.edit_task()
+        return cli.request.calls, out.getvalue()
+
+    def test_sends_version_read_and_merges_disjoint_change(self):
+        calls, out = self.edit(["7", "", "", "High", ""], page([7]), conflict(name="Renamed", version=2),
+                               response(200, {"success": True, "version": 3}))
+        self.assertEqual(calls[0]["params"]["after"], 6)
+        self.assertEqual([c["payload"] for c in calls[1:]], [{"priority": "High", "version": 1},
+                                                             {"priority": "High", "version": 2}])
+        self.assertIn("Task 7 updated", out)
+
+    def test_reports_overlapping_change(self):
+        calls, out = self.edit(["7", "", "", "High", ""], page([7]), conflict(priority="Low", version=2))
+        self.assertEqual(len(calls), 2)
+        self.assertIn("Task 7 was changed elsewhere (priority=Low); your edit was not saved", out)
+
+    def test_reports_missing_task_and_connection_errors(self):
+        calls, out = self.edit(["7"], page([8]))
+        self.assertEqual((len(calls), "Task 7 not found" in out), (1, True))
+        with mock.patch("taskcli.transport.time.sleep"):
+            calls, out = self.edit(["7", "New", "", "", ""], page([7]), *[ConnectionError("refused")] * 3)
+        self.assertIn("Connection error: refused", out)
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import unittest
+from datetime import date, time
+
+from taskcli.client import MAX_MERGES, APIError, AsyncClient, Client, ConflictError, Task
+
+from .fakes import FakeTransport, response
+
+
+def task_json(id, **fields):
+    """A task as the API serializes it."""
+    return {"id": id, "name": f"Task {id}", "project": "Work", "priority": "Medium", "due_date": "2030-01-31",
+            "due_time": "12:00:00", "completed": False, "completed_at": None, "is_recurring": False,
+            "series_id": None, "version": 1, **fields}
+
+
+def page(ids, next=None):
+    return response(200, {"success": True, "tasks": [task_json(i) for i in ids], "next": next})
+
+
+def conflict(**fields):
+    return response(409, {"success": False, "error": "Task 7 was changed by someone else",
+                          "task": task_json(7, **fields)})
+
+
+class TaskTests(unittest.TestCase):
+    def test_from_dict_types_fields_and_round_trips(self):
+        task = Task.from_dict(task_json(7, series_id="abc", version=4))
+        self.assertEqual((task.due_date, task.due_time, task.version), (date(2030, 1, 31), time(12), 4))
+        self.assertIs(task.project, Task.from_dict(task_json(8)).project)  # interned
+        self.assertEqual(Task.from_dict(task.to_dict()), task)
+
+
+class PagingTests(unittest.TestCase):
+    def test_pages_follow_next_cursor(self):
+        client = Client("you@example.com", transport=FakeTransport(page([1, 2], next=2), page([3])), page_size=2)
+        self.assertEqual([t.id for t in client.tasks(status="pending", prefetch=False)], [1, 2, 3])
+        params = [call["params"] for call in client.request.calls]
+        self.assertEqual([p["after"] for p in params], [0, 2])
+        self.assertEqual({(p["email"], p["limit"], p["status"]) for p in params}, {("you@example.com", 2, "pending")})
+
+    def test_next_page_is_fetched_while_current_one_is_consumed(self):
+        requested = threading.Event()
+
+        def second(method, path, params, payload):
+            requested.set()
+            return page([3])
+
+        client = Client("you@example.com", transport=FakeTransport(page([1, 2], next=2), second), page_size=2)
+        tasks = iter(client.tasks())
+        self.assertEqual(next(tasks).id, 1)
+        self.assertTrue(requested.wait(5))
+        self.assertEqual([t.id for t in tasks], [2, 3])
+
+    def test_errors_raise_api_error(self):
+        client = Client("nobody@example.com", transport=FakeTransport(
+            response(404, {"success": False, "error": "User not found"})))
+        with self.assertRaises(APIError) as e:
+            list(client.tasks())
+        self.assertEqual((e.exception.status_code, e.exception.message), (404, "User not found"))
+
+
+class EditTests(unittest.TestCase):
+    def setUp(self):
+        self.base = Task.from_dict(task_json(7, version=3))
+
+    def edit(self, *script, **fields):
+        client = Client("you@example.com", transport=FakeTransport(*script))
+        return client, client.edit(7, base=self.base, **fields)
+
+    def versions_sent(self, client):
+        return [call["payload"]["version"] for call in client.request.calls]
+
+    def test_sends_base_version(self):
+        client, version = self.edit(response(200, {"success": True, "version": 4}), priority="High")
+        self.assertEqual(version, 4)
+        self.assertEqual(client.request.calls[0]["payload"], {"priority": "High", "version": 3})
+
+    def test_merges_over_disjoint_change(self):
+        client, version = self.edit(conflict(name="Renamed", version=5), response(200, {"success": True, "version": 6}),
+                                    priority="High")
+        self.assertEqual((version, self.versions_sent(client)), (6, [3, 5]))
+
+    def test_overlapping_change_raises_conflict_with_current_task(self):
+        client = Client("you@example.com", transport=FakeTransport(conflict(priority="Low", version=5)))
+        with self.assertRaises(ConflictError) as e:
+            client.edit(7, base=self.base, priority="High")
+        self.assertEqual((e.exception.status_code, e.exception.current.priority, e.exception.current.version),
+                         (409, "Low", 5))
+
+    def test_gives_up_when_task_keeps_changing(self):
+        client = Client("you@example.com", transport=FakeTransport(
+            *[conflict(name=f"Renamed {i}", version=4 + i) for i in range(MAX_MERGES)]))
+        with self.assertRaises(APIError) as e:
+            client.edit(7, base=self.base, priority="High")
+        self.assertNotIsInstance(e.exception, ConflictError)
+        self.assertEqual(self.versions_sent(client), list(range(3, 3 + MAX_MERGES)))
+
+    def test_without_base_edits_unconditionally(self):
+        client = Client("you@example.com", transport=FakeTransport(response(200, {"success": True, "version": 2})))
+        self.assertEqual(client.edit(7, name="New", due_date=date(2030, 2, 1)), 2)
+        self.assertEqual(client.request.calls[0]["payload"], {"name": "New", "due_date": "2030-02-01"})
+
+
+class AsyncClientTests(unittest.TestCase):
+    def test_tasks_and_add_many(self):
+        added = lambda method, path, params, payload: response(201, {"success": True, "task_id": int(payload["name"])})
+        client = AsyncClient("you@example.com", page_size=2,
+                             transport=FakeTransport(page([1, 2], next=2), page([3]), *[added] * 3))
+
+        async def main():
+            ids = [task.id async for task in client.tasks()]
+            return ids, await client.add_many([{"name": str(i)} for i in (10, 11, 12)])
+
+        self.assertEqual(asyncio.run(main()), ([1, 2, 3], [10, 11, 12]))
@@ -0,0 +1,124 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from taskcli import transport
+from taskcli.transport import StdlibTransport, post_with_retries
+
+from .fakes import FakeTransport, response
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Keep-alive JSON handler that can hang up on or stall its clients."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+        body = b'{"success": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Close without "Connection: close", like a server dropping an idle keep-alive connection
+        self.close_connection = self.server.hang_up
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # Clients time out and hang up on purpose
+
+
+class StdlibTransportTests(unittest.TestCase):
+    def setUp(self):
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.connections, self.server.hang_up = set(), False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.transport = StdlibTransport()
+        self.addCleanup(lambda: [conn.close() for conn in self.transport._connections.values()])
+
+    def test_reuses_kept_alive_connection(self):
+        for _ in range(3):
+            self.assertEqual(self.transport("GET", f"{self.url}/api/tasks/").json(), {"success": True})
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_reconnects_once_when_server_closed_idle_connection(self):
+        self.server.hang_up = True
+        self.transport("GET", f"{self.url}/api/tasks/")
+        response = self.transport("GET", f"{self.url}/api/tasks/", params={"email": "a@example.com"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.connections), 2)
+
+    def test_timeout_is_raised_as_timeout_error(self):
+        with self.assertRaises(TimeoutError):
+            self.transport("GET", f"{self.url}/slow", timeout=0.1)
+        self.assertEqual(self.transport("GET", f"{self.url}/api/tasks/").status_code, 200)
+
+    def test_refused_connection_is_raised_as_connection_error(self):
+        url = self.url
+        self.server.shutdown()
+        self.server.server_close()
+        with self.assertRaises(ConnectionError):
+            self.transport("GET", f"{url}/api/tasks/")
+
+
+@mock.patch("taskcli.transport.time.sleep")
+class PostWithRetriesTests(unittest.TestCase):
+    def post(self, *script):
+        fake = FakeTransport(*script)
+        return post_with_retries(fake, "http://test/api/tasks/add/", {"name": "x"}), fake
+
+    def assertSameKey(self, fake):
+        keys = {call["headers"]["Idempotency-Key"] for call in fake.calls}
+        self.assertEqual(len(keys), 1)
+
+    def test_retries_timeouts_with_the_same_idempotency_key(self, sleep):
+        result, fake = self.post(TimeoutError(), ConnectionError(), response(201))
+        self.assertEqual(result.status_code, 201)
+        self.assertEqual(len(fake.calls), 3)
+        self.assertSameKey(fake)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.5, 1.0])
+
+    def test_retries_server_errors(self, sleep):
+        result, fake = self.post(response(502), response(200))
+        self.assertEqual((result.status_code, len(fake.calls)), (200, 2))
+
+    def test_retries_in_progress_conflict_after_retry_after(self, sleep):
+        result, fake = self.post(response(409, {"error": "In progress"}, {"Retry-After": "2"}), response(200))
+        self.assertEqual((result.status_code, len(fake.calls)), (200, 2))
+        self.assertSameKey(fake)
+        sleep.assert_called_once_with(2.0)
+
+    def test_never_retries_version_conflict(self, sleep):
+        result, fake = self.post(response(409, {"success": False, "error": "Conflict"}))
+        self.assertEqual((result.status_code, len(fake.calls)), (409, 1))
+        sleep.assert_not_called()
+
+    def test_never_retries_client_errors(self, sleep):
+        result, fake = self.post(response(400, {"success": False}))
+        self.assertEqual((result.status_code, len(fake.calls)), (400, 1))
+
+    def test_gives_up_after_max_attempts(self, sleep):
+        result, fake = self.post(*[response(503)] * transport.MAX_ATTEMPTS)
+        self.assertEqual((result.status_code, len(fake.calls)), (503, transport.MAX_ATTEMPTS))
+        with self.assertRaises(TimeoutError):
+            self.post(*[TimeoutError()] * transport.MAX_ATTEMPTS)
+
+    def test_reports_each_retry(self, sleep):
+        attempts = []
+        fake = FakeTransport(response(500), response(500), response(200))
+        post_with_retries(fake, "http://test/api/tasks/1/complete/", on_retry=attempts.append)
+        self.assertEqual(attempts, [1, 2])